@@ -73,6 +73,7 @@ from app.auth.dependencies import get_tenant_db, get_tenant_storage
 from app.auth.rbac import require_role
 from app.auth.token import TokenPayload, get_current_user
 from app.models.documents import AuditLog, Document
+from app.rag.bm25_cache import invalidate_tenant
 from app.schemas.documents import (
     MAX_FILE_SIZE_BYTES,
     DocumentStatusResponse,
@@ -542,6 +543,11 @@ async def delete_document(
         .values(status="deleted")
     )
 
+    # Drop this tenant's cached BM25 indexes. The chunk-term caches are
+    # content-addressed (a deleted chunk just stops producing its key), so
+    # they are left alone rather than cold-started for every tenant
+    invalidate_tenant(user.tenant_id)
+
     # Tag the S3 object (soft delete — lifecycle rule expires it after 30 days)
     s3_filename = doc.s3_key.rsplit("/", 1)[-1]
     try:
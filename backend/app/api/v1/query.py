@@ -47,7 +47,7 @@ from app.models.documents import AuditLog
 from app.rag.hybrid_retriever import HybridRetriever
 from app.rag.pipeline import get_embedding_model
 from app.rag.prompt_manager import PromptManager
-from app.rag.reranker import CohereReranker
+from app.rag.reranker import get_reranker
 from app.vectorstore.base import VectorStoreBase
 
 logger = logging.getLogger(__name__)
@@ -58,8 +58,7 @@ router = APIRouter(prefix="/query", tags=["Query"])
 # Shared singletons
 # ---------------------------------------------------------------------------
 
-_gateway:  LLMGateway | None = None
-_reranker: CohereReranker | None = None
+_gateway: LLMGateway | None = None
 
 
 def _get_gateway() -> LLMGateway:
@@ -69,13 +68,6 @@ def _get_gateway() -> LLMGateway:
     return _gateway
 
 
-def _get_reranker() -> CohereReranker:
-    global _reranker
-    if _reranker is None:
-        _reranker = CohereReranker()
-    return _reranker
-
-
 # ---------------------------------------------------------------------------
 # Request / Response schemas
 # ---------------------------------------------------------------------------
@@ -143,6 +135,36 @@ def _tenant_name_from_token(token: TokenPayload) -> str:
     return getattr(token, "tenant_name", None) or str(token.tenant_id)
 
 
+# ---------------------------------------------------------------------------
+# Retrieval with concurrent prompt template lookup
+# ---------------------------------------------------------------------------
+
+async def _retrieve_with_template(
+    retriever: HybridRetriever,
+    pm:        PromptManager,
+    tenant_id: UUID,
+    db:        AsyncSession,
+    **retrieve_kwargs,
+) -> tuple[list, str]:
+    """
+    Run hybrid retrieval and the prompt template lookup concurrently.
+
+    The template does not depend on the retrieved documents, so its DB
+    round trips (on a TTL-cache miss) overlap the embedding and vector
+    query instead of following them. Retrieval does not touch db, so the
+    session is never used by two coroutines at once; if retrieval fails,
+    the lookup is cancelled and awaited before the error propagates.
+    """
+    template = asyncio.ensure_future(pm.load_template(tenant_id, db))
+    try:
+        docs = await retriever.retrieve(**retrieve_kwargs)
+    except BaseException:
+        template.cancel()
+        await asyncio.gather(template, return_exceptions=True)
+        raise
+    return docs, await template
+
+
 # ---------------------------------------------------------------------------
 # POST /api/v1/query  (non-streaming JSON)
 # ---------------------------------------------------------------------------
@@ -184,11 +206,13 @@ async def query(
     retriever = HybridRetriever(
         vector_store=vec_store,
         embedder=embedder,
-        reranker=_get_reranker(),
+        reranker=get_reranker(),
         dense_candidates=max(body.top_k * 4, 20),
         rerank_top_n=body.top_k,
     )
-    docs = await retriever.retrieve(
+    pm = PromptManager(prompt_name="rag_system")
+    docs, template = await _retrieve_with_template(
+        retriever, pm, tenant_id, db,
         query=body.question,
         top_k=body.top_k,
         metadata_filter=metadata_filter,
@@ -204,16 +228,14 @@ async def query(
         )
 
     # ── Prompt building ───────────────────────────────────────────────────────
-    pm = PromptManager(prompt_name="rag_system")
-
-    reordered_docs = pm.reorder_context(docs)
-    context_str    = pm.format_context(reordered_docs)
+    context_str = pm.reorder_and_format(docs)
 
     system_prompt = await pm.get_system_prompt(
         tenant_id=tenant_id,
         tenant_name=tenant_name,
         db=db,
         context=context_str,
+        template=template,
     )
 
     # ── LLM Gateway ───────────────────────────────────────────────────────────
@@ -326,11 +348,13 @@ async def query_stream(
             retriever = HybridRetriever(
                 vector_store=vec_store,
                 embedder=embedder,
-                reranker=_get_reranker(),
+                reranker=get_reranker(),
                 dense_candidates=max(body.top_k * 4, 20),
                 rerank_top_n=body.top_k,
             )
-            docs = await retriever.retrieve(
+            pm = PromptManager(prompt_name="rag_system")
+            docs, template = await _retrieve_with_template(
+                retriever, pm, tenant_id, db,
                 query=body.question,
                 top_k=body.top_k,
                 metadata_filter=metadata_filter,
@@ -341,14 +365,13 @@ async def query_stream(
                 return
 
             # ── Prompt ──────────────────────────────────────────────────────
-            pm            = PromptManager(prompt_name="rag_system")
-            reordered     = pm.reorder_context(docs)
-            context_str   = pm.format_context(reordered)
+            context_str   = pm.reorder_and_format(docs)
             system_prompt = await pm.get_system_prompt(
                 tenant_id=tenant_id,
                 tenant_name=tenant_name,
                 db=db,
                 context=context_str,
+                template=template,
             )
 
             # ── Stream tokens ────────────────────────────────────────────────
@@ -56,6 +56,16 @@ class Settings(BaseSettings):
     # Embeddings
     embedding_model:      str = "text-embedding-3-small"
     embedding_dimensions: int = 1536
+    embedding_global_concurrency: int = 4   # in-flight embedding requests per worker process, across all documents
+    embedding_cache_int8:         bool = True   # query vector cache stores int8 + scale (4× smaller than float32)
+
+    # Extraction cache (Redis) — re-ingesting an identical PDF skips OCR
+    extraction_cache_url:         str = ""        # e.g. redis://localhost:6379/2; empty = disabled
+    extraction_cache_ttl_seconds: int = 7 * 24 * 3600
+
+    # BM25 index cache (Redis) — repeated candidate sets skip the index build
+    bm25_cache_url:         str = ""        # e.g. redis://localhost:6379/3; empty = disabled
+    bm25_cache_ttl_seconds: int = 300
 
     # ------------------------------------------------------------------
     # LLM
@@ -86,9 +96,11 @@ class Settings(BaseSettings):
     # ------------------------------------------------------------------
     cohere_api_key:        str = ""    # Cohere ReRank — leave empty to disable
     cohere_rerank_model:   str = "rerank-english-v3.0"
+    cohere_rerank_max_chars: int = 2000   # text sent per candidate (~500 tokens); 0 = no limit
     hybrid_dense_k:        int = 20   # dense retrieval candidate count
     hybrid_bm25_k:         int = 20   # BM25 candidate count
     hybrid_rerank_top_n:   int = 5    # final output size after reranking
+    hybrid_rerank_skip_overlap: float = 0.8   # skip Cohere when dense/BM25 top-k overlap ≥ this; 0 = always rerank
 
     # ------------------------------------------------------------------
     # LLM Gateway — provider fallback (Phase 4)
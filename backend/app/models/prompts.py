@@ -52,7 +52,8 @@ class PromptTemplate(Base):
     A versioned system-prompt template stored in the database.
 
     The RAG pipeline loads the active template(s) for the tenant at query-time,
-    with a short in-process TTL cache (60 s) to avoid per-request DB roundtrips.
+    with an in-process cache revalidated every few seconds by a cheap
+    fingerprint query (see app/rag/prompt_manager.py).
     """
 
     __tablename__ = "prompt_templates"
@@ -5,6 +5,10 @@ Provides:
   TracingConfig   — LangSmith / Arize Phoenix initialisation
   traced          — decorator for instrumenting async functions
   CostTracker     — per-tenant token usage accounting
+  get_meter       — OpenTelemetry meter (no-op without OTEL) — app.observability.metrics
+
+CostTracker is resolved lazily: it pulls in SQLAlchemy and the DB session,
+which modules that only record metrics (e.g. OCR workers) shouldn't pay for.
 
 Usage::
 
@@ -23,7 +27,13 @@ Usage::
     )
 """
 
-from app.observability.cost_tracker import CostTracker
 from app.observability.tracing import TracingConfig, traced
 
 __all__ = ["CostTracker", "TracingConfig", "traced"]
+
+
+def __getattr__(name: str):
+    if name == "CostTracker":
+        from app.observability.cost_tracker import CostTracker
+        return CostTracker
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
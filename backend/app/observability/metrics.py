@@ -0,0 +1,48 @@
+"""
+Observability Metrics — OpenTelemetry counters and histograms
+
+Instruments accumulate in memory and are exported in the background by the
+MeterProvider that TracingConfig installs when OTEL_ENABLED=true — recording
+a value never formats a string or touches a handler, unlike a log line.
+
+Without a configured provider the OpenTelemetry API hands out no-op
+instruments; without the opentelemetry-api package at all, get_meter()
+returns a stand-in with the same interface, so callers never need to check.
+
+Usage::
+
+    from app.observability.metrics import get_meter
+
+    _meter = get_meter(__name__)
+    _pages = _meter.create_counter("ocr_pages_total", unit="{page}")
+    _pages.add(12, {"method": "pymupdf"})
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+def get_meter(name: str) -> Any:
+    """OpenTelemetry meter for `name`, or a no-op stand-in if OTEL isn't installed."""
+    try:
+        from opentelemetry import metrics   # type: ignore[import]
+    except ImportError:
+        return _NoOpMeter()
+    return metrics.get_meter(name)
+
+
+class _NoOpInstrument:
+    def add(self, amount: float, attributes: dict | None = None) -> None:
+        pass
+
+    def record(self, amount: float, attributes: dict | None = None) -> None:
+        pass
+
+
+class _NoOpMeter:
+    def create_counter(self, name: str, **_: Any) -> _NoOpInstrument:
+        return _NoOpInstrument()
+
+    def create_histogram(self, name: str, **_: Any) -> _NoOpInstrument:
+        return _NoOpInstrument()
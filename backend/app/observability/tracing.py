@@ -139,7 +139,8 @@ class TracingConfig:
     @staticmethod
     def _init_otel() -> None:
         """
-        Generic OpenTelemetry export (Jaeger, Zipkin, Datadog, etc.)
+        Generic OpenTelemetry export (Jaeger, Zipkin, Datadog, etc.) of
+        traces and of the metrics recorded via app.observability.metrics.
         Requires: OTEL_ENABLED=true and OTEL_EXPORTER_OTLP_ENDPOINT set.
         """
         otel_enabled  = os.environ.get("OTEL_ENABLED", "false").lower() == "true"
@@ -150,8 +151,11 @@ class TracingConfig:
             return
 
         try:
-            from opentelemetry import trace                                       # type: ignore
+            from opentelemetry import metrics, trace                              # type: ignore
+            from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter  # type: ignore
             from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter  # type: ignore
+            from opentelemetry.sdk.metrics import MeterProvider                   # type: ignore
+            from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader  # type: ignore
             from opentelemetry.sdk.trace import TracerProvider                    # type: ignore
             from opentelemetry.sdk.trace.export import BatchSpanProcessor        # type: ignore
 
@@ -160,7 +164,12 @@ class TracingConfig:
             provider.add_span_processor(BatchSpanProcessor(exporter))
             trace.set_tracer_provider(provider)
 
-            logger.info("OTEL tracing enabled | endpoint=%s", otel_endpoint)
+            # Metrics are aggregated in memory and pushed from a background
+            # thread; the exporter appends /v1/metrics to the env endpoint
+            reader = PeriodicExportingMetricReader(OTLPMetricExporter())
+            metrics.set_meter_provider(MeterProvider(metric_readers=[reader]))
+
+            logger.info("OTEL tracing + metrics enabled | endpoint=%s", otel_endpoint)
         except ImportError:
             logger.warning(
                 "opentelemetry-sdk / opentelemetry-exporter-otlp not installed. "
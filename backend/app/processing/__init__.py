@@ -23,13 +23,20 @@ Design principles
 
 from app.processing.extractor import ExtractionResult, TextExtractorOrchestrator
 from app.processing.chunking import ChunkResult, SemanticChunker
-from app.processing.embeddings import EmbeddingPipeline, EmbeddingResult
+from app.processing.embeddings import (
+    EmbeddedBatch,
+    EmbeddingPipeline,
+    EmbeddingResult,
+    VectorBatch,
+)
 
 __all__ = [
     "ExtractionResult",
     "TextExtractorOrchestrator",
     "ChunkResult",
     "SemanticChunker",
+    "EmbeddedBatch",
     "EmbeddingPipeline",
     "EmbeddingResult",
+    "VectorBatch",
 ]
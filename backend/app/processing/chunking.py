@@ -42,16 +42,25 @@ Memory considerations:
   - Processing happens entirely in the Celery worker process, not the API.
   - Documents are processed one at a time per worker — no concurrent
     spaCy calls in the same process (no thread-safety issue).
+  - Bulk re-chunking (e.g. a re-index script) can use
+    SemanticChunker.chunk_batch(), which fans documents out over a
+    process pool with the spaCy model preloaded once per child process.
   - For 50 MB documents, peak memory is ~10× raw text size due to spaCy's
     internal doc representation. Workers should have 2 GB RAM minimum.
 """
 
 from __future__ import annotations
 
+import bisect
+import hashlib
 import logging
+import os
 import re
+import threading
 import unicodedata
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator
 from uuid import UUID
 
 logger = logging.getLogger(__name__)
@@ -70,25 +79,55 @@ OVERLAP_CHARS    = 100    # overlap ONLY when a paragraph exceeds MAX_CHUNK_CHAR
 # For multilingual: "xx_ent_wiki_sm" or a dedicated language model
 SPACY_MODEL = "en_core_web_sm"
 
-# Heading detection regex: lines that look like headings
-#   - ALL CAPS line ≥ 3 words
+# Only the tokenizer and the rule-based sentencizer are used, so every
+# statistical component is excluded at load time (never read from disk,
+# never allocated) rather than loaded and disabled.
+SPACY_EXCLUDE = ["tok2vec", "tagger", "parser", "senter", "attribute_ruler", "lemmatizer", "ner"]
+
+# spaCy's Doc costs roughly 10× the raw text in memory. Paragraphs longer
+# than SPACY_MAX_CHARS skip spaCy and use the regex splitter; nlp.max_length
+# is pinned to SPACY_MAX_LENGTH as a backstop for any other caller.
+SPACY_MAX_CHARS  = 500_000
+SPACY_MAX_LENGTH = 1_000_000
+
+# Regex sentence fallback: the whitespace run (group 1) after . ! or ?
+# Written without lookbehind so it compiles under RE2 (google-re2), whose
+# DFA matcher guarantees linear time on the long paragraphs this fallback
+# handles. Falls back to the stdlib engine when re2 is not installed.
+try:
+    import re2 as _re2
+    _SENT_SPLIT_RE = _re2.compile(r"[.!?](\s+)")
+except ImportError:
+    _SENT_SPLIT_RE = re.compile(r"[.!?](\s+)")
+
+# Heading detection: lines that look like headings. One anchored pattern
+# per heading style, dispatched on the line's first character by
+# _is_heading() so body lines never walk a multi-branch alternation.
 #   - Markdown headings: # Heading, ## Heading
-#   - Numbered sections: "1.2.3 Overview", "SECTION 4:"
-_HEADING_RE = re.compile(
-    r"""
-    ^(
-        \#{1,6}\s+.+                             # Markdown heading
-      | [A-Z][A-Z\s]{4,}\b                       # ALL CAPS (5+ chars)
-      | (?:\d+\.)+\d*\s+[A-Z].{3,}              # Numbered: 1.2.3 Title
-      | (?:Section|Chapter|Article|Appendix)\s+\S+  # Common doc headings
-    )$
-    """,
-    re.VERBOSE | re.MULTILINE,
-)
+#   - ALL CAPS line (5+ chars, letters and spaces only)
+#   - Numbered sections: "1.2.3 Overview", "4. Scope"
+#   - Common doc headings: "Section 4:", "Appendix B"
+_MD_HEADING_RE       = re.compile(r"#{1,6}\s+.+")
+_CAPS_HEADING_RE     = re.compile(r"[A-Z][A-Z\s]{4,}")
+_NUMBERED_HEADING_RE = re.compile(r"(?:\d+\.)+\d*\s+[A-Z].{3,}")
+_KEYWORD_HEADING_RE  = re.compile(r"(?:Section|Chapter|Article|Appendix)\s+\S+")
 
 # Minimum heading line length (avoids matching short ALL-CAPS words like "NOTE:")
 MIN_HEADING_LEN = 8
 
+# Hot-path patterns, compiled once instead of per section / per call
+_PARA_SPLIT_RE  = re.compile(r"\n\s*\n")          # blank-line paragraph break
+_EXCESS_NL_RE   = re.compile(r"\n{3,}")            # 3+ newlines
+_TRAILING_WS_RE = re.compile(r"[^\S\n]+(?=\n)")   # whitespace before a newline
+
+# Single-pass character table for _normalize_text:
+#   - NBSP / zero-width chars → space
+#   - every other str.splitlines() boundary → "\n" (CRLF is folded first)
+_NORMALIZE_TABLE = str.maketrans({
+    **dict.fromkeys("\u00a0\u200b\u200c\u200d\ufeff", " "),
+    **dict.fromkeys("\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029", "\n"),
+})
+
 
 # ---------------------------------------------------------------------------
 # Result dataclasses
@@ -111,37 +150,75 @@ class ChunkResult:
     page_number: int           # page where this chunk starts (1-based)
     source_key:  str           # S3 key of the source document
     heading:     str           # nearest preceding heading, if any
-    metadata:    dict = field(default_factory=dict)   # arbitrary extra fields
+    metadata:    dict = field(default_factory=dict)   # caller's extra_meta only
+
+    def to_vector_metadata(self) -> dict:
+        """
+        Flat metadata dict for vector store / serialisation boundaries.
+
+        Built on demand so the chunk list doesn't carry a second copy of
+        every field above for each chunk.
+        """
+        return {
+            "tenant_id":   str(self.tenant_id),
+            "document_id": self.document_id,
+            "chunk_index": self.chunk_index,
+            "page_number": self.page_number,
+            "source_key":  self.source_key,
+            "heading":     self.heading,
+            "char_count":  self.char_count,
+            "token_est":   self.token_est,
+            **self.metadata,
+        }
 
 
 # ---------------------------------------------------------------------------
 # spaCy model singleton
 # ---------------------------------------------------------------------------
 
-_spacy_nlp = None
+_spacy_lock = threading.Lock()
+_UNLOADED   = object()
+_nlp: object = _UNLOADED     # spaCy Language, None if the model is missing
 
 
 def _get_nlp():
     """
     Load the spaCy model once per process (Celery worker).
-    Thread-safe: only Celery main thread calls this during task startup.
+
+    Cached for the life of the process, including the None result when the
+    model is not installed, so a missing model is reported once rather than
+    re-probed on every document. Loaded callers take the fast path without
+    the lock; cold callers queue on it and re-check, so concurrent first
+    calls still load the model exactly once.
     """
-    global _spacy_nlp
-    if _spacy_nlp is None:
-        import spacy
-        try:
-            _spacy_nlp = spacy.load(SPACY_MODEL, disable=["ner", "parser"])
-            # We re-enable sentencizer (rule-based, fast) instead of parser
-            if "sentencizer" not in _spacy_nlp.pipe_names:
-                _spacy_nlp.add_pipe("sentencizer")
-            logger.info("spaCy model '%s' loaded", SPACY_MODEL)
-        except OSError:
-            logger.warning(
-                "spaCy model '%s' not found — run: python -m spacy download %s",
-                SPACY_MODEL, SPACY_MODEL,
-            )
-            _spacy_nlp = None   # caller will use fallback splitter
-    return _spacy_nlp
+    global _nlp
+    nlp = _nlp
+    if nlp is not _UNLOADED:
+        return nlp
+    with _spacy_lock:
+        if _nlp is _UNLOADED:
+            _nlp = _load_nlp()
+        return _nlp
+
+
+def _load_nlp():
+    """spacy.load() with the sentencizer pipeline; None if the model is missing."""
+    # BLAS/OpenMP thread limits are set in app.workers.celery_app, before numpy loads
+    import spacy
+    try:
+        nlp = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+        # Rule-based sentencizer (fast) instead of the dependency parser
+        if "sentencizer" not in nlp.pipe_names:
+            nlp.add_pipe("sentencizer")
+        nlp.max_length = SPACY_MAX_LENGTH
+        logger.info("spaCy model '%s' loaded", SPACY_MODEL)
+        return nlp
+    except OSError:
+        logger.warning(
+            "spaCy model '%s' not found — run: python -m spacy download %s",
+            SPACY_MODEL, SPACY_MODEL,
+        )
+        return None   # caller will use fallback splitter
 
 
 # ---------------------------------------------------------------------------
@@ -167,8 +244,9 @@ class SemanticChunker:
       - Falls back to regex paragraph splitting if spaCy unavailable
       - Heading detection is heuristic (regex), not ML-based — fast but
         may miss non-standard headings in complex layouts
-      - Overlap is added only when a single paragraph exceeds MAX_CHUNK_CHARS,
-        not as a blanket strategy — avoids duplicating content unnecessarily
+      - Overlap is added only when a chunk must be cut mid-sentence at
+        MAX_CHUNK_CHARS, not as a blanket strategy — avoids duplicating
+        content unnecessarily
     """
 
     def chunk(
@@ -196,26 +274,29 @@ class SemanticChunker:
             Ordered list of ChunkResult (chunk_index 0, 1, 2, …)
         """
         text = _normalize_text(text)
-        if not text.strip():
+        if not text:    # _normalize_text already strips
             logger.warning("SemanticChunker: empty text for doc=%s", document_id)
             return []
 
-        # Step 1: Detect headings and split into sections
-        sections = self._split_into_sections(text)
-
-        # Step 2: Split each section into paragraph-level pieces
-        raw_chunks = self._sections_to_chunks(sections)
-
-        # Step 3: Enforce size limits (merge short, split long)
-        sized_chunks = self._enforce_size_limits(raw_chunks)
+        # Steps 1–3 are fused generators: headings → sections → paragraphs
+        # → size-enforced chunks. Sections and paragraphs are passed along as
+        # (start, end) offsets into `text`, so the only strings built are the
+        # final chunk texts — and each chunk arrives with its exact source
+        # offset for the page lookup.
+        nlp = _get_nlp()
+        sized_chunks = self._iter_sized(
+            text, self._iter_paragraphs(text, self._iter_sections(text), nlp)
+        )
 
-        # Step 4: Build ChunkResult objects
+        # Step 4: Build ChunkResult objects as chunks stream out
         results: list[ChunkResult] = []
-        for idx, (chunk_text, heading) in enumerate(sized_chunks):
-            char_offset = text.find(chunk_text[:40]) if chunk_text else 0
-            page_num = _lookup_page(char_offset, page_map)
+        page_offsets = sorted(page_map) if page_map else []
+        page_values  = [page_map[o] for o in page_offsets]
+        id_prefix    = _chunk_id_prefix(str(tenant_id), document_id)
+        for idx, (chunk_text, heading, char_offset) in enumerate(sized_chunks):
+            page_num = _lookup_page(char_offset, page_offsets, page_values)
 
-            chunk_id = _make_chunk_id(str(tenant_id), document_id, idx)
+            chunk_id = _chunk_id_from_prefix(id_prefix, idx)
 
             results.append(ChunkResult(
                 chunk_id=chunk_id,
@@ -228,17 +309,7 @@ class SemanticChunker:
                 page_number=page_num,
                 source_key=source_key,
                 heading=heading,
-                metadata={
-                    "tenant_id":   str(tenant_id),
-                    "document_id": document_id,
-                    "chunk_index": idx,
-                    "page_number": page_num,
-                    "source_key":  source_key,
-                    "heading":     heading,
-                    "char_count":  len(chunk_text),
-                    "token_est":   max(1, len(chunk_text) // 4),
-                    **(extra_meta or {}),
-                },
+                metadata=dict(extra_meta) if extra_meta else {},
             ))
 
         logger.info(
@@ -248,170 +319,249 @@ class SemanticChunker:
         )
         return results
 
+    def chunk_batch(
+        self,
+        docs:        list[dict],
+        max_workers: int | None = None,
+    ) -> list[list[ChunkResult]]:
+        """
+        Chunk many documents in parallel across CPU cores.
+
+        Args:
+            docs:        One dict of chunk() keyword arguments per document
+                         (text, tenant_id, document_id, source_key, …).
+            max_workers: Process count; defaults to os.cpu_count().
+                         1 (or a single document) runs inline.
+
+        Returns:
+            One ChunkResult list per input document, in input order.
+
+        Each child process loads the spaCy model once via the pool
+        initializer. Must be called from a non-daemonic process: Celery
+        prefork children cannot spawn a pool — inside workers, fan out by
+        queueing one process_document task per document instead.
+        """
+        workers = min(max_workers or os.cpu_count() or 1, len(docs))
+        if workers <= 1:
+            return [self.chunk(**doc) for doc in docs]
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_get_nlp) as pool:
+            return list(pool.map(_chunk_document, docs))
+
     # ------------------------------------------------------------------
     # Section detection
     # ------------------------------------------------------------------
 
-    def _split_into_sections(self, text: str) -> list[tuple[str, str]]:
+    def _iter_sections(self, text: str) -> Iterator[tuple[int, int, str]]:
         """
-        Split text into (section_text, heading) pairs.
+        Yield (start, end, heading) section spans while scanning lines.
         Heading is the nearest preceding heading-like line.
 
-        Returns list of (text_block, heading_str) tuples.
+        Only lines whose first non-blank character could open a heading
+        are materialised as strings; all other lines are skipped by offset.
+        If no non-empty section is found (e.g. the text is headings only),
+        yields the whole text once with an empty heading.
         """
-        lines = text.split("\n")
-        sections: list[tuple[str, str]] = []
-
         current_heading = ""
-        current_lines:  list[str] = []
-
-        for line in lines:
-            stripped = line.strip()
-            is_heading = bool(
-                stripped
-                and len(stripped) >= MIN_HEADING_LEN
-                and _HEADING_RE.match(stripped)
+        block_start     = 0
+        block_end       = -1      # -1 → no body lines since the last heading
+        emitted = False
+        # Repeated heading lines (running page headers, "APPENDIX" banners)
+        # resolve to one shared str, so chunks reference O(unique headings)
+        # objects and pickle each heading once per result list.
+        headings: dict[str, str] = {}
+
+        for first_pos, nl in _iter_lines(text):
+            first = text[first_pos] if first_pos < nl else ""
+
+            line = (
+                text[first_pos:nl].rstrip()
+                if first == "#" or "A" <= first <= "Z" or first.isdigit()
+                else ""
             )
-
-            if is_heading:
-                # Save the current block
-                if current_lines:
-                    block = "\n".join(current_lines).strip()
-                    if block:
-                        sections.append((block, current_heading))
+            if line and _is_heading(line):
+                # Emit the current block
+                if block_end != -1:
+                    start, end = _strip_span(text, block_start, block_end)
+                    if start < end:
+                        emitted = True
+                        yield start, end, current_heading
                 # Start a new section under this heading
-                current_heading = stripped
-                current_lines = []
+                current_heading = headings.setdefault(line, line)
+                block_start = nl + 1
+                block_end   = -1
             else:
-                current_lines.append(line)
+                block_end = nl
 
         # Flush the last section
-        if current_lines:
-            block = "\n".join(current_lines).strip()
-            if block:
-                sections.append((block, current_heading))
+        if block_end != -1:
+            start, end = _strip_span(text, block_start, block_end)
+            if start < end:
+                emitted = True
+                yield start, end, current_heading
 
-        if not sections:
-            sections = [(text, "")]
-
-        return sections
+        if not emitted:
+            yield 0, len(text), ""
 
     # ------------------------------------------------------------------
     # Paragraph → sentence splitting
     # ------------------------------------------------------------------
 
-    def _sections_to_chunks(
-        self, sections: list[tuple[str, str]]
-    ) -> list[tuple[str, str]]:
+    def _iter_paragraphs(
+        self, text: str, sections: Iterable[tuple[int, int, str]], nlp
+    ) -> Iterator[tuple[int, int, str]]:
         """
-        Convert sections to paragraph-level pieces, using spaCy
-        sentence segmentation within long paragraphs.
+        Yield paragraph-level (start, end, heading) spans from section spans,
+        using spaCy sentence segmentation (nlp, or regex if None) within
+        long paragraphs.
         """
-        results: list[tuple[str, str]] = []
-        nlp = _get_nlp()
-
-        for section_text, heading in sections:
+        for sec_start, sec_end, heading in sections:
             # Split into paragraphs at blank lines
-            paragraphs = re.split(r"\n\s*\n", section_text)
-
-            for para in paragraphs:
-                para = para.strip()
-                if not para:
-                    continue
-
-                if len(para) <= MAX_CHUNK_CHARS:
-                    # Paragraph fits in one chunk — keep whole
-                    results.append((para, heading))
-                else:
-                    # Long paragraph: split at sentence boundaries
-                    sentences = self._split_sentences(para, nlp)
-                    results.extend((s, heading) for s in sentences if s.strip())
-
-        return results
+            para_start = sec_start
+            for m in _PARA_SPLIT_RE.finditer(text, sec_start, sec_end):
+                yield from self._paragraph_pieces(text, para_start, m.start(), heading, nlp)
+                para_start = m.end()
+            yield from self._paragraph_pieces(text, para_start, sec_end, heading, nlp)
+
+    def _paragraph_pieces(
+        self, text: str, start: int, end: int, heading: str, nlp
+    ) -> Iterator[tuple[int, int, str]]:
+        """Yield one paragraph span, or its sentence spans if it is too long."""
+        start, end = _strip_span(text, start, end)
+        if start >= end:
+            return
+
+        if end - start <= MAX_CHUNK_CHARS:
+            # Paragraph fits in one chunk — keep whole
+            yield start, end, heading
+        else:
+            # Long paragraph: split at sentence boundaries
+            for sent_start, sent_end in self._split_sentences(text, start, end, nlp):
+                yield sent_start, sent_end, heading
 
-    def _split_sentences(self, text: str, nlp) -> list[str]:
+    def _split_sentences(
+        self, text: str, start: int, end: int, nlp
+    ) -> list[tuple[int, int]]:
         """
-        Split text into sentences using spaCy (if available)
-        or regex (fallback). Returns sentence strings.
+        Split text[start:end] into sentence spans using spaCy (if available)
+        or regex (fallback). Spans longer than SPACY_MAX_CHARS always use the
+        regex splitter. Returns non-empty, stripped (start, end) spans.
         """
-        if nlp is not None:
+        if nlp is not None and end - start <= SPACY_MAX_CHARS:
             try:
-                doc = nlp(text)
-                return [sent.text.strip() for sent in doc.sents if sent.text.strip()]
+                doc   = nlp(text[start:end])
+                spans = (
+                    _strip_span(text, start + sent.start_char, start + sent.end_char)
+                    for sent in doc.sents
+                )
+                return [(s, e) for s, e in spans if s < e]
             except Exception as exc:
                 logger.warning("spaCy sentence split failed: %s — using regex", exc)
 
         # Regex fallback: split at ". " or "? " or "! "
-        return [s.strip() for s in re.split(r"(?<=[.!?])\s+", text) if s.strip()]
+        spans: list[tuple[int, int]] = []
+        sent_start = start
+        for m in _SENT_SPLIT_RE.finditer(text, start, end):
+            spans.append(_strip_span(text, sent_start, m.start(1)))
+            sent_start = m.end(1)
+        spans.append(_strip_span(text, sent_start, end))
+        return [(s, e) for s, e in spans if s < e]
 
     # ------------------------------------------------------------------
     # Size enforcement
     # ------------------------------------------------------------------
 
-    def _enforce_size_limits(
-        self, chunks: list[tuple[str, str]]
-    ) -> list[tuple[str, str]]:
+    def _iter_sized(
+        self, text: str, pieces: Iterable[tuple[int, int, str]]
+    ) -> Iterator[tuple[str, str, int]]:
         """
-        Merge very short chunks with neighbours; hard-split chunks that
-        exceed MAX_CHUNK_CHARS.
+        Merge very short pieces with neighbours; hard-split pieces that
+        exceed MAX_CHUNK_CHARS. Yields (chunk_text, heading, char_offset).
 
-        Overlap is added ONLY when hard-splitting a chunk — not globally.
+        Overlap is added ONLY when hard-splitting a chunk mid-sentence — not globally.
         This avoids the RAG anti-pattern of embedding near-duplicate content.
         """
-        # Pass 1: Merge short chunks (< MIN_CHUNK_CHARS) with next
-        merged: list[tuple[str, str]] = []
-        buffer_text  = ""
+        # Merge short pieces (< MIN_CHUNK_CHARS) with the next one.
+        # The buffer holds spans and buffer_len tracks the "\n\n"-joined
+        # length, so text is only sliced when the buffer is flushed.
+        buffer_spans: list[tuple[int, int]] = []
+        buffer_len   = 0
         buffer_head  = ""
 
-        for text, heading in chunks:
-            if not buffer_text:
-                buffer_text = text
-                buffer_head = heading
-            elif len(buffer_text) < MIN_CHUNK_CHARS:
+        for start, end, heading in pieces:
+            if not buffer_spans:
+                buffer_spans = [(start, end)]
+                buffer_len   = end - start
+                buffer_head  = heading
+            elif buffer_len < MIN_CHUNK_CHARS:
                 # Merge: keep the non-empty heading
-                buffer_text += "\n\n" + text
+                buffer_spans.append((start, end))
+                buffer_len += end - start + 2   # + "\n\n" separator
                 buffer_head = buffer_head or heading
             else:
-                merged.append((buffer_text, buffer_head))
-                buffer_text = text
-                buffer_head = heading
-
-        if buffer_text:
-            merged.append((buffer_text, buffer_head))
-
-        # Pass 2: Hard-split oversized chunks with overlap
-        final: list[tuple[str, str]] = []
-        for text, heading in merged:
-            if len(text) <= MAX_CHUNK_CHARS:
-                final.append((text, heading))
-            else:
-                final.extend(self._hard_split(text, heading))
+                yield from self._flush(text, buffer_spans, buffer_len, buffer_head)
+                buffer_spans = [(start, end)]
+                buffer_len   = end - start
+                buffer_head  = heading
+
+        if buffer_spans:
+            yield from self._flush(text, buffer_spans, buffer_len, buffer_head)
+
+    def _flush(
+        self,
+        text:    str,
+        spans:   list[tuple[int, int]],
+        length:  int,
+        heading: str,
+    ) -> Iterator[tuple[str, str, int]]:
+        """Materialise a merge buffer and hard-split it if it exceeds MAX_CHUNK_CHARS."""
+        if len(spans) == 1:
+            joined = text[spans[0][0]:spans[0][1]]
+        else:
+            joined = "\n\n".join(text[s:e] for s, e in spans)
 
-        return final
+        if length <= MAX_CHUNK_CHARS:
+            yield joined, heading, spans[0][0]
+            return
 
-    def _hard_split(self, text: str, heading: str) -> list[tuple[str, str]]:
+        for chunk, offset in self._hard_split(joined):
+            yield chunk, heading, _source_offset(spans, offset)
+
+    def _hard_split(self, text: str) -> list[tuple[str, int]]:
         """
-        Split a text that exceeds MAX_CHUNK_CHARS into overlapping windows.
-        Overlap of OVERLAP_CHARS preserves continuity at the split boundary.
+        Split a text that exceeds MAX_CHUNK_CHARS into windows.
+
+        Windows end at a sentence boundary where one exists; the next window
+        then starts exactly there, since nothing was cut mid-sentence. Only a
+        forced cut at MAX_CHUNK_CHARS is overlapped by OVERLAP_CHARS to
+        preserve continuity across the break.
+
+        Returns (window_text, offset_in_text) pairs.
         """
-        parts: list[tuple[str, str]] = []
+        parts: list[tuple[str, int]] = []
         start = 0
         while start < len(text):
             end = start + MAX_CHUNK_CHARS
+            found_clean_boundary = False
             # Try to break at a sentence boundary near the end
             if end < len(text):
                 # Look backwards for the last ". " before the cutoff
                 boundary = text.rfind(". ", start, end)
-                if boundary != -1 and boundary > start + MIN_CHUNK_CHARS:
+                found_clean_boundary = boundary != -1 and boundary > start + MIN_CHUNK_CHARS
+                if found_clean_boundary:
                     end = boundary + 1   # include the period
                 # else: hard split at MAX_CHUNK_CHARS
 
-            chunk = text[start:end].strip()
-            if chunk:
-                parts.append((chunk, heading))
+            chunk_start, chunk_end = _strip_span(text, start, min(end, len(text)))
+            if chunk_start < chunk_end:
+                parts.append((text[chunk_start:chunk_end], chunk_start))
+
+            if end >= len(text):
+                break   # last window reached the end — nothing left to overlap into
 
-            # Next window starts OVERLAP_CHARS before the end
-            start = max(start + 1, end - OVERLAP_CHARS)
+            # Clean boundary: continue right after it. Forced cut: step back
+            # OVERLAP_CHARS so the split sentence appears in both windows.
+            start = end if found_clean_boundary else max(start + 1, end - OVERLAP_CHARS)
 
         return parts
 
@@ -420,37 +570,129 @@ class SemanticChunker:
 # Helpers
 # ---------------------------------------------------------------------------
 
+def _chunk_document(doc: dict) -> list[ChunkResult]:
+    """Process-pool entry point for SemanticChunker.chunk_batch()."""
+    return SemanticChunker().chunk(**doc)
+
+
 def _normalize_text(text: str) -> str:
     """
     Normalize Unicode, strip control characters, collapse excess whitespace.
     Preserves paragraph breaks (double newlines).
     """
-    # Normalize Unicode (NFC form — consistent character composition)
-    text = unicodedata.normalize("NFC", text)
-    # Replace non-breaking spaces, zero-width chars, etc.
-    text = re.sub(r"[\u00a0\u200b\u200c\u200d\ufeff]", " ", text)
+    if not text.isascii():
+        # Normalize Unicode (NFC form — consistent character composition)
+        text = unicodedata.normalize("NFC", text)
+    # Replace non-breaking spaces, zero-width chars, etc. and unify line breaks
+    text = text.replace("\r\n", "\n").translate(_NORMALIZE_TABLE)
     # Collapse 3+ newlines to double newline (preserve paragraph breaks)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _EXCESS_NL_RE.sub("\n\n", text)
     # Strip trailing whitespace per line
-    lines = [line.rstrip() for line in text.splitlines()]
-    return "\n".join(lines).strip()
+    text = _TRAILING_WS_RE.sub("", text)
+    return text.strip()
 
 
-def _lookup_page(char_offset: int, page_map: dict[int, int] | None) -> int:
+def _iter_lines(text: str) -> Iterator[tuple[int, int]]:
+    """
+    Yield (first_non_blank, line_end) offsets for each line of text.
+
+    Scans with str.find instead of text.split("\n"), so no per-line string
+    or line list is ever allocated. line_end is the offset of the newline
+    (or len(text)); first_non_blank == line_end for blank lines.
+    """
+    n   = len(text)
+    pos = 0
+    while pos <= n:
+        nl = text.find("\n", pos)
+        if nl == -1:
+            nl = n
+        while pos < nl and text[pos].isspace():
+            pos += 1
+        yield pos, nl
+        pos = nl + 1
+
+
+def _strip_span(text: str, start: int, end: int) -> tuple[int, int]:
+    """Narrow text[start:end] to exclude leading/trailing whitespace (no copy)."""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def _source_offset(spans: list[tuple[int, int]], pos: int) -> int:
+    """
+    Map a position in "\n\n".join(text[s:e] for s, e in spans) back to
+    its offset in the source text.
+    """
+    for start, end in spans:
+        if pos <= end - start:
+            return start + pos
+        pos -= end - start + 2
+    return spans[-1][1]
+
+
+def _is_heading(stripped: str) -> bool:
+    """
+    True if a stripped line looks like a heading.
+
+    Dispatches on the first character to the single heading pattern that
+    can match, so body lines starting with anything else (lowercase,
+    quotes, bullets, …) are rejected without entering the regex engine.
+    The ALL CAPS pattern is additionally gated on str.isupper(), which
+    rejects mixed-case lines in one C-level pass.
+    """
+    if len(stripped) < MIN_HEADING_LEN:
+        return False
+    first = stripped[0]
+    if first == "#":
+        return _MD_HEADING_RE.fullmatch(stripped) is not None
+    if "A" <= first <= "Z":
+        if stripped.isupper() and _CAPS_HEADING_RE.fullmatch(stripped):
+            return True
+        return (
+            first in "SCA"
+            and _KEYWORD_HEADING_RE.fullmatch(stripped) is not None
+        )
+    if first.isdigit():
+        return _NUMBERED_HEADING_RE.fullmatch(stripped) is not None
+    return False
+
+
+def _lookup_page(
+    char_offset:  int,
+    page_offsets: list[int],
+    page_values:  list[int],
+) -> int:
     """
     Look up the page number for a given character offset.
-    page_map keys are the starting char offset of each page.
-    Returns 1 if page_map is None or offset not found.
+
+    page_offsets are the sorted starting char offsets of each page and
+    page_values the matching page numbers (both derived once from page_map).
+    Binary search keeps each lookup O(log P).
+    Returns 1 if there is no page map or the offset precedes the first page.
     """
-    if not page_map:
-        return 1
-    page = 1
-    for offset_start, page_num in sorted(page_map.items()):
-        if char_offset >= offset_start:
-            page = page_num
-        else:
-            break
-    return page
+    i = bisect.bisect_right(page_offsets, char_offset) - 1
+    return page_values[i] if i >= 0 else 1
+
+
+def _chunk_id_prefix(tenant_id: str, document_id: str) -> Any:
+    """
+    SHA-256 state primed with "tenant_id:document_id:".
+
+    Hash once per document and .copy() per chunk, so the UUID strings
+    aren't re-hashed for every chunk. Produces the same IDs as
+    _make_chunk_id().
+    """
+    return hashlib.sha256(f"{tenant_id}:{document_id}:".encode())
+
+
+def _chunk_id_from_prefix(prefix: Any, chunk_index: int) -> str:
+    """Finish a _chunk_id_prefix() state for one chunk index."""
+    h = prefix.copy()
+    h.update(str(chunk_index).encode())
+    return h.hexdigest()[:32]
 
 
 def _make_chunk_id(tenant_id: str, document_id: str, chunk_index: int) -> str:
@@ -459,9 +701,7 @@ def _make_chunk_id(tenant_id: str, document_id: str, chunk_index: int) -> str:
     Determinism enables idempotent re-processing — upserting the same chunk
     twice doesn't create duplicates in the vector store.
     """
-    import hashlib
-    raw = f"{tenant_id}:{document_id}:{chunk_index}"
-    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+    return _chunk_id_from_prefix(_chunk_id_prefix(tenant_id, document_id), chunk_index)
 
 
 def build_page_map(pages_text: list[tuple[int, str]]) -> dict[int, int]:
@@ -15,25 +15,36 @@ OpenAI embedding model selection:
 
 Batching strategy:
   OpenAI API: max 8191 tokens per input, max 2048 inputs per batch call.
+  Inputs are truncated locally to MAX_EMBED_TOKENS first, so one oversize
+  chunk cannot fail (non-retryably) the other texts in its batch.
   We use 100 texts per batch (well within both limits) and issue concurrent
-  batch calls up to MAX_CONCURRENT_BATCHES to saturate network I/O.
+  batch calls up to settings.embedding_global_concurrency — shared by every
+  document embedding in the process — to saturate network I/O.
 
 Retry policy:
-  On RateLimitError  → wait RETRY_BASE_DELAY × 2^attempt (exponential)
+  On RateLimitError  → wait Retry-After if sent, else RETRY_BASE_DELAY × 2^attempt
   On APIError (5xx)  → wait RETRY_BASE_DELAY × 2^attempt
-  On APIConnectionError → immediate retry up to MAX_RETRIES
+  On APIConnectionError → same back-off, up to MAX_RETRIES
   On AuthenticationError → fail immediately (not transient)
+  Every wait is jittered ×[0.5, 1.5) and taken without holding a batch slot.
 """
 
 from __future__ import annotations
 
 import asyncio
+import base64
+import functools
 import logging
+import operator
+import random
 import time
+import weakref
 from dataclasses import dataclass, field
-from typing import Sequence
+from typing import AsyncIterator, Sequence
 from uuid import UUID
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -41,32 +52,88 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 EMBEDDING_BATCH_SIZE     = 100    # texts per OpenAI API call
-MAX_CONCURRENT_BATCHES   = 4      # concurrent embedding requests
+IN_FLIGHT_PER_REQUEST    = 2      # batch tasks / pooled connections per allowed concurrent request
 MAX_RETRIES              = 3      # per-batch retry limit
 RETRY_BASE_DELAY         = 2.0    # seconds — doubles each retry
 RETRY_MAX_DELAY          = 60.0   # cap
 
+# OpenAI rejects any input over 8191 tokens — and with it the whole batch.
+# Inputs are truncated locally to MAX_EMBED_TOKENS (small safety margin).
+MAX_EMBED_TOKENS         = 8000
+
 # Approximate tokens per character for cost estimation
 # GPT tokenizer averages ~0.25 tokens/char for English text
 CHARS_PER_TOKEN_EST = 4
 
+# ChunkResult fields copied into every vector record, fetched in one call
+_CHUNK_FIELDS = operator.attrgetter(
+    "chunk_id", "document_id", "chunk_index", "text", "source_key",
+    "page_number", "heading", "char_count", "token_est", "metadata",
+)
+
 
 # ---------------------------------------------------------------------------
 # Result dataclasses
 # ---------------------------------------------------------------------------
 
+@dataclass
+class VectorBatch:
+    """
+    Embedded chunks in column layout, ready for vector upsert.
+
+    ids      : deterministic chunk IDs, one per row
+    vectors  : float32 matrix of shape (len(ids), dimensions), contiguous
+    metadata : flat metadata dict per row
+
+    One (N, dimensions) matrix replaces N separate arrays and N record
+    dicts; rows are views into it, so slicing for upsert copies nothing.
+    """
+    ids:      list[str]
+    vectors:  np.ndarray
+    metadata: list[dict]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def empty(cls, dimensions: int) -> "VectorBatch":
+        return cls([], np.empty((0, dimensions), dtype=np.float32), [])
+
+    @classmethod
+    def concat(cls, batches: Sequence["VectorBatch"], dimensions: int) -> "VectorBatch":
+        """Join batches in order into one document-level batch."""
+        batches = [b for b in batches if len(b)]
+        if not batches:
+            return cls.empty(dimensions)
+        if len(batches) == 1:
+            return batches[0]
+        return cls(
+            ids=[i for b in batches for i in b.ids],
+            vectors=np.concatenate([b.vectors for b in batches]),
+            metadata=[m for b in batches for m in b.metadata],
+        )
+
+    def to_records(self) -> list:
+        """VectorRecord per row; each vector is a view into `vectors`."""
+        from app.vectorstore.base import VectorRecord
+        return [
+            VectorRecord(id=i, vector=v, metadata=m)
+            for i, v, m in zip(self.ids, self.vectors, self.metadata)
+        ]
+
+
 @dataclass
 class EmbeddingResult:
     """
     Full output of the embedding pipeline for one document.
 
-    vector_records : list of (chunk_id, vector, metadata) ready for vector upsert
+    vector_records : VectorBatch of ids / vectors / metadata ready for upsert
     total_chunks   : number of chunks processed
     total_tokens   : estimated token count (for cost monitoring)
     elapsed_ms     : total pipeline wall time
     failed_chunks  : indices of chunks that could not be embedded after retries
     """
-    vector_records: list[dict]    # [{id, vector, metadata}, ...]
+    vector_records: VectorBatch
     total_chunks:   int
     total_tokens:   int
     elapsed_ms:     float
@@ -79,15 +146,34 @@ class EmbeddingResult:
         return (self.total_chunks - len(self.failed_chunks)) / self.total_chunks
 
 
+@dataclass
+class EmbeddedBatch:
+    """
+    One finished batch from EmbeddingPipeline.iter_embed_chunks().
+
+    batch_idx      : position of the batch in the document (batches may finish out of order)
+    vector_records : VectorBatch for the batch — empty if the batch failed
+    tokens         : token count for the batch (0 if it failed)
+    failed_chunks  : positions in `chunks` of every chunk in a failed batch
+    """
+    batch_idx:      int
+    vector_records: VectorBatch
+    tokens:         int
+    failed_chunks:  list[int] = field(default_factory=list)
+
+
 # ---------------------------------------------------------------------------
 # Core embedding pipeline
 # ---------------------------------------------------------------------------
 
 class EmbeddingPipeline:
     """
-    Stateless embedding pipeline.
+    Embedding pipeline holding one lazily-created AsyncOpenAI client.
 
     One instance per worker task (created inside the Celery task function).
+    All batches and embed_query() share the client's connection pool, so a
+    document costs one TLS handshake rather than one per batch. Call
+    aclose() when done (run_embedding_pipeline does this).
 
     Usage:
         from app.processing.chunking import ChunkResult
@@ -96,7 +182,7 @@ class EmbeddingPipeline:
         pipeline = EmbeddingPipeline(tenant_id=tid, model="text-embedding-3-small")
         result   = await pipeline.embed_chunks(chunks)
 
-        # result.vector_records is ready for VectorStoreBase.upsert()
+        # result.vector_records.to_records() is ready for VectorStoreBase.upsert()
     """
 
     def __init__(
@@ -107,14 +193,72 @@ class EmbeddingPipeline:
         api_key:    str   = "",
     ) -> None:
         self._tenant_id  = tenant_id
+        self._tenant_str = str(tenant_id)   # MUST match store namespace
         self._model      = model
         self._dimensions = dimensions
         self._api_key    = api_key or self._get_api_key()
+        self._client     = None    # AsyncOpenAI, created on first use
+        self._warm_task: asyncio.Task | None = None
 
     def _get_api_key(self) -> str:
         from app.core.config import settings
         return settings.openai_api_key
 
+    def _get_client(self):
+        """
+        Return the shared AsyncOpenAI client, creating it on first use.
+
+        SDK retries are disabled (max_retries=0) because
+        _embed_batch_with_retry owns the retry policy. The pool keeps enough
+        keep-alive connections for embedding_global_concurrency requests in
+        flight (sized from the setting when the client is built).
+        """
+        if self._client is None:
+            import httpx
+            from openai import AsyncOpenAI
+
+            pool_size = max_in_flight_batches()
+            self._client = AsyncOpenAI(
+                api_key=self._api_key,
+                max_retries=0,
+                timeout=httpx.Timeout(60.0),
+                http_client=httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=pool_size,
+                        max_keepalive_connections=pool_size,
+                    ),
+                ),
+            )
+        return self._client
+
+    def warm_up(self) -> None:
+        """
+        Open the first pooled connection in the background.
+
+        A cold worker otherwise pays DNS + TLS setup (~200–500 ms) on the
+        first batch. Call this while the document is still being downloaded
+        and extracted; the handshake then overlaps that work. Issues one
+        lightweight GET /models; any failure is ignored — the first batch
+        simply connects as before. Idempotent; aclose() cancels it.
+        """
+        if self._warm_task is None:
+            self._warm_task = asyncio.ensure_future(self._warm_up())
+
+    async def _warm_up(self) -> None:
+        try:
+            await self._get_client().models.list()
+        except Exception as exc:
+            logger.debug("Embedding connection warm-up failed: %s", exc)
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP connection pool, if one was opened."""
+        if self._warm_task is not None:
+            self._warm_task.cancel()
+            self._warm_task = None
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.close()
+
     # ------------------------------------------------------------------
     # Public entry point
     # ------------------------------------------------------------------
@@ -126,12 +270,9 @@ class EmbeddingPipeline:
         """
         Embed all chunks using batched OpenAI API calls.
 
-        Flow:
-          1. Split chunks into batches of EMBEDDING_BATCH_SIZE
-          2. Issue up to MAX_CONCURRENT_BATCHES requests concurrently
-          3. Retry failed batches with exponential back-off
-          4. Build VectorRecord list from successful embeddings
-          5. Return EmbeddingResult with full observability metrics
+        Collects iter_embed_chunks() into a single EmbeddingResult, with
+        vector_records in chunk order. Prefer iter_embed_chunks() for large
+        documents: this holds every vector in memory at once.
 
         Args:
             chunks: list of ChunkResult from SemanticChunker
@@ -139,73 +280,132 @@ class EmbeddingPipeline:
         Returns:
             EmbeddingResult with vector_records ready for upsert
         """
-        if not chunks:
-            return EmbeddingResult(
-                vector_records=[], total_chunks=0, total_tokens=0,
-                elapsed_ms=0.0,
-            )
-
         t0 = time.monotonic()
 
-        # Split into batches
-        batches = [
-            chunks[i : i + EMBEDDING_BATCH_SIZE]
-            for i in range(0, len(chunks), EMBEDDING_BATCH_SIZE)
-        ]
-
-        logger.info(
-            "EmbeddingPipeline | tenant=%s chunks=%d batches=%d model=%s",
-            self._tenant_id, len(chunks), len(batches), self._model,
-        )
+        batches: list[EmbeddedBatch] = [b async for b in self.iter_embed_chunks(chunks)]
+        batches.sort(key=lambda b: b.batch_idx)
 
-        # Issue batches concurrently (bounded by semaphore)
-        semaphore = asyncio.Semaphore(MAX_CONCURRENT_BATCHES)
-        tasks = [
-            self._embed_batch_with_retry(batch, batch_idx, semaphore)
-            for batch_idx, batch in enumerate(batches)
-        ]
+        failed_chunks: list[int] = []
+        total_tokens = 0
+        for batch in batches:
+            failed_chunks.extend(batch.failed_chunks)
+            total_tokens += batch.tokens
 
-        batch_results = await asyncio.gather(*tasks, return_exceptions=True)
+        return EmbeddingResult(
+            vector_records=VectorBatch.concat(
+                [b.vector_records for b in batches], self._dimensions
+            ),
+            total_chunks=len(chunks),
+            total_tokens=total_tokens,
+            elapsed_ms=(time.monotonic() - t0) * 1000,
+            failed_chunks=failed_chunks,
+        )
 
-        # Collect results
-        vector_records: list[dict] = []
-        failed_chunks:  list[int]  = []
-        total_tokens = 0
+    async def iter_embed_chunks(
+        self,
+        chunks: list,    # list[ChunkResult] — avoiding circular import
+    ) -> AsyncIterator[EmbeddedBatch]:
+        """
+        Embed chunks and yield each batch as soon as it finishes.
 
-        chunk_offset = 0
-        for batch_idx, result in enumerate(batch_results):
-            batch = batches[batch_idx]
+        Flow:
+          1. Split chunks into batches of EMBEDDING_BATCH_SIZE
+          2. Keep up to max_in_flight_batches() batch tasks scheduled, issuing
+             at most embedding_global_concurrency requests concurrently
+             (process-wide, see get_embedding_limiter)
+          3. Retry failed batches with exponential back-off
+          4. Yield an EmbeddedBatch per batch in completion order
+          5. On a fatal error (auth, dimensions) stop scheduling and report
+             every remaining batch as failed
+
+        Batches keep embedding while the caller processes a yielded one, so
+        the caller can upsert and drop each batch — peak memory is bounded
+        by the batches in flight, not the document. Leaving the loop early
+        cancels the batches still pending.
+        """
+        if not chunks:
+            return
 
-            if isinstance(result, Exception):
-                logger.error(
-                    "Batch %d permanently failed: %s", batch_idx, result
-                )
-                failed_chunks.extend(
-                    chunk_offset + i for i in range(len(batch))
-                )
-                chunk_offset += len(batch)
-                continue
+        t0 = time.monotonic()
+        # Each batch's chunk positions are fixed once, as a range: the same
+        # range slices the batch and reports its chunks if it fails.
+        positions = [
+            range(start, min(start + EMBEDDING_BATCH_SIZE, len(chunks)))
+            for start in range(0, len(chunks), EMBEDDING_BATCH_SIZE)
+        ]
+        n_batches = len(positions)
 
-            records, tokens = result
-            vector_records.extend(records)
-            total_tokens += tokens
-            chunk_offset += len(batch)
+        logger.info(
+            "EmbeddingPipeline | tenant=%s chunks=%d batches=%d model=%s",
+            self._tenant_id, len(chunks), n_batches, self._model,
+        )
 
-        elapsed_ms = (time.monotonic() - t0) * 1000
+        # Bounded producer: only max_in_flight_batches() tasks (and their batch
+        # slices) exist at a time; the next batch is scheduled as one
+        # finishes. API calls are bounded separately by the process-wide
+        # limiter shared with every other pipeline on this event loop, so a
+        # batch sleeping in retry back-off does not hold up the others.
+        semaphore     = get_embedding_limiter()
+        max_in_flight = max_in_flight_batches()
+        in_flight: dict[asyncio.Task, int] = {}
+        next_idx = 0
+
+        def schedule() -> None:
+            nonlocal next_idx
+            while next_idx < n_batches and len(in_flight) < max_in_flight:
+                span = positions[next_idx]
+                task = asyncio.ensure_future(self._embed_batch_with_retry(
+                    chunks[span.start : span.stop], next_idx, semaphore
+                ))
+                in_flight[task] = next_idx
+                next_idx += 1
+
+        vector_count = failed_count = total_tokens = 0
+        aborted: Exception | None = None
+        schedule()
+        try:
+            while in_flight:
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    batch_idx = in_flight.pop(task)
+                    exc = task.exception() if not task.cancelled() else aborted
+
+                    if exc is not None:
+                        logger.error("Batch %d permanently failed: %s", batch_idx, exc)
+                        failed = list(positions[batch_idx])
+                        failed_count += len(failed)
+                        if aborted is None and _is_fatal(exc):
+                            # Same credentials / config for every batch — stop
+                            # now instead of failing the rest one by one.
+                            aborted = exc
+                            for other in in_flight:
+                                other.cancel()
+                        yield EmbeddedBatch(batch_idx, VectorBatch.empty(self._dimensions), 0, failed)
+                        continue
+
+                    records, tokens = task.result()
+                    vector_count += len(records)
+                    total_tokens += tokens
+                    yield EmbeddedBatch(batch_idx, records, tokens)
+
+                if aborted is None:
+                    schedule()
+
+            # Batches never scheduled because of a fatal error
+            if aborted is not None:
+                for batch_idx in range(next_idx, n_batches):
+                    failed = list(positions[batch_idx])
+                    failed_count += len(failed)
+                    yield EmbeddedBatch(batch_idx, VectorBatch.empty(self._dimensions), 0, failed)
+        finally:
+            for task in in_flight:
+                task.cancel()
 
         logger.info(
             "EmbeddingPipeline done | tenant=%s vectors=%d failed=%d "
             "tokens_est=%d elapsed_ms=%.0f",
-            self._tenant_id, len(vector_records),
-            len(failed_chunks), total_tokens, elapsed_ms,
-        )
-
-        return EmbeddingResult(
-            vector_records=vector_records,
-            total_chunks=len(chunks),
-            total_tokens=total_tokens,
-            elapsed_ms=elapsed_ms,
-            failed_chunks=failed_chunks,
+            self._tenant_id, vector_count, failed_count, total_tokens,
+            (time.monotonic() - t0) * 1000,
         )
 
     # ------------------------------------------------------------------
@@ -217,7 +417,7 @@ class EmbeddingPipeline:
         batch:     list,
         batch_idx: int,
         semaphore: asyncio.Semaphore,
-    ) -> tuple[list[dict], int]:
+    ) -> tuple[VectorBatch, int]:
         """
         Embed a single batch with exponential back-off retry.
 
@@ -230,14 +430,8 @@ class EmbeddingPipeline:
         last_error: Exception | None = None
 
         for attempt in range(MAX_RETRIES + 1):
-            if attempt > 0:
-                delay = min(RETRY_BASE_DELAY * (2 ** (attempt - 1)), RETRY_MAX_DELAY)
-                logger.warning(
-                    "Embedding retry | batch=%d attempt=%d delay=%.1fs error=%s",
-                    batch_idx, attempt, delay, last_error,
-                )
-                await asyncio.sleep(delay)
-
+            # Hold a concurrency slot only for the API call itself; back-off
+            # sleeps happen outside it so other batches keep progressing.
             async with semaphore:
                 try:
                     return await self._call_openai(batch, batch_idx)
@@ -246,7 +440,7 @@ class EmbeddingPipeline:
                     error_name = type(exc).__name__
 
                     # Non-retryable errors — fail immediately
-                    if "AuthenticationError" in error_name or "InvalidRequestError" in error_name:
+                    if _is_fatal(exc) or "InvalidRequestError" in error_name:
                         logger.error(
                             "Non-retryable embedding error batch=%d: %s", batch_idx, exc
                         )
@@ -258,26 +452,41 @@ class EmbeddingPipeline:
                         batch_idx, attempt, error_name, exc,
                     )
 
+            if attempt < MAX_RETRIES:
+                delay = _retry_delay(last_error, attempt)
+                logger.warning(
+                    "Embedding retry | batch=%d attempt=%d delay=%.1fs error=%s",
+                    batch_idx, attempt + 1, delay, last_error,
+                )
+                await asyncio.sleep(delay)
+
         raise last_error or RuntimeError(f"Embedding batch {batch_idx} failed after {MAX_RETRIES} retries")
 
     async def _call_openai(
         self,
         batch:     list,
         batch_idx: int,
-    ) -> tuple[list[dict], int]:
+    ) -> tuple[VectorBatch, int]:
         """
         Single OpenAI embeddings API call for a batch of chunks.
 
-        Uses openai.AsyncOpenAI for async I/O — does not block the event loop.
+        Uses the shared AsyncOpenAI client for async I/O — does not block
+        the event loop.
 
         Returns:
             (vector_records, estimated_tokens)
         """
-        from openai import AsyncOpenAI
-
-        client = AsyncOpenAI(api_key=self._api_key)
+        client = self._get_client()
         texts  = [chunk.text for chunk in batch]
 
+        # Every token spans at least one UTF-8 byte (≤ 4 per char), so only
+        # texts longer than MAX_EMBED_TOKENS / 4 chars can exceed the limit.
+        # Those are measured with tiktoken off the event loop.
+        if any(len(t) * 4 > MAX_EMBED_TOKENS for t in texts):
+            texts = await asyncio.to_thread(
+                _truncate_texts, texts, self._model, MAX_EMBED_TOKENS
+            )
+
         t_api = time.monotonic()
 
         response = await client.embeddings.create(
@@ -285,13 +494,18 @@ class EmbeddingPipeline:
             input=texts,
             dimensions=self._dimensions if self._dimensions != 1536 else None,
             # Note: dimensions param only works for text-embedding-3-* models
+            encoding_format="base64",
+            # Raw little-endian float32 bytes: ~1/3 the payload of JSON floats,
+            # decoded straight into a float32 array below
         )
 
         api_ms = (time.monotonic() - t_api) * 1000
 
-        # Extract usage (OpenAI returns actual token count)
-        tokens_used = response.usage.total_tokens if response.usage else sum(
-            len(t) // CHARS_PER_TOKEN_EST for t in texts
+        # Extract usage (OpenAI returns actual token count). The estimate
+        # divides the batch total once: map(len) + sum stay in C.
+        tokens_used = (
+            response.usage.total_tokens if response.usage
+            else sum(map(len, texts)) // CHARS_PER_TOKEN_EST
         )
 
         logger.debug(
@@ -299,32 +513,47 @@ class EmbeddingPipeline:
             batch_idx, len(batch), tokens_used, api_ms,
         )
 
-        # Build VectorRecord dicts
-        records: list[dict] = []
-        for chunk, embedding_obj in zip(batch, response.data):
-            vector = embedding_obj.embedding
-
-            records.append({
-                "id":     chunk.chunk_id,    # deterministic sha256 ID
-                "vector": vector,
-                "metadata": {
-                    # ── Required fields for VectorStoreBase ──────────
-                    "tenant_id":   str(self._tenant_id),   # MUST match store namespace
-                    "document_id": chunk.document_id,
-                    "chunk_index": chunk.chunk_index,
-                    "text":        chunk.text,              # stored for retrieval without DB
-                    "source_key":  chunk.source_key,        # S3 key for citations
-                    # ── Searchable enrichment ─────────────────────────
-                    "page_number": chunk.page_number,
-                    "heading":     chunk.heading,
-                    "char_count":  chunk.char_count,
-                    "token_est":   chunk.token_est,
-                    # ── Filterable fields for RAG metadata filters ────
-                    **chunk.metadata,    # includes any extra fields from extractor
-                },
-            })
-
-        return records, tokens_used
+        # Build the VectorBatch columns — vectors decoded straight into one
+        # preallocated float32 matrix; one metadata dict per chunk, built as
+        # a literal and then extended in place with the chunk's extra fields
+        # (which still take precedence, as before). Chunk fields are read
+        # with one C-level attrgetter call per chunk.
+        tenant_str = self._tenant_str
+        dimensions = self._dimensions
+        ids:      list[str]  = []
+        metas:    list[dict] = []
+        vectors = np.empty((len(batch), dimensions), dtype=np.float32)
+        for row, (chunk, embedding_obj) in enumerate(zip(batch, response.data)):
+            (chunk_id, document_id, chunk_index, text, source_key,
+             page_number, heading, char_count, token_est, extra) = _CHUNK_FIELDS(chunk)
+
+            # float32: ~6 KB per 1536-dim vector vs ~43 KB of PyFloats.
+            # Pinecone and Weaviate clients both accept ndarray rows directly.
+            vectors[row] = _decode_embedding(embedding_obj.embedding, dimensions)
+
+            metadata = {
+                # ── Required fields for VectorStoreBase ──────────
+                "tenant_id":   tenant_str,
+                "document_id": document_id,
+                "chunk_index": chunk_index,
+                "text":        text,                    # stored for retrieval without DB
+                "source_key":  source_key,              # S3 key for citations
+                # ── Searchable enrichment ─────────────────────────
+                "page_number": page_number,
+                "heading":     heading,
+                "char_count":  char_count,
+                "token_est":   token_est,
+            }
+            if extra:
+                # ── Filterable fields for RAG metadata filters ────
+                metadata.update(extra)    # extra fields from extractor
+
+            ids.append(chunk_id)    # deterministic sha256 ID
+            metas.append(metadata)
+
+        if len(ids) < len(batch):    # short response — drop unfilled rows
+            vectors = vectors[:len(ids)]
+        return VectorBatch(ids, vectors, metas), tokens_used
 
     # ------------------------------------------------------------------
     # Utility: embed a single query string (for RAG retrieval)
@@ -333,35 +562,216 @@ class EmbeddingPipeline:
     async def embed_query(self, text: str) -> list[float]:
         """
         Embed a single text string for RAG query-time use.
-        Uses the same model as document ingestion for consistency.
+        Uses the same model as document ingestion for consistency, and the
+        same process-wide cached encoder for oversize queries.
         """
-        from openai import AsyncOpenAI
-        client   = AsyncOpenAI(api_key=self._api_key)
-        response = await client.embeddings.create(
+        if len(text) * 4 > MAX_EMBED_TOKENS:
+            (text,) = await asyncio.to_thread(
+                _truncate_texts, [text], self._model, MAX_EMBED_TOKENS
+            )
+
+        response = await self._get_client().embeddings.create(
             model=self._model,
             input=[text],
+            dimensions=self._dimensions if self._dimensions != 1536 else None,
+            encoding_format="base64",
         )
-        return response.data[0].embedding
+        return _decode_embedding(response.data[0].embedding, self._dimensions).tolist()
 
 
 # ---------------------------------------------------------------------------
-# Module-level convenience function (used by Celery task)
+# Process-wide request limiter
 # ---------------------------------------------------------------------------
 
-async def run_embedding_pipeline(
-    chunks:    list,
-    tenant_id: UUID,
-) -> EmbeddingResult:
+_LIMITERS: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def max_in_flight_batches() -> int:
     """
-    Convenience wrapper — creates an EmbeddingPipeline and runs it.
-    Reads model config from application settings.
+    Batch tasks scheduled per document (including those in retry back-off),
+    and the HTTP pool size: IN_FLIGHT_PER_REQUEST × embedding_global_concurrency,
+    so raising the setting is not capped by either.
+    """
+    from app.core.config import settings
+    return settings.embedding_global_concurrency * IN_FLIGHT_PER_REQUEST
+
+
+def get_embedding_limiter() -> asyncio.Semaphore:
+    """
+    Semaphore bounding concurrent embedding requests from every pipeline on
+    the running event loop to settings.embedding_global_concurrency.
+
+    A per-pipeline semaphore let N concurrent documents issue N × the limit
+    requests. Semaphores are bound to one loop, so there is one per loop;
+    the Celery worker's per-task loops get a fresh limiter each and the
+    entry disappears when the loop is garbage-collected.
+
+    The ceiling is per process: with prefork concurrency C the worker can
+    issue up to C × embedding_global_concurrency requests — size it (or the
+    pool) against the account's rate limit accordingly.
+    """
+    loop = asyncio.get_running_loop()
+    limiter = _LIMITERS.get(loop)
+    if limiter is None:
+        from app.core.config import settings
+        limiter = _LIMITERS[loop] = asyncio.Semaphore(settings.embedding_global_concurrency)
+    return limiter
+
+
+# ---------------------------------------------------------------------------
+# Vector decoding
+# ---------------------------------------------------------------------------
+
+class EmbeddingDimensionError(ValueError):
+    """The API returned vectors of a different size than the index expects."""
+
+
+def _is_fatal(exc: BaseException) -> bool:
+    """
+    Errors that will fail every batch identically (bad credentials, wrong
+    model/dimensions config) — not retried, and stop the whole document.
+    """
+    return isinstance(exc, EmbeddingDimensionError) or "AuthenticationError" in type(exc).__name__
+
+
+def _decode_embedding(embedding: str | list[float], dimensions: int) -> np.ndarray:
+    """
+    Decode an embedding from encoding_format="base64" into a float32 array.
+    Also accepts a plain float list (e.g. from a proxy that ignores the format).
+
+    Raises:
+        EmbeddingDimensionError if the vector is not `dimensions` long — a
+        misconfigured model/dimensions pair, which retrying cannot fix.
     """
+    if isinstance(embedding, str):
+        vector = np.frombuffer(base64.b64decode(embedding), dtype="<f4")
+    else:
+        vector = np.asarray(embedding, dtype=np.float32)
+    if vector.shape[0] != dimensions:
+        raise EmbeddingDimensionError(
+            f"Expected {dimensions}-dim embedding, got {vector.shape[0]}"
+        )
+    return vector
+
+
+# ---------------------------------------------------------------------------
+# Input truncation
+# ---------------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=4)
+def _get_encoder(model: str):
+    """
+    tiktoken encoder for an embedding model, loaded once per process.
+    Returns None if tiktoken or its BPE file is unavailable.
+
+    Loading the BPE ranks is the slow part (hundreds of ms), so every
+    pipeline and query in the worker shares this handle. tiktoken's
+    encoder is safe to call from several threads at once.
+    """
+    try:
+        import tiktoken
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as exc:
+        logger.warning("tiktoken encoder unavailable (%s) — truncating by bytes", exc)
+        return None
+
+
+def _truncate_texts(texts: list[str], model: str, limit: int) -> list[str]:
+    """
+    Truncate each text to at most `limit` tokens.
+
+    Without an encoder, falls back to cutting at `limit` UTF-8 bytes, which
+    is always within the limit since no token is shorter than one byte.
+    """
+    encoder = _get_encoder(model)
+    out: list[str] = []
+    for text in texts:
+        if len(text) * 4 <= limit:
+            out.append(text)
+            continue
+        if encoder is not None:
+            ids = encoder.encode(text, disallowed_special=())
+            if len(ids) > limit:
+                text = encoder.decode(ids[:limit])
+        else:
+            raw = text.encode("utf-8")
+            if len(raw) > limit:
+                text = raw[:limit].decode("utf-8", errors="ignore")
+        out.append(text)
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Retry back-off
+# ---------------------------------------------------------------------------
+
+def _retry_after_seconds(exc: Exception) -> float | None:
+    """
+    Server-suggested wait from an OpenAI error response, if any.
+
+    Reads the retry-after-ms header (sent by OpenAI) or a numeric Retry-After
+    header. HTTP-date values are ignored.
+    """
+    response = getattr(exc, "response", None)
+    headers  = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        if (ms := headers.get("retry-after-ms")) is not None:
+            return float(ms) / 1000
+        if (sec := headers.get("retry-after")) is not None:
+            return float(sec)
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+def _retry_delay(exc: Exception, attempt: int) -> float:
+    """
+    Back-off before retry number attempt + 1.
+
+    Uses the server's Retry-After when present, otherwise exponential
+    RETRY_BASE_DELAY × 2^attempt, capped at RETRY_MAX_DELAY. Jitter of
+    ×[0.5, 1.5) desynchronises the concurrent batches so a 429 does not
+    make them all retry in lock-step.
+    """
+    delay = _retry_after_seconds(exc)
+    if delay is None:
+        delay = RETRY_BASE_DELAY * (2 ** attempt)
+    return min(delay, RETRY_MAX_DELAY) * (0.5 + random.random())
+
+
+# ---------------------------------------------------------------------------
+# Module-level convenience function (used by Celery task)
+# ---------------------------------------------------------------------------
+
+def create_embedding_pipeline(tenant_id: UUID) -> EmbeddingPipeline:
+    """EmbeddingPipeline configured from application settings."""
     from app.core.config import settings
 
-    pipeline = EmbeddingPipeline(
+    return EmbeddingPipeline(
         tenant_id=tenant_id,
         model=settings.embedding_model,
         dimensions=settings.embedding_dimensions,
         api_key=settings.openai_api_key,
     )
-    return await pipeline.embed_chunks(chunks)
+
+
+async def run_embedding_pipeline(
+    chunks:    list,
+    tenant_id: UUID,
+) -> EmbeddingResult:
+    """
+    Convenience wrapper — creates an EmbeddingPipeline and runs it.
+    Reads model config from application settings.
+    """
+    pipeline = create_embedding_pipeline(tenant_id)
+    try:
+        return await pipeline.embed_chunks(chunks)
+    finally:
+        await pipeline.aclose()
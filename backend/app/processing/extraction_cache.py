@@ -0,0 +1,159 @@
+"""
+Extraction Cache  —  Content-Addressed Strategy Results
+═══════════════════════════════════════════════════════
+
+Re-ingesting an identical PDF (task retries, duplicate uploads, tenant
+re-imports) used to re-run the whole extraction cascade — seconds to
+minutes when OCR is involved. Strategy results are now stored in Redis,
+keyed by a digest of the PDF bytes:
+
+  extract:<tenant_id>:<strategy>:<blake2b-256 of the PDF>
+
+  • Tenant-scoped: a hit never reveals that another tenant uploaded the
+    same document (no cross-tenant existence oracle).
+  • Strategy-scoped: the PyMuPDF text layer and the OCR output of the same
+    document are cached independently.
+  • Best-effort: any Redis error is logged and treated as a miss — the
+    cache can only make extraction faster, never make it fail.
+
+Disabled unless settings.extraction_cache_url is set.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import os
+import zlib
+from uuid import UUID
+
+from app.processing.ocr import ExtractionStrategyResult, PageText, PdfSource
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "extract"
+
+
+# ---------------------------------------------------------------------------
+# PDF digest
+# ---------------------------------------------------------------------------
+
+def _new_hash():
+    # BLAKE2b is in the stdlib and ~1 GB/s — no extra dependency for 100 MB PDFs
+    return hashlib.blake2b(digest_size=32)
+
+
+@functools.lru_cache(maxsize=8)
+def _file_digest(path: str, size: int, mtime_ns: int) -> str:
+    """Digest of a file; (size, mtime) in the cache key invalidates rewrites."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, _new_hash).hexdigest()
+
+
+def pdf_digest(pdf_source: PdfSource) -> str:
+    """Hex BLAKE2b-256 digest of a PDF given as bytes or a file path. Blocking."""
+    if isinstance(pdf_source, (bytes, bytearray)):
+        h = _new_hash()
+        h.update(pdf_source)
+        return h.hexdigest()
+    path = os.fspath(pdf_source)
+    st   = os.stat(path)
+    return _file_digest(path, st.st_size, st.st_mtime_ns)
+
+
+# ---------------------------------------------------------------------------
+# Serialisation
+# ---------------------------------------------------------------------------
+
+def _dumps(result: ExtractionStrategyResult) -> bytes:
+    payload = {
+        "pages": [
+            [p.page_number, p.text, p.confidence, p.extraction_method]
+            for p in result.pages
+        ],
+        "total_chars":   result.total_chars,
+        "strategy_name": result.strategy_name,
+        "used_ocr":      result.used_ocr,
+    }
+    # Level 1: extracted text compresses ~3× at a negligible CPU cost
+    return zlib.compress(json.dumps(payload, ensure_ascii=False).encode(), 1)
+
+
+def _loads(raw: bytes) -> ExtractionStrategyResult:
+    payload = json.loads(zlib.decompress(raw))
+    return ExtractionStrategyResult(
+        pages=[PageText(*p) for p in payload["pages"]],
+        total_chars=payload["total_chars"],
+        strategy_name=payload["strategy_name"],
+        elapsed_ms=0.0,
+        used_ocr=payload["used_ocr"],
+    )
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+class ExtractionCache:
+    """
+    Tenant-scoped Redis cache of ExtractionStrategyResult objects.
+
+    The Redis client is created on first use and bound to the running event
+    loop — create one cache per Celery task and aclose() it when done.
+    """
+
+    def __init__(self, url: str, tenant_id: UUID, ttl_seconds: int) -> None:
+        self._url         = url
+        self._scope       = str(tenant_id)
+        self._ttl_seconds = ttl_seconds
+        self._redis       = None    # redis.asyncio.Redis, created on first use
+
+    def _key(self, strategy: str, digest: str) -> str:
+        return f"{CACHE_KEY_PREFIX}:{self._scope}:{strategy}:{digest}"
+
+    def _get_client(self):
+        if self._redis is None:
+            import redis.asyncio as aioredis
+            self._redis = aioredis.from_url(self._url)
+        return self._redis
+
+    async def digest(self, pdf_source: PdfSource) -> str:
+        """pdf_digest() off the event loop."""
+        return await asyncio.to_thread(pdf_digest, pdf_source)
+
+    async def get(self, strategy: str, digest: str) -> ExtractionStrategyResult | None:
+        try:
+            raw = await self._get_client().get(self._key(strategy, digest))
+            return _loads(raw) if raw is not None else None
+        except Exception as exc:
+            logger.warning("Extraction cache read failed (%s) — treating as miss", exc)
+            return None
+
+    async def put(self, strategy: str, digest: str, result: ExtractionStrategyResult) -> None:
+        try:
+            await self._get_client().set(
+                self._key(strategy, digest), _dumps(result), ex=self._ttl_seconds,
+            )
+        except Exception as exc:
+            logger.warning("Extraction cache write failed: %s", exc)
+
+    async def aclose(self) -> None:
+        if self._redis is not None:
+            client, self._redis = self._redis, None
+            await client.aclose()
+
+
+def get_extraction_cache(tenant_id: UUID) -> ExtractionCache | None:
+    """ExtractionCache from application settings, or None if disabled."""
+    from app.core.config import settings
+
+    if not settings.extraction_cache_url:
+        return None
+    return ExtractionCache(
+        url=settings.extraction_cache_url,
+        tenant_id=tenant_id,
+        ttl_seconds=settings.extraction_cache_ttl_seconds,
+    )
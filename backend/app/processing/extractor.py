@@ -8,6 +8,9 @@ by the semantic chunker.
 Strategy selection flow:
   1.  Try PyMuPDF (fast, in-process, native PDF text layer)
   2a. If avg_chars_per_page < threshold  →  document is scanned
+      (OCR starts speculatively once the first SCAN_SAMPLE_FRACTION of
+      pages already looks scanned, and is cancelled if the full document
+      turns out to have a text layer)
   2b. Select OCR backend from settings:
         UNSTRUCTURED  → UnstructuredExtractor (default, on-premise)
         TEXTRACT      → TextractExtractor (AWS managed, high accuracy)
@@ -18,24 +21,31 @@ Strategy selection flow:
         - whether OCR was invoked
         - per-page confidence scores
 
+Each strategy result is cached by PDF digest when an ExtractionCache is
+given (see extraction_cache.py), so re-ingesting a document skips both.
+
 This module is the only place that knows about the strategy cascade.
 Workers and other callers only see ExtractionResult.
 """
 
 from __future__ import annotations
 
+import asyncio
+import importlib
 import logging
 import os
 import time
 from dataclasses import dataclass, field
 
+from app.processing.extraction_cache import ExtractionCache
 from app.processing.ocr import (
+    MIN_CHARS_PER_PAGE_THRESHOLD,
     ExtractionStrategyResult,
+    PdfSource,
     PyMuPDFExtractor,
     TextractExtractor,
     UnstructuredExtractor,
 )
-from app.processing.chunking import build_page_map
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +53,11 @@ logger = logging.getLogger(__name__)
 # Set OCR_BACKEND=textract in production if Textract is preferred
 _OCR_BACKEND = os.getenv("OCR_BACKEND", "unstructured").lower()
 
+# Unstructured partition strategy once PyMuPDF has classified the document as
+# scanned: "ocr_only" skips hi_res's redundant pdfminer text-layer pass.
+# Set to "hi_res" to keep layout detection / table structure for scans.
+_UNSTRUCTURED_FALLBACK_STRATEGY = os.getenv("UNSTRUCTURED_FALLBACK_STRATEGY", "ocr_only")
+
 # Textract async threshold (pages): use StartDocumentTextDetection for >3 pages
 _TEXTRACT_ASYNC_PAGE_THRESHOLD = 3
 
@@ -88,23 +103,42 @@ class TextExtractorOrchestrator:
     Constructor args:
         s3_bucket  : bucket where the document lives (for Textract async jobs)
         s3_key     : S3 key of the document (for Textract async jobs)
+        cache      : optional ExtractionCache — strategy results are looked up
+                     by PDF digest before running, and stored after
 
     Usage:
         orchestrator = TextExtractorOrchestrator(s3_bucket, s3_key)
-        result = await orchestrator.extract(pdf_bytes)
+        result = await orchestrator.extract(pdf_path)   # or raw PDF bytes
+        await orchestrator.aclose()
     """
 
-    def __init__(self, s3_bucket: str = "", s3_key: str = "") -> None:
+    def __init__(
+        self,
+        s3_bucket: str                    = "",
+        s3_key:    str                    = "",
+        cache:     ExtractionCache | None = None,
+    ) -> None:
         self._s3_bucket = s3_bucket
         self._s3_key    = s3_key
+        self._cache     = cache
         self._pymupdf   = PyMuPDFExtractor()
 
-    async def extract(self, pdf_bytes: bytes) -> ExtractionResult:
+    async def aclose(self) -> None:
+        """Release the cache connection, if any."""
+        if self._cache is not None:
+            await self._cache.aclose()
+
+    async def extract(self, pdf_source: PdfSource) -> ExtractionResult:
         """
         Execute the strategy cascade and return a unified ExtractionResult.
 
+        pdf_source may be raw bytes or a local file path. Prefer a path for
+        large documents: every strategy opens it directly, so the document
+        is not held in the Python heap for the whole cascade.
+
         ┌─────────────────────────────────────────────────────────────────┐
-        │  1. PyMuPDF   ──► avg_chars ≥ threshold?                        │
+        │  1. PyMuPDF   ──► password-protected? → done (empty, no OCR)    │
+        │               ──► avg_chars ≥ threshold?                        │
         │                         YES → done ✓                            │
         │                         NO  → document is scanned               │
         │                               │                                 │
@@ -115,10 +149,35 @@ class TextExtractorOrchestrator:
         │     (empty text is better than crashing the worker)             │
         └─────────────────────────────────────────────────────────────────┘
         """
-        t0 = time.monotonic()
-
-        # ── Step 1: Try PyMuPDF ──────────────────────────────────────────
-        pymupdf_result = await self._pymupdf.extract(pdf_bytes)
+        t0   = time.monotonic()
+        loop = asyncio.get_running_loop()
+        ocr_task: asyncio.Future | None = None
+
+        # One digest per document keys every strategy's cache entry
+        digest = await self._cache.digest(pdf_source) if self._cache is not None else None
+
+        def _start_ocr(page_count: int) -> None:
+            nonlocal ocr_task
+            ocr_task = asyncio.ensure_future(self._cached_ocr(pdf_source, page_count, digest))
+
+        def _on_sample(page_count: int, sample_pages: int, sample_chars: int) -> None:
+            # Called from the PyMuPDF executor thread — hop back onto the loop.
+            # Only the same threshold as the final decision triggers OCR, so a
+            # cancelled speculative run is the exception, not the rule.
+            if sample_chars / sample_pages < MIN_CHARS_PER_PAGE_THRESHOLD:
+                loop.call_soon_threadsafe(_start_ocr, page_count)
+
+        # ── Step 1: Try PyMuPDF (OCR may start after the first pages) ───
+        pymupdf_result = await self._cache_get(self._pymupdf.strategy_name, digest)
+        if pymupdf_result is None:
+            try:
+                pymupdf_result = await self._pymupdf.extract(pdf_source, on_sample=_on_sample)
+            except BaseException:
+                if ocr_task is not None:
+                    ocr_task.cancel()
+                raise
+            if digest is not None and pymupdf_result.pages:
+                await self._cache.put(self._pymupdf.strategy_name, digest, pymupdf_result)
 
         logger.info(
             "Extraction | strategy=pymupdf pages=%d total_chars=%d "
@@ -129,8 +188,20 @@ class TextExtractorOrchestrator:
             pymupdf_result.is_likely_scanned(),
         )
 
+        if pymupdf_result.encrypted:
+            # Textract and Unstructured reject password-protected PDFs too —
+            # don't pay for an OCR call that can only fail
+            logger.warning(
+                "PDF is password-protected — skipping OCR for s3://%s/%s",
+                self._s3_bucket, self._s3_key,
+            )
+            return self._build_result(pymupdf_result, time.monotonic() - t0)
+
         if not pymupdf_result.is_likely_scanned():
-            # Native text layer — no OCR needed
+            # Native text layer — no OCR needed; drop any speculative run
+            if ocr_task is not None:
+                logger.info("Cancelling speculative OCR — text layer found past the sample")
+                ocr_task.cancel()
             return self._build_result(pymupdf_result, time.monotonic() - t0)
 
         # ── Step 2: OCR cascade ──────────────────────────────────────────
@@ -141,7 +212,11 @@ class TextExtractorOrchestrator:
             _OCR_BACKEND,
         )
 
-        ocr_result = await self._run_ocr(pdf_bytes, pymupdf_result)
+        if ocr_task is None:
+            ocr_task = asyncio.ensure_future(
+                self._cached_ocr(pdf_source, len(pymupdf_result.pages), digest)
+            )
+        ocr_result = await ocr_task
 
         if ocr_result and ocr_result.total_chars > 0:
             return self._build_result(ocr_result, time.monotonic() - t0)
@@ -153,15 +228,40 @@ class TextExtractorOrchestrator:
         )
         return self._build_result(pymupdf_result, time.monotonic() - t0)
 
+    async def _cache_get(
+        self,
+        strategy: str,
+        digest:   str | None,
+    ) -> ExtractionStrategyResult | None:
+        if digest is None:
+            return None
+        result = await self._cache.get(strategy, digest)
+        if result is not None:
+            logger.info("Extraction cache hit | strategy=%s digest=%s", strategy, digest[:16])
+        return result
+
+    async def _cached_ocr(
+        self,
+        pdf_source: PdfSource,
+        page_count: int,
+        digest:     str | None,
+    ) -> ExtractionStrategyResult | None:
+        """_run_ocr() behind the cache; only non-empty results are stored."""
+        result = await self._cache_get(_OCR_BACKEND, digest)
+        if result is None:
+            result = await self._run_ocr(pdf_source, page_count)
+            if digest is not None and result and result.total_chars > 0:
+                await self._cache.put(_OCR_BACKEND, digest, result)
+        return result
+
     async def _run_ocr(
         self,
-        pdf_bytes:     bytes,
-        pymupdf_result: ExtractionStrategyResult,
+        pdf_source: PdfSource,
+        page_count: int,
     ) -> ExtractionStrategyResult | None:
         """Select and run the configured OCR backend."""
         if _OCR_BACKEND == "textract":
             extractor = TextractExtractor()
-            page_count = len(pymupdf_result.pages)
 
             if page_count > _TEXTRACT_ASYNC_PAGE_THRESHOLD and self._s3_key:
                 # Use async Textract job (document already on S3)
@@ -176,31 +276,49 @@ class TextExtractorOrchestrator:
                     return None
             else:
                 # Sync Textract (≤3 pages or no S3 key)
-                return await extractor.extract(pdf_bytes)
+                return await extractor.extract(pdf_source)
         else:
             # Default: Unstructured.io (local or API)
             use_api = os.getenv("UNSTRUCTURED_USE_API", "false").lower() == "true"
             api_key = os.getenv("UNSTRUCTURED_API_KEY", "")
-            extractor = UnstructuredExtractor(use_api=use_api, api_key=api_key)
-            return await extractor.extract(pdf_bytes)
+            extractor = UnstructuredExtractor(
+                use_api=use_api,
+                api_key=api_key,
+                strategy=_UNSTRUCTURED_FALLBACK_STRATEGY,
+            )
+            return await extractor.extract(pdf_source)
 
     def _build_result(
         self,
         strategy_result: ExtractionStrategyResult,
         elapsed_sec:     float,
     ) -> ExtractionResult:
-        """Convert a strategy result into the unified ExtractionResult."""
-        pages_tuples = [
-            (p.page_number, p.text)
-            for p in strategy_result.pages
-        ]
-        page_map = build_page_map(pages_tuples)
-        full_text = "\n\n".join(p.text for p in strategy_result.pages if p.text.strip())
-
-        # Compute average confidence (skip pages with no confidence)
-        conf_values = [
-            p.confidence for p in strategy_result.pages if p.confidence >= 0
-        ]
+        """
+        Convert a strategy result into the unified ExtractionResult.
+
+        One pass over the pages builds the page list, the page map, the
+        joined text and the confidence values together. The page map is
+        built from the same non-blank pages that are joined into
+        full_text, so its offsets line up with the text the chunker sees.
+        """
+        pages_tuples: list[tuple[int, str]] = []
+        page_texts:   list[str]             = []
+        page_map:     dict[int, int]        = {}
+        conf_values:  list[float]           = []   # skip pages with no confidence
+        offset = 0
+
+        for p in strategy_result.pages:
+            pages_tuples.append((p.page_number, p.text))
+            if p.text and not p.text.isspace():   # no stripped copy of the page
+                page_map[offset] = p.page_number
+                offset += len(p.text) + 2   # +2 for the "\n\n" separator
+                page_texts.append(p.text)
+            if p.confidence >= 0:
+                conf_values.append(p.confidence)
+
+        full_text = "\n\n".join(page_texts)
+
+        # Compute average confidence
         avg_conf = sum(conf_values) / len(conf_values) if conf_values else -1.0
 
         return ExtractionResult(
@@ -214,3 +332,45 @@ class TextExtractorOrchestrator:
             page_count=len(strategy_result.pages),
             avg_confidence=round(avg_conf, 3),
         )
+
+
+# ---------------------------------------------------------------------------
+# Worker warm-up
+# ---------------------------------------------------------------------------
+
+def preload_extractors() -> None:
+    """
+    Import the extraction libraries ahead of the first document (blocking).
+
+    fitz takes ~0.2 s to import and unstructured's partition_pdf several
+    seconds. The Celery worker calls this in the parent process before it
+    forks, so every child shares the modules copy-on-write instead of paying
+    the import on its first task (and again after each recycle).
+    """
+    modules = ["fitz"]
+    if _OCR_BACKEND == "textract":
+        modules += ["boto3", "botocore.config"]
+    else:
+        modules += ["unstructured.partition.pdf"]
+
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except Exception as exc:
+            logger.warning("Preloading %s failed (imported on first use instead): %s", name, exc)
+
+
+def warm_up_extractors() -> None:
+    """
+    Create per-process extraction resources ahead of the first document.
+
+    The shared Textract client resolves credentials and sets up its
+    connection pool; neither survives a fork, so the worker calls this in
+    each child process.
+    """
+    if _OCR_BACKEND != "textract":
+        return
+    try:
+        TextractExtractor()._get_client()
+    except Exception as exc:
+        logger.warning("Textract client warm-up failed (created on first use instead): %s", exc)
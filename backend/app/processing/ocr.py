@@ -39,11 +39,23 @@ callers never need to know which backend was used.
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import functools
 import logging
+import multiprocessing
+import os
+import random
+import threading
 import time
+import weakref
 from abc import ABC, abstractmethod
+from collections import defaultdict
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import IO
+from statistics import fmean
+from typing import IO, Callable, Optional, Union
+
+from app.observability.metrics import get_meter
 
 logger = logging.getLogger(__name__)
 
@@ -58,15 +70,114 @@ MIN_CHARS_PER_PAGE_THRESHOLD = 50
 # AWS Textract: max pages per synchronous API call
 TEXTRACT_SYNC_MAX_PAGES = 3
 
+# AWS Textract: pooled connections on the shared per-region client
+TEXTRACT_MAX_CONCURRENT_CALLS = 16
+
+# AWS Textract throttling: calls per second per region (per worker process),
+# and retries of a throttled call with back-off 2s → 4s → 8s (+ jitter, max 30s)
+TEXTRACT_MAX_RPS     = 10
+TEXTRACT_MAX_RETRIES = 3
+_THROTTLE_CODES = frozenset({
+    "ThrottlingException",
+    "ProvisionedThroughputExceededException",
+    "LimitExceededException",
+})
+
 # OCR timeout (seconds) — prevents worker stalls on pathological documents
 OCR_TIMEOUT_SECONDS = 120
 
+# In-memory PDFs above this size are logged: large documents should be passed
+# as a file path (the worker spools S3 downloads to disk) to stay off the heap
+LARGE_IN_MEMORY_PDF_BYTES = 50 * 1024 * 1024
+
+# PyMuPDF reports early stats after this fraction of pages (at least one),
+# so the orchestrator can start OCR speculatively on documents that already
+# look scanned. See PyMuPDFExtractor.extract(on_sample=...).
+SCAN_SAMPLE_FRACTION = 0.1
+
+# on_sample(page_count, sample_pages, sample_chars) — called once, from the
+# executor thread, when the first sample of pages has been read
+SampleCallback = Callable[[int, int, int], None]
+
+# PyMuPDF page extraction is CPU-bound and holds the GIL, so long documents
+# are split into page ranges across a process pool. Below PARALLEL_MIN_PAGES
+# the child IPC costs more than it saves; gains flatten beyond ~4 workers.
+PARALLEL_MIN_PAGES = 32
+PDF_WORKERS        = min(os.cpu_count() or 1, 4)
+
+# Blocking extractor work runs on dedicated thread pools rather than the
+# loop's default executor, so a burst of OCR cannot starve the app's other
+# to_thread() users (cache digests, tokenisation) and vice versa:
+#   CPU pool — PyMuPDF / Unstructured, one thread per core
+#   AWS pool — blocking boto3 Textract calls (network-bound)
+# At most OCR_MAX_CONCURRENT whole-document extractions are admitted per
+# event loop; the rest wait their turn before their timeout starts.
+OCR_CPU_WORKERS    = os.cpu_count() or 4
+AWS_IO_WORKERS     = 32
+OCR_MAX_CONCURRENT = 16
+
+# A PDF as raw bytes or as a path to a local file. Extractors open paths
+# directly (PyMuPDF memory-maps them), so a document spooled to disk by the
+# worker never has to be held in the Python heap.
+PdfSource = Union[bytes, str, os.PathLike]
+
+
+def _open_pdf(pdf_source: PdfSource):
+    """Open a PDF with PyMuPDF from bytes or a path (memory-mapped)."""
+    import fitz  # PyMuPDF; imported here to avoid module-level import cost
+
+    if isinstance(pdf_source, (bytes, bytearray)):
+        return fitz.open(stream=pdf_source, filetype="pdf")
+    return fitz.open(os.fspath(pdf_source), filetype="pdf")
+
+
+def _read_pdf_bytes(pdf_source: PdfSource) -> bytes:
+    """Return the PDF as bytes, reading it from disk if given a path."""
+    if isinstance(pdf_source, (bytes, bytearray)):
+        return pdf_source
+    with open(pdf_source, "rb") as f:
+        return f.read()
+
+
+# ---------------------------------------------------------------------------
+# Executors
+# ---------------------------------------------------------------------------
+
+# Threads are only started on first submit — nothing runs in the Celery
+# parent before it forks
+_OCR_CPU_POOL = ThreadPoolExecutor(max_workers=OCR_CPU_WORKERS, thread_name_prefix="ocr-cpu")
+_AWS_IO_POOL  = ThreadPoolExecutor(max_workers=AWS_IO_WORKERS, thread_name_prefix="aws-io")
+
+_OCR_SLOTS: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _ocr_slot() -> asyncio.Semaphore:
+    """
+    Semaphore admitting OCR_MAX_CONCURRENT extractions on the running loop.
+    Semaphores are bound to one loop, so there is one per loop (the Celery
+    worker runs each task on a fresh loop).
+    """
+    loop = asyncio.get_running_loop()
+    slot = _OCR_SLOTS.get(loop)
+    if slot is None:
+        slot = _OCR_SLOTS[loop] = asyncio.Semaphore(OCR_MAX_CONCURRENT)
+    return slot
+
+
+def _run_in(pool: ThreadPoolExecutor, fn, *args, **kwargs) -> asyncio.Future:
+    """Run a blocking call on one of the extractor pools from the running loop."""
+    return asyncio.get_running_loop().run_in_executor(pool, functools.partial(fn, *args, **kwargs))
+
 
 # ---------------------------------------------------------------------------
 # Shared data types
 # ---------------------------------------------------------------------------
+# slots=True: one PageText per page of every queued document, so no
+# per-instance __dict__ (~30% smaller objects, faster attribute access).
 
-@dataclass
+@dataclass(slots=True)
 class PageText:
     """
     Text extracted from a single page.
@@ -82,7 +193,7 @@ class PageText:
     extraction_method: str  = "unknown"
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtractionStrategyResult:
     """
     Full result from a single strategy run.
@@ -92,12 +203,14 @@ class ExtractionStrategyResult:
     strategy_name : which strategy produced this result
     elapsed_ms    : wall-clock time for the strategy (ms)
     used_ocr      : True if image-based OCR was invoked
+    encrypted     : True if the PDF needs a password — no strategy can read it
     """
     pages:         list[PageText]
     total_chars:   int
     strategy_name: str
     elapsed_ms:    float
     used_ocr:      bool = False
+    encrypted:     bool = False
 
     @property
     def full_text(self) -> str:
@@ -115,6 +228,32 @@ class ExtractionStrategyResult:
         return self.avg_chars_per_page < MIN_CHARS_PER_PAGE_THRESHOLD
 
 
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+_meter             = get_meter(__name__)
+_pages_counter     = _meter.create_counter(
+    "ocr_pages_total", unit="{page}", description="Pages returned per extraction strategy",
+)
+_elapsed_histogram = _meter.create_histogram(
+    "ocr_elapsed_ms", unit="ms", description="Wall-clock time per extraction strategy run",
+)
+
+
+def _record_extraction(result: ExtractionStrategyResult) -> None:
+    """Count a strategy run's pages and time; the orchestrator logs the outcome."""
+    _pages_counter.add(
+        len(result.pages),
+        {"method": result.strategy_name, "scanned": result.is_likely_scanned()},
+    )
+    _elapsed_histogram.record(result.elapsed_ms, {"method": result.strategy_name})
+    logger.debug(
+        "%s | pages=%d total_chars=%d elapsed_ms=%.0f",
+        result.strategy_name, len(result.pages), result.total_chars, result.elapsed_ms,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Abstract strategy
 # ---------------------------------------------------------------------------
@@ -124,7 +263,8 @@ class BaseTextExtractor(ABC):
     Abstract base for text extraction strategies.
 
     All implementations:
-      - Accept raw PDF bytes (never a file path — keeps workers stateless)
+      - Accept a PdfSource: raw PDF bytes or a path to a local file (the
+        worker passes a spooled temp file, so large PDFs stay off the heap)
       - Return ExtractionStrategyResult
       - Handle their own errors internally (log + return partial results)
       - Are safe for concurrent use (no shared mutable state)
@@ -136,9 +276,9 @@ class BaseTextExtractor(ABC):
         """Unique name for logging and metrics."""
 
     @abstractmethod
-    async def extract(self, pdf_bytes: bytes) -> ExtractionStrategyResult:
+    async def extract(self, pdf_source: PdfSource) -> ExtractionStrategyResult:
         """
-        Extract text from a PDF document provided as raw bytes.
+        Extract text from a PDF document provided as raw bytes or a file path.
 
         Must NOT raise exceptions — return partial/empty result on failure
         so the caller can fall through to the next strategy.
@@ -161,22 +301,39 @@ class PyMuPDFExtractor(BaseTextExtractor):
     Limitations:
       - Cannot OCR image-only pages (returns empty string for those)
       - Struggles with multi-column layouts (text order may be wrong)
-      - Encrypted PDFs return empty (password-protection)
+      - Encrypted PDFs return empty (password-protection), flagged encrypted
 
     Thread-safety: fitz.open() returns an independent document object
     per call — safe for concurrent use.
+
+    Documents of PARALLEL_MIN_PAGES pages or more are extracted in
+    num_workers page ranges on a shared process pool (see _extract_sync).
     """
 
+    def __init__(self, num_workers: int = PDF_WORKERS) -> None:
+        self._num_workers = max(1, num_workers)
+
     @property
     def strategy_name(self) -> str:
         return "pymupdf"
 
-    async def extract(self, pdf_bytes: bytes) -> ExtractionStrategyResult:
-        loop = asyncio.get_event_loop()
+    async def extract(
+        self,
+        pdf_source: PdfSource,
+        on_sample:  Optional[SampleCallback] = None,
+    ) -> ExtractionStrategyResult:
+        """
+        Read the native text layer of every page.
+
+        If on_sample is given it is called once, from the executor thread,
+        after the first SCAN_SAMPLE_FRACTION of pages — early enough for the
+        caller to start OCR while the rest of the document is still read.
+        """
         t0 = time.monotonic()
 
         try:
-            result = await loop.run_in_executor(None, self._extract_sync, pdf_bytes)
+            async with _ocr_slot():
+                result = await _run_in(_OCR_CPU_POOL, self._extract_sync, pdf_source, on_sample)
         except Exception as exc:
             logger.warning("PyMuPDF extraction failed: %s", exc)
             result = ExtractionStrategyResult(
@@ -186,39 +343,166 @@ class PyMuPDFExtractor(BaseTextExtractor):
             )
 
         result.elapsed_ms = (time.monotonic() - t0) * 1000
-        logger.info(
-            "PyMuPDF | pages=%d total_chars=%d avg_chars_per_page=%.0f elapsed_ms=%.0f",
-            len(result.pages), result.total_chars,
-            result.avg_chars_per_page, result.elapsed_ms,
-        )
+        _record_extraction(result)
         return result
 
-    def _extract_sync(self, pdf_bytes: bytes) -> ExtractionStrategyResult:
-        """Blocking extraction — runs in thread executor."""
-        import fitz  # PyMuPDF; imported here to avoid module-level import cost
-
-        pages: list[PageText] = []
-
-        with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
-            for page_num, page in enumerate(doc, start=1):
-                # get_text("text") returns plain text preserving reading order.
-                # "blocks" mode returns [(x0,y0,x1,y1,text,block_no,block_type)]
-                # — use "text" for simplicity, "blocks" for heading detection.
-                raw = page.get_text("text") or ""
-                pages.append(PageText(
-                    page_number=page_num,
-                    text=raw.strip(),
-                    confidence=-1.0,
-                    extraction_method=self.strategy_name,
-                ))
+    def _extract_sync(
+        self,
+        pdf_source: PdfSource,
+        on_sample:  Optional[SampleCallback] = None,
+    ) -> ExtractionStrategyResult:
+        """
+        Blocking extraction — runs on _OCR_CPU_POOL.
+
+        The scan sample is read in-process first (so on_sample fires as
+        early as before); the remaining pages of long documents are then
+        split across the process pool, falling back to this thread if the
+        pool is unavailable.
+        """
+        with _open_pdf(pdf_source) as doc:
+            if doc.needs_pass:
+                # Every page access would raise; no OCR backend can decrypt it either
+                logger.info("PDF is password-protected — skipping PyMuPDF")
+                return ExtractionStrategyResult(
+                    pages=[], total_chars=0,
+                    strategy_name=self.strategy_name,
+                    elapsed_ms=0.0, used_ocr=False, encrypted=True,
+                )
+
+            page_count = doc.page_count
+            sample_at  = min(max(1, int(page_count * SCAN_SAMPLE_FRACTION)), page_count)
+            texts      = _page_texts(doc, 0, sample_at)
+            if on_sample is not None and page_count:
+                on_sample(page_count, sample_at, sum(map(len, texts)))
+
+            rest = None
+            if self._num_workers > 1 and page_count >= PARALLEL_MIN_PAGES:
+                rest = self._extract_parallel(pdf_source, sample_at, page_count)
+            if rest is None:
+                rest = _page_texts(doc, sample_at, page_count)
+            texts.extend(rest)
 
-        total = sum(len(p.text) for p in pages)
+        pages = [
+            PageText(
+                page_number=page_num,
+                text=text,
+                confidence=-1.0,
+                extraction_method=self.strategy_name,
+            )
+            for page_num, text in enumerate(texts, start=1)
+        ]
+        total = sum(map(len, texts))
         return ExtractionStrategyResult(
             pages=pages, total_chars=total,
             strategy_name=self.strategy_name,
             elapsed_ms=0.0, used_ocr=False,
         )
 
+    def _extract_parallel(
+        self,
+        pdf_source: PdfSource,
+        start:      int,
+        stop:       int,
+    ) -> list[str] | None:
+        """
+        Page texts for [start, stop) from num_workers contiguous page ranges
+        in the process pool, in page order. Each child re-opens the document
+        (PyMuPDF documents cannot be shared across processes) — by path when
+        possible, so only the path is pickled.
+
+        Returns None if the pool cannot be used; the caller then extracts
+        in-process.
+        """
+        pool = _get_pdf_pool()
+        if pool is None:
+            return None
+        if not isinstance(pdf_source, (bytes, bytearray)):
+            pdf_source = os.fspath(pdf_source)
+
+        step = -(-(stop - start) // self._num_workers)
+        try:
+            futures = [
+                pool.submit(_extract_page_range, pdf_source, lo, min(lo + step, stop))
+                for lo in range(start, stop, step)
+            ]
+        except (BrokenExecutor, AssertionError, OSError) as exc:
+            # Children could not be started at all
+            _disable_pdf_pool(exc)
+            return None
+
+        try:
+            # Errors raised by PyMuPDF in a child propagate like in-process ones
+            return [text for f in futures for text in f.result()]
+        except BrokenExecutor as exc:
+            # A child died — the pool is unusable from here on
+            _disable_pdf_pool(exc)
+            return None
+        except OSError as exc:
+            # File-level error in a child (e.g. the spooled file vanished):
+            # this document is extracted in-process, the pool stays in use
+            logger.info("PyMuPDF pool could not read this PDF (%s) — extracting in-process", exc)
+            return None
+
+
+def _page_texts(doc, start: int, stop: int) -> list[str]:
+    """Stripped plain text of pages [start, stop) of an open document."""
+    import fitz
+
+    # get_text("text") returns plain text preserving reading order.
+    # "blocks" mode returns [(x0,y0,x1,y1,text,block_no,block_type)]
+    # — use "text" for simplicity, "blocks" for heading detection.
+    # Default flags minus PRESERVE_LIGATURES: "ﬁ"/"ﬂ" are expanded to "fi"/"fl"
+    # so BM25 and embeddings see the word a user types. No sort=True —
+    # re-sorting blocks by position costs ~20× the extraction itself.
+    flags = fitz.TEXTFLAGS_TEXT & ~fitz.TEXT_PRESERVE_LIGATURES
+    return [
+        (doc.load_page(i).get_text("text", flags=flags) or "").strip()
+        for i in range(start, stop)
+    ]
+
+
+def _extract_page_range(pdf_source: bytes | str, start: int, stop: int) -> list[str]:
+    """Process-pool entry point: page texts for [start, stop)."""
+    with _open_pdf(pdf_source) as doc:
+        return _page_texts(doc, start, stop)
+
+
+# One pool per worker process, started on first use. "spawn" because the
+# parent is multi-threaded (event loop + executor), where fork is unsafe.
+# Never started in daemonic processes (Celery's prefork children), which
+# cannot have children — there the pages are extracted in-process; the pool
+# serves the solo/threads worker pools and non-Celery callers.
+_pdf_pool:          ProcessPoolExecutor | None = None
+_pdf_pool_disabled: bool                       = False
+_pdf_pool_lock = threading.Lock()
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor | None:
+    global _pdf_pool, _pdf_pool_disabled
+    with _pdf_pool_lock:
+        if _pdf_pool is None and not _pdf_pool_disabled:
+            if multiprocessing.current_process().daemon:
+                # Celery prefork children are daemonic and may not start
+                # processes of their own: extract in-process, no warning
+                _pdf_pool_disabled = True
+                logger.debug("Daemonic worker process — PyMuPDF process pool not used")
+                return None
+            _pdf_pool = ProcessPoolExecutor(
+                max_workers=PDF_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pdf_pool
+
+
+def _disable_pdf_pool(exc: BaseException) -> None:
+    """Stop using the process pool for the rest of this process."""
+    global _pdf_pool, _pdf_pool_disabled
+    logger.warning("PyMuPDF process pool unavailable (%s) — extracting in-process", exc)
+    with _pdf_pool_lock:
+        pool, _pdf_pool, _pdf_pool_disabled = _pdf_pool, None, True
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
 
 # ---------------------------------------------------------------------------
 # Strategy 2: Unstructured.io
@@ -242,28 +526,41 @@ class UnstructuredExtractor(BaseTextExtractor):
 
     We default to local mode; set UNSTRUCTURED_USE_API=true for cloud.
 
+    partition strategy:
+      "hi_res"   — layout detection models + table structure; re-parses the
+                   PDF text layer with pdfminer before OCR.
+      "ocr_only" — tesseract on every page. The orchestrator uses this: it
+                   only calls Unstructured once PyMuPDF has already found no
+                   usable text layer, so re-reading it is wasted work.
+
     Enterprise trade-off:
       Local mode = GDPR-friendly, zero egress, but high memory (2–4 GB).
       API mode   = low memory, faster, but data leaves the cluster.
     """
 
-    def __init__(self, use_api: bool = False, api_key: str = "") -> None:
-        self._use_api = use_api
-        self._api_key = api_key
+    def __init__(
+        self,
+        use_api:  bool = False,
+        api_key:  str  = "",
+        strategy: str  = "hi_res",
+    ) -> None:
+        self._use_api  = use_api
+        self._api_key  = api_key
+        self._strategy = strategy
 
     @property
     def strategy_name(self) -> str:
         return "unstructured"
 
-    async def extract(self, pdf_bytes: bytes) -> ExtractionStrategyResult:
-        loop = asyncio.get_event_loop()
-        t0   = time.monotonic()
+    async def extract(self, pdf_source: PdfSource) -> ExtractionStrategyResult:
+        t0 = time.monotonic()
 
         try:
-            result = await asyncio.wait_for(
-                loop.run_in_executor(None, self._extract_sync, pdf_bytes),
-                timeout=OCR_TIMEOUT_SECONDS,
-            )
+            async with _ocr_slot():
+                result = await asyncio.wait_for(
+                    _run_in(_OCR_CPU_POOL, self._extract_sync, pdf_source),
+                    timeout=OCR_TIMEOUT_SECONDS,
+                )
         except asyncio.TimeoutError:
             logger.error("Unstructured OCR timed out after %ds", OCR_TIMEOUT_SECONDS)
             result = ExtractionStrategyResult(
@@ -280,42 +577,57 @@ class UnstructuredExtractor(BaseTextExtractor):
             )
 
         result.elapsed_ms = (time.monotonic() - t0) * 1000
-        logger.info(
-            "Unstructured | pages=%d total_chars=%d elapsed_ms=%.0f",
-            len(result.pages), result.total_chars, result.elapsed_ms,
-        )
+        _record_extraction(result)
         return result
 
-    def _extract_sync(self, pdf_bytes: bytes) -> ExtractionStrategyResult:
-        """Blocking OCR extraction — runs in thread executor."""
+    def _extract_sync(self, pdf_source: PdfSource) -> ExtractionStrategyResult:
+        """Blocking OCR extraction — runs on _OCR_CPU_POOL."""
         import io
         from unstructured.partition.pdf import partition_pdf
 
-        # unstructured expects a file-like object
-        pdf_file = io.BytesIO(pdf_bytes)
+        # unstructured takes a filename or a file-like object. BytesIO over
+        # immutable bytes shares their buffer (copy-on-write), so wrapping is
+        # free — but the whole document still sits in the heap; the worker
+        # passes a spooled file path instead.
+        if isinstance(pdf_source, (bytes, bytearray)):
+            if len(pdf_source) > LARGE_IN_MEMORY_PDF_BYTES:
+                logger.warning(
+                    "Unstructured given a %d MB PDF in memory — pass a file path instead",
+                    len(pdf_source) // (1024 * 1024),
+                )
+            source        = io.BytesIO(pdf_source)
+            source_kwargs = {"file": source}
+        else:
+            source        = contextlib.nullcontext()
+            source_kwargs = {"filename": os.fspath(pdf_source)}
 
         # strategy="hi_res" uses layout detection ML models.
         # strategy="fast"   uses pdfminer (fast, no ML, similar to PyMuPDF).
         # strategy="ocr_only" forces pytesseract on every page.
-        elements = partition_pdf(
-            file=pdf_file,
-            strategy="hi_res",               # full ML pipeline for scanned docs
-            include_page_breaks=True,        # inject PageBreak elements
-            infer_table_structure=True,      # extract table HTML
-            extract_images_in_pdf=False,     # skip inline image extraction
-        )
+        with source:
+            elements = partition_pdf(
+                **source_kwargs,
+                strategy=self._strategy,
+                include_page_breaks=True,        # inject PageBreak elements
+                infer_table_structure=True,      # extract table HTML (hi_res only)
+                extract_images_in_pdf=False,     # skip inline image extraction
+            )
 
-        # Group elements by page number
-        pages_dict: dict[int, list[str]] = {}
+        # Group element text by page number in one pass. Element text is kept
+        # by reference (str()/strip() don't copy), so the element list — with
+        # its per-element metadata, coordinates and table HTML — is the bulk
+        # of the footprint; drop it before joining the page strings.
+        pages_dict: defaultdict[int, list[str]] = defaultdict(list)
         for elem in elements:
-            page_num = elem.metadata.page_number if elem.metadata else 1
-            page_num = page_num or 1
-            pages_dict.setdefault(page_num, [])
+            page_num = (elem.metadata.page_number if elem.metadata else 1) or 1
+            texts    = pages_dict[page_num]     # pages with no text are still reported
 
-            # Tables are returned as HTML; convert to pipe-delimited text
+            # Tables are kept as their HTML rendering when available
             text = str(elem) if elem.category != "Table" else elem.metadata.text_as_html or str(elem)
-            if text.strip():
-                pages_dict[page_num].append(text.strip())
+            text = text.strip()
+            if text:
+                texts.append(text)
+        del elements
 
         pages = [
             PageText(
@@ -366,6 +678,14 @@ class TextractExtractor(BaseTextExtractor):
       s3:GetObject   (if passing S3Document instead of raw bytes)
     """
 
+    # One client and one rate limiter per region, shared by every extractor
+    # in the process: a new client re-resolves credentials and opens a fresh
+    # TLS connection, so reusing it keeps its connection pool warm
+    _clients: dict[str, object] = {}
+    _clients_lock = threading.Lock()
+    _limiters: dict[str, "_RateLimiter"] = {}
+    _limiters_lock = threading.Lock()
+
     def __init__(self, region: str = "us-east-1") -> None:
         self._region = region
 
@@ -373,15 +693,64 @@ class TextractExtractor(BaseTextExtractor):
     def strategy_name(self) -> str:
         return "textract"
 
-    async def extract(self, pdf_bytes: bytes) -> ExtractionStrategyResult:
-        loop = asyncio.get_event_loop()
-        t0   = time.monotonic()
+    def _get_client(self):
+        """The region's shared Textract client (thread-safe), created on first use."""
+        with self._clients_lock:
+            client = self._clients.get(self._region)
+            if client is None:
+                import boto3
+                from botocore.config import Config
+
+                client = self._clients[self._region] = boto3.client(
+                    "textract",
+                    region_name=self._region,
+                    config=Config(
+                        # Shared by every document this process extracts at once
+                        max_pool_connections=TEXTRACT_MAX_CONCURRENT_CALLS,
+                        tcp_keepalive=True,
+                        # Throttling retries are _call()'s job — botocore
+                        # retrying too would multiply the attempts
+                        retries={"mode": "standard", "max_attempts": 1},
+                    ),
+                )
+        return client
+
+    def _call(self, fn, **kwargs):
+        """
+        Call a Textract client method (blocking — always from a worker
+        thread) under the region's rate limit, retrying throttling errors
+        with exponential back-off instead of failing over to another
+        strategy. Any other error is raised immediately.
+        """
+        with self._limiters_lock:
+            limiter = self._limiters.get(self._region)
+            if limiter is None:
+                limiter = self._limiters[self._region] = _RateLimiter(TEXTRACT_MAX_RPS)
+
+        for attempt in range(TEXTRACT_MAX_RETRIES + 1):
+            limiter.wait()
+            try:
+                return fn(**kwargs)
+            except Exception as exc:
+                code = _error_code(exc)
+                if code not in _THROTTLE_CODES or attempt == TEXTRACT_MAX_RETRIES:
+                    raise
+                delay = min(2 ** (attempt + 1), 30) + random.uniform(0, 1)
+                logger.warning(
+                    "Textract throttled | call=%s attempt=%d delay=%.1fs code=%s",
+                    getattr(fn, "__name__", fn), attempt + 1, delay, code,
+                )
+                time.sleep(delay)
+
+    async def extract(self, pdf_source: PdfSource) -> ExtractionStrategyResult:
+        t0 = time.monotonic()
 
         try:
-            result = await asyncio.wait_for(
-                loop.run_in_executor(None, self._extract_sync, pdf_bytes),
-                timeout=OCR_TIMEOUT_SECONDS,
-            )
+            async with _ocr_slot():
+                result = await asyncio.wait_for(
+                    _run_in(_AWS_IO_POOL, self._extract_sync, pdf_source),
+                    timeout=OCR_TIMEOUT_SECONDS,
+                )
         except asyncio.TimeoutError:
             logger.error("Textract OCR timed out after %ds", OCR_TIMEOUT_SECONDS)
             result = ExtractionStrategyResult(
@@ -398,55 +767,45 @@ class TextractExtractor(BaseTextExtractor):
             )
 
         result.elapsed_ms = (time.monotonic() - t0) * 1000
-        logger.info(
-            "Textract | pages=%d total_chars=%d elapsed_ms=%.0f",
-            len(result.pages), result.total_chars, result.elapsed_ms,
-        )
+        _record_extraction(result)
         return result
 
-    def _extract_sync(self, pdf_bytes: bytes) -> ExtractionStrategyResult:
+    def _extract_sync(self, pdf_source: PdfSource) -> ExtractionStrategyResult:
         """
         Calls Textract DetectDocumentText (synchronous API, ≤3 page PDFs).
         For larger documents, the orchestrator should upload to S3 first and
         call StartDocumentTextDetection with an S3Object reference.
         """
-        import boto3
-
-        client = boto3.client("textract", region_name=self._region)
+        client = self._get_client()
 
-        response = client.detect_document_text(
-            Document={"Bytes": pdf_bytes}
+        # The sync API only accepts inline bytes (≤ 5 MB) — read a path here
+        response = self._call(
+            client.detect_document_text,
+            Document={"Bytes": _read_pdf_bytes(pdf_source)},
         )
 
-        # Group LINE blocks by Page
-        pages_dict: dict[int, list[str]] = {}
-        word_confidences: dict[int, list[float]] = {}
+        # Group LINE text and LINE/WORD confidences by page in one pass
+        lines:       defaultdict[int, list[str]]   = defaultdict(list)
+        confidences: defaultdict[int, list[float]] = defaultdict(list)
 
         for block in response.get("Blocks", []):
-            if block["BlockType"] not in ("LINE", "WORD"):
-                continue
-
-            page_num = block.get("Page", 1)
-            confidence = block.get("Confidence", 0.0) / 100.0   # normalize to 0–1
-
-            if block["BlockType"] == "LINE":
-                pages_dict.setdefault(page_num, []).append(block.get("Text", ""))
-
-            word_confidences.setdefault(page_num, []).append(confidence)
-
-        pages = []
-        for pn in sorted(pages_dict):
-            text = "\n".join(pages_dict[pn])
-            avg_conf = (
-                sum(word_confidences[pn]) / len(word_confidences[pn])
-                if word_confidences.get(pn) else 0.0
-            )
-            pages.append(PageText(
+            block_type = block["BlockType"]
+            if block_type == "WORD" or block_type == "LINE":
+                page_num = block.get("Page", 1)
+                confidences[page_num].append(block.get("Confidence", 0.0))
+                if block_type == "LINE":
+                    lines[page_num].append(block.get("Text", ""))
+
+        # Every page with a LINE has at least that LINE's confidence
+        pages = [
+            PageText(
                 page_number=pn,
-                text=text,
-                confidence=round(avg_conf, 3),
+                text="\n".join(texts),
+                confidence=round(fmean(confidences[pn]) / 100.0, 3),   # normalize to 0–1
                 extraction_method=self.strategy_name,
-            ))
+            )
+            for pn, texts in sorted(lines.items())
+        ]
 
         total = sum(len(p.text) for p in pages)
         return ExtractionStrategyResult(
@@ -466,52 +825,54 @@ class TextractExtractor(BaseTextExtractor):
         then polls for completion with exponential back-off.
 
         Max poll wait: ~5 minutes (matches Celery soft_time_limit).
+        Raises if the job fails or times out.
         """
-        import boto3, time as _time
-
-        client = boto3.client("textract", region_name=self._region)
-
-        # Start async job
-        job = client.start_document_text_detection(
-            DocumentLocation={
-                "S3Object": {"Bucket": s3_bucket, "Name": s3_key}
-            }
+        client = self._get_client()
+        job = await _run_in(
+            _AWS_IO_POOL, self._call, client.start_document_text_detection,
+            DocumentLocation={"S3Object": {"Bucket": s3_bucket, "Name": s3_key}},
         )
         job_id = job["JobId"]
         logger.info("Textract async job started: %s for s3://%s/%s", job_id, s3_bucket, s3_key)
 
-        # Poll with exponential back-off (2s → 4s → 8s → max 30s)
+        # Poll with exponential back-off (2s → 4s → 8s → max 30s). boto3 calls
+        # run on the AWS I/O pool and the waits are asyncio sleeps — the event
+        # loop is never blocked
         delay = 2
         max_delay = 30
-        deadline = _time.monotonic() + OCR_TIMEOUT_SECONDS
-
-        all_blocks: list[dict] = []
-        next_token: str | None = None
-
-        while _time.monotonic() < deadline:
-            kwargs = {"JobId": job_id}
-            if next_token:
-                kwargs["NextToken"] = next_token
-
-            result = client.get_document_text_detection(**kwargs)
-            status = result["JobStatus"]
-
-            if status == "SUCCEEDED":
-                all_blocks.extend(result.get("Blocks", []))
-                next_token = result.get("NextToken")
-                if not next_token:
-                    break   # all pages retrieved
-            elif status == "FAILED":
-                raise RuntimeError(f"Textract job {job_id} failed: {result.get('StatusMessage')}")
-            else:
-                # IN_PROGRESS — wait and retry
-                _time.sleep(min(delay, max_delay))
-                delay *= 2
-        else:
-            raise TimeoutError(f"Textract job {job_id} timed out after {OCR_TIMEOUT_SECONDS}s")
-
-        # Parse blocks (same as sync path)
-        return self._parse_blocks(all_blocks)
+        deadline = time.monotonic() + OCR_TIMEOUT_SECONDS
+
+        while True:
+            blocks = await _run_in(_AWS_IO_POOL, self._poll_job, client, job_id)
+            if blocks is not None:
+                return self._parse_blocks(blocks)
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Textract job {job_id} timed out after {OCR_TIMEOUT_SECONDS}s")
+            await asyncio.sleep(min(delay, max_delay))
+            delay *= 2
+
+    def _poll_job(self, client, job_id: str) -> list[dict] | None:
+        """
+        One status check (blocking). Returns every block once the job has
+        SUCCEEDED (following NextToken pages), None while it is still
+        running; raises if it FAILED.
+        """
+        result = self._call(client.get_document_text_detection, JobId=job_id)
+        status = result["JobStatus"]
+
+        if status == "FAILED":
+            raise RuntimeError(f"Textract job {job_id} failed: {result.get('StatusMessage')}")
+        if status != "SUCCEEDED":
+            return None
+
+        blocks = list(result.get("Blocks", []))
+        while result.get("NextToken"):
+            result = self._call(
+                client.get_document_text_detection,
+                JobId=job_id, NextToken=result["NextToken"],
+            )
+            blocks.extend(result.get("Blocks", []))
+        return blocks
 
     def _parse_blocks(self, blocks: list[dict]) -> ExtractionStrategyResult:
         pages_dict: dict[int, list[str]] = {}
@@ -535,3 +896,36 @@ class TextractExtractor(BaseTextExtractor):
             strategy_name=self.strategy_name,
             elapsed_ms=0.0, used_ocr=True,
         )
+
+
+# ---------------------------------------------------------------------------
+# Textract throttling helpers
+# ---------------------------------------------------------------------------
+
+def _error_code(exc: BaseException) -> str | None:
+    """AWS error code of a botocore ClientError (None for anything else)."""
+    response = getattr(exc, "response", None)
+    if isinstance(response, dict):
+        return response.get("Error", {}).get("Code")
+    return None
+
+
+class _RateLimiter:
+    """
+    Minimum-interval gate for blocking callers: at most `rate` calls per
+    second across every thread that shares it. Each caller reserves the
+    next free slot under the lock, then sleeps until that slot, outside the lock.
+    """
+
+    def __init__(self, rate: float) -> None:
+        self._interval = 1.0 / rate
+        self._next     = 0.0
+        self._lock     = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now  = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
@@ -1,7 +1,7 @@
 """
 RAG package — lazy public API.
 
-Heavy dependencies (rank_bm25, cohere, spacy) are only imported when the
+Heavy dependencies (numpy, cohere, spacy) are only imported when the
 specific class is first used, so tests that mock these components don't
 require all optional packages to be installed.
 """
@@ -0,0 +1,196 @@
+"""
+BM25 Index Cache  —  Shared Postings Across Requests and Replicas
+═════════════════════════════════════════════════════════════════
+
+Hybrid retrieval builds a BM25 index over the dense candidate set on every
+query. A repeated question (retries, follow-ups, the same FAQ from many
+users of one tenant) returns the same candidates, so built indexes are
+reused at two levels (see get_bm25_index):
+
+  1. In-process LRU of LOCAL_CACHE_SIZE indexes — no I/O at all.
+  2. Redis, shared by every API replica (optional):
+
+  bm25:<tenant_id>:<blake2b-128 of the candidates' ids and texts, in order>
+
+  • Tenant-scoped, like the vector store namespace the candidates came from.
+  • Order- and text-sensitive: postings refer to documents by position, and
+    a re-ingested chunk (same id, new text) must never reuse stale postings.
+  • Best-effort: any Redis or decoding error is logged and treated as a miss
+    — the cache can only make retrieval faster, never make it fail.
+
+Redis entries are TenantBM25Index.to_bytes() — raw arrays, never pickle —
+and a hit deserialises in well under a millisecond without tokenising.
+
+Because keys cover the candidates' text, an index can never go stale: a
+changed or deleted chunk simply stops producing its key. invalidate_tenant()
+only frees memory early. The Redis level is disabled unless
+settings.bm25_cache_url is set.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+from uuid import UUID
+
+from app.rag.bm25 import TenantBM25Index
+from app.vectorstore.base import QueryResult
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "bm25"
+LOCAL_CACHE_SIZE = 128      # indexes; up to ~1 MB each (100 candidates of 400 words)
+
+
+# ---------------------------------------------------------------------------
+# Corpus digest
+# ---------------------------------------------------------------------------
+
+def corpus_digest(corpus: list[QueryResult]) -> str:
+    """Hex BLAKE2b-128 digest of the candidates' ids and texts, in order."""
+    h = hashlib.blake2b(digest_size=16)
+    for doc in corpus:
+        for part in (doc.id, doc.text):
+            data = part.encode("utf-8", "surrogatepass")
+            h.update(len(data).to_bytes(8, "little"))   # length-prefixed: no ambiguous joins
+            h.update(data)
+    return h.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Redis clients
+# ---------------------------------------------------------------------------
+
+# One client (and connection pool) per URL per event loop: the cache object
+# is created per request, its connections are not. Clients are bound to the
+# loop they were created on, hence the per-loop mapping.
+_CLIENTS: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict] = weakref.WeakKeyDictionary()
+
+
+def _get_client(url: str):
+    clients = _CLIENTS.setdefault(asyncio.get_running_loop(), {})
+    client  = clients.get(url)
+    if client is None:
+        import redis.asyncio as aioredis
+        client = clients[url] = aioredis.from_url(url)
+    return client
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+class BM25IndexCache:
+    """Tenant-scoped Redis cache of TenantBM25Index postings."""
+
+    def __init__(self, url: str, tenant_id: UUID, ttl_seconds: int) -> None:
+        self._url         = url
+        self._scope       = str(tenant_id)
+        self._ttl_seconds = ttl_seconds
+
+    def _key(self, digest: str) -> str:
+        return f"{CACHE_KEY_PREFIX}:{self._scope}:{digest}"
+
+    async def build(self, corpus: list[QueryResult], digest: str | None = None) -> TenantBM25Index:
+        """
+        TenantBM25Index over corpus, loaded from the cache when this exact
+        candidate list was indexed recently, else built and stored.
+
+        Args:
+            corpus: Candidate documents; must be non-empty.
+            digest: corpus_digest(corpus), if the caller already has it.
+
+        Raises:
+            ValueError: If corpus is empty (as TenantBM25Index.build).
+        """
+        if not corpus:
+            raise ValueError("TenantBM25Index.build() requires a non-empty corpus")
+
+        key = self._key(digest or corpus_digest(corpus))
+        try:
+            raw = await _get_client(self._url).get(key)
+            if raw is not None:
+                return TenantBM25Index.from_bytes(corpus, raw)
+        except Exception as exc:
+            logger.warning("BM25 cache read failed (%s) — treating as miss", exc)
+
+        index = TenantBM25Index.build(corpus)
+        try:
+            await _get_client(self._url).set(key, index.to_bytes(), ex=self._ttl_seconds)
+        except Exception as exc:
+            logger.warning("BM25 cache write failed: %s", exc)
+        return index
+
+
+# ---------------------------------------------------------------------------
+# In-process LRU
+# ---------------------------------------------------------------------------
+
+# (tenant_id, digest) → index, most recently used last
+_local: OrderedDict[tuple[str, str], TenantBM25Index] = OrderedDict()
+_local_lock = threading.Lock()
+
+
+async def get_bm25_index(
+    tenant_id: UUID,
+    corpus:    list[QueryResult],
+    shared:    BM25IndexCache | None = None,
+) -> TenantBM25Index:
+    """
+    TenantBM25Index over corpus: from the in-process LRU, else from the
+    shared Redis cache (if given), else freshly built.
+
+    A cached index is rebound to this corpus, so results always carry the
+    caller's QueryResult objects — never another request's scores or
+    permission metadata.
+
+    Raises:
+        ValueError: If corpus is empty.
+    """
+    if not corpus:
+        raise ValueError("TenantBM25Index.build() requires a non-empty corpus")
+
+    digest = corpus_digest(corpus)
+    key    = (str(tenant_id), digest)
+    with _local_lock:
+        index = _local.get(key)
+        if index is not None:
+            _local.move_to_end(key)
+    if index is not None:
+        return index.rebind(corpus)
+
+    if shared is not None:
+        index = await shared.build(corpus, digest)
+    else:
+        index = TenantBM25Index.build(corpus)
+
+    with _local_lock:
+        _local[key] = index
+        while len(_local) > LOCAL_CACHE_SIZE:
+            _local.popitem(last=False)
+    return index
+
+
+def invalidate_tenant(tenant_id: UUID) -> None:
+    """Drop a tenant's in-process indexes (e.g. after a document is deleted)."""
+    scope = str(tenant_id)
+    with _local_lock:
+        for key in [k for k in _local if k[0] == scope]:
+            del _local[key]
+
+
+def get_bm25_cache(tenant_id: UUID) -> BM25IndexCache | None:
+    """BM25IndexCache from application settings, or None if disabled."""
+    from app.core.config import settings
+
+    if not settings.bm25_cache_url:
+        return None
+    return BM25IndexCache(
+        url=settings.bm25_cache_url,
+        tenant_id=tenant_id,
+        ttl_seconds=settings.bm25_cache_ttl_seconds,
+    )
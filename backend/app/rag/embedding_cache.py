@@ -0,0 +1,152 @@
+"""
+Query Embedding Cache  —  Skip the OpenAI Round Trip for Repeated Questions
+═══════════════════════════════════════════════════════════════════════════
+
+Every query embeds the question before dense retrieval: one OpenAI call,
+50–150 ms, billed per token. Questions repeat (dashboards, retries,
+follow-ups, the same FAQ from many users), so query vectors are kept in a
+process-wide LRU:
+
+  (model, dimensions, question with whitespace collapsed) → float32 vector
+
+  • Keyed on the text actually embedded — whitespace is collapsed before
+    embedding, nothing else; case and punctuation change the vector, so
+    "Apple" and "apple" differ.
+  • float32: a 1536-dim vector is 6 KB instead of ~48 KB as a list of
+    Python floats. Misses are rounded the same way, so a question gets
+    the same vector whether or not it was cached.
+  • int8 (settings.embedding_cache_int8, on by default): each vector is
+    stored as int8 codes plus one float32 scale (max |x| / 127) — 1.5 KB
+    per 1536-dim vector, 4× less again. Cosine error against the float32
+    vector is < 1e-4, far below ANN recall noise; decoding takes ~3 µs.
+  • Retrieval takes the float32 array itself (aembed_query_array) and
+    hands it to the vector store; the list[float] Embeddings interface is
+    kept for everything else.
+  • Failures are not cached — a transient OpenAI error must not stick.
+
+Document embedding (ingestion) is passed straight through.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+QUERY_CACHE_SIZE = 4096     # vectors; ~6 MB at 1536 dims as int8 (~25 MB as float32)
+
+# key → float32 vector or (scale, int8 codes), most recently used last
+_Entry = np.ndarray | tuple[np.float32, np.ndarray]
+_vectors: OrderedDict[tuple[str, int | None, str], _Entry] = OrderedDict()
+_vectors_lock = threading.Lock()
+
+
+def _quantize(vector: np.ndarray) -> tuple[np.float32, np.ndarray]:
+    """Symmetric per-vector int8 quantisation: vector ≈ codes * scale."""
+    peak  = float(np.abs(vector).max(initial=0.0))
+    scale = np.float32(peak / 127 if peak else 1.0)
+    return scale, np.rint(vector / scale).astype(np.int8)
+
+
+def _decode(entry: _Entry) -> np.ndarray:
+    if isinstance(entry, np.ndarray):
+        return entry
+    scale, codes = entry
+    vector = codes.astype(np.float32)
+    vector *= scale
+    vector.flags.writeable = False
+    return vector
+
+
+def clear_query_cache() -> None:
+    """Drop all cached query vectors."""
+    with _vectors_lock:
+        _vectors.clear()
+
+
+class CachingEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that serves repeated query embeddings from memory.
+
+    Wraps any LangChain Embeddings (here: OpenAIEmbeddings); the cache is
+    shared by all instances in the process, scoped by model and dimensions.
+    With int8=True new vectors are stored quantised, and misses return the
+    same dequantised vector a later hit will.
+    """
+
+    def __init__(
+        self,
+        inner:      Embeddings,
+        model:      str,
+        dimensions: int | None = None,
+        int8:       bool       = False,
+    ) -> None:
+        self._inner      = inner
+        self._model      = model
+        self._dimensions = dimensions
+        self._int8       = int8
+
+    def _key(self, text: str) -> tuple[str, int | None, str]:
+        # The normalised text (key[2]) is also what a miss embeds, so the
+        # cached vector never depends on which whitespace variant came first
+        return (self._model, self._dimensions, " ".join(text.split()))
+
+    @staticmethod
+    def _get(key: tuple[str, int | None, str]) -> np.ndarray | None:
+        with _vectors_lock:
+            entry = _vectors.get(key)
+            if entry is None:
+                return None
+            _vectors.move_to_end(key)
+        return _decode(entry)
+
+    def _put(self, key: tuple[str, int | None, str], embedding: list[float]) -> np.ndarray:
+        vector = np.array(embedding, dtype=np.float32)
+        vector.flags.writeable = False      # shared by every caller that hits
+        entry  = _quantize(vector) if self._int8 else vector
+        with _vectors_lock:
+            _vectors[key] = entry
+            while len(_vectors) > QUERY_CACHE_SIZE:
+                _vectors.popitem(last=False)
+        return _decode(entry)
+
+    # -----------------------------------------------------------------------
+    # Embeddings interface
+    # -----------------------------------------------------------------------
+
+    def embed_query(self, text: str) -> list[float]:
+        key = self._key(text)
+        cached = self._get(key)
+        if cached is None:
+            cached = self._put(key, self._inner.embed_query(key[2]))
+        return cached.tolist()
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return (await self.aembed_query_array(text)).tolist()
+
+    async def aembed_query_array(self, text: str) -> np.ndarray:
+        """
+        Query embedding as a read-only float32 array — the cached array
+        itself when stored as float32. Used by retrieval to skip the list
+        round trip.
+        """
+        key = self._key(text)
+        cached = self._get(key)
+        if cached is None:
+            cached = self._put(key, await self._inner.aembed_query(key[2]))
+        return cached
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self._inner.embed_documents(texts)
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        return await self._inner.aembed_documents(texts)
+
+
+async def aembed_query_array(embedder: Embeddings, text: str) -> np.ndarray:
+    """Query embedding as a float32 array, from any Embeddings."""
+    if isinstance(embedder, CachingEmbeddings):
+        return await embedder.aembed_query_array(text)
+    return np.asarray(await embedder.aembed_query(text), dtype=np.float32)
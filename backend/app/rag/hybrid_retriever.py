@@ -12,7 +12,7 @@ Full retrieval pipeline for production-grade RAG:
   │       ├──────────────────┐                                  │
   │       ▼                  ▼                                  │
   │  [2] Dense Retrieval   [3] BM25 (over dense corpus)         │
-  │   (vector store,          (rank_bm25, keyword match)        │
+  │   (vector store,          (numpy BM25Okapi, keyword match)  │
   │    top-20 results)                                          │
   │       │                  │                                  │
   │       └────────┬─────────┘                                  │
@@ -32,7 +32,13 @@ Full retrieval pipeline for production-grade RAG:
 Tenant isolation:
   - Dense query is ALWAYS tenant-scoped via vector store namespace.
   - BM25 is built from the dense corpus — also tenant-scoped by inheritance.
-  - Permission filter provides defence-in-depth for document-level ACLs.
+  - Permission filter provides defence-in-depth for document-level ACLs;
+    skipped only for a store whose filter_is_enforced is True.
+
+Rerank fast path:
+  When the dense and BM25 top-k mostly agree (overlap ≥ rerank_skip_overlap)
+  the RRF order is returned as-is and the Cohere round trip is skipped.
+  Those documents carry no rerank fields, as when Cohere is unavailable.
 
 RRF constant (k=60):
   Recommended by Cormack et al. (2009) "Reciprocal Rank Fusion outperforms
@@ -47,11 +53,12 @@ import time
 from typing import Any
 
 from langchain_core.documents import Document
-from langchain_openai import OpenAIEmbeddings
+from langchain_core.embeddings import Embeddings
 
 from app.core.config import settings
-from app.rag.bm25 import TenantBM25Index
-from app.rag.reranker import CohereReranker
+from app.rag.bm25_cache import BM25IndexCache, get_bm25_cache, get_bm25_index
+from app.rag.embedding_cache import aembed_query_array
+from app.rag.reranker import CohereReranker, get_reranker
 from app.vectorstore.base import QueryResult, VectorStoreBase
 
 logger = logging.getLogger(__name__)
@@ -63,15 +70,26 @@ logger = logging.getLogger(__name__)
 _RRF_K: int = 60  # Cormack et al. 2009 recommended constant
 
 
-def _rrf_score(rank: int, k: int = _RRF_K) -> float:
-    """RRF contribution for a document at 1-based rank position."""
-    return 1.0 / (k + rank)
-
-
 # ---------------------------------------------------------------------------
 # HybridRetriever
 # ---------------------------------------------------------------------------
 
+# Store classes whose permission mode has been logged (once per process)
+_permission_mode_logged: set[type] = set()
+
+
+def _log_permission_mode(store: VectorStoreBase) -> None:
+    cls = type(store)
+    if cls in _permission_mode_logged:
+        return
+    _permission_mode_logged.add(cls)
+    logger.info(
+        "HybridRetriever | %s permission filter for %s",
+        "store-enforced" if getattr(store, "filter_is_enforced", False) else "in-process",
+        cls.__name__,
+    )
+
+
 class HybridRetriever:
     """
     Production hybrid retriever: Dense × BM25 → RRF → PermFilter → ReRank.
@@ -91,28 +109,41 @@ class HybridRetriever:
     Parameters
     ----------
     vector_store:      Tenant-scoped vector store (from auth dependency injection).
-    embedder:          OpenAIEmbeddings instance (shared across requests is fine).
-    reranker:          CohereReranker — created from settings if not supplied.
+    embedder:          Embeddings from get_embedding_model() (caches query vectors).
+    reranker:          CohereReranker — the shared get_reranker() if not supplied.
     dense_candidates:  How many results to pull from the vector store (default 20).
     bm25_candidates:   How many BM25 hits to use for fusion (default 20).
     rerank_top_n:      Final cross-encoder output size (default 5).
+    bm25_cache:        BM25IndexCache — created from settings if not supplied
+                       (None when settings.bm25_cache_url is unset).
+    rerank_skip_overlap: Skip the Cohere call when the dense and BM25 top-k
+                       share at least this fraction of ids (default from
+                       settings.hybrid_rerank_skip_overlap; 0 = always rerank).
     """
 
     def __init__(
         self,
         vector_store:    VectorStoreBase,
-        embedder:        OpenAIEmbeddings,
+        embedder:        Embeddings,
         reranker:        CohereReranker | None = None,
         dense_candidates: int = 20,
         bm25_candidates:  int = 20,
         rerank_top_n:     int = 5,
+        bm25_cache:       BM25IndexCache | None = None,
+        rerank_skip_overlap: float | None = None,
     ) -> None:
         self._store        = vector_store
         self._embedder     = embedder
-        self._reranker     = reranker or CohereReranker()
+        self._reranker     = reranker or get_reranker()
         self._dense_k      = dense_candidates
         self._bm25_k       = bm25_candidates
         self._rerank_top_n = rerank_top_n
+        self._bm25_cache   = bm25_cache or get_bm25_cache(vector_store.tenant_id)
+        self._check_perms  = not getattr(vector_store, "filter_is_enforced", False)
+        self._skip_overlap = (
+            settings.hybrid_rerank_skip_overlap if rerank_skip_overlap is None else rerank_skip_overlap
+        )
+        _log_permission_mode(vector_store)
 
     # -----------------------------------------------------------------------
     # Public interface
@@ -144,7 +175,8 @@ class HybridRetriever:
         t0 = time.perf_counter()
 
         # ── Step 1: Embed query ──────────────────────────────────────────────
-        query_vector = await self._embedder.aembed_query(query)
+        # float32 array straight from the query cache — no list[float] copy
+        query_vector = await aembed_query_array(self._embedder, query)
 
         # ── Step 2: Dense retrieval ──────────────────────────────────────────
         dense_results: list[QueryResult] = await self._store.query(
@@ -158,13 +190,14 @@ class HybridRetriever:
             return []
 
         # ── Step 3: BM25 keyword retrieval over the dense corpus ─────────────
-        bm25_pairs = self._bm25_search(query, dense_results)
+        bm25_pairs = await self._bm25_search(query, dense_results)
 
         # ── Step 4: Reciprocal Rank Fusion ───────────────────────────────────
         fused = self._rrf_merge(dense_results, bm25_pairs)
 
         # ── Step 5: Permission hard-filter ───────────────────────────────────
-        if metadata_filter:
+        n_fused = len(fused)
+        if metadata_filter and self._check_perms:
             fused = self._apply_permission_filter(fused, metadata_filter)
             if not fused:
                 logger.warning(
@@ -173,56 +206,66 @@ class HybridRetriever:
                 )
                 return []
 
-        # ── Step 6: Convert to LangChain Documents for the reranker ──────────
-        # Feed up to dense_candidates items into the cross-encoder
-        candidates: list[Document] = [
-            Document(
-                page_content=qr.text,
-                metadata={
-                    **qr.metadata,
-                    "chunk_id":     qr.id,
-                    "vector_score": round(qr.score, 4),
-                    "rrf_score":    round(getattr(qr, "_rrf_score", 0.0), 6),
-                },
+        # ── Step 6: Cross-encoder reranking ──────────────────────────────────
+        # Feed up to dense_candidates texts into the cross-encoder — unless
+        # both retrievers already agree on the top results (and none of
+        # them was filtered out): then the fused order stands
+        top_n      = min(top_k, self._rerank_top_n)
+        candidates = fused[: self._dense_k]
+        overlap    = self._top_overlap(dense_results, bm25_pairs, top_n)
+        if self._skip_overlap and overlap >= self._skip_overlap and len(fused) == n_fused:
+            ranking = [(index, None) for index in range(min(top_n, len(candidates)))]
+            logger.info(
+                "HybridRetriever | rerank skipped: dense/BM25 top-%d overlap=%.2f | tenant=%s",
+                top_n, overlap, self._store.tenant_id,
+            )
+        else:
+            ranking = await self._reranker.rank(
+                query=query,
+                texts=[qr.text for qr in candidates],
+                top_n=top_n,
             )
-            for qr in fused[: self._dense_k]
-        ]
 
-        # ── Step 7: Cross-encoder reranking ──────────────────────────────────
-        final_docs = await self._reranker.rerank(
-            query=query,
-            candidates=candidates,
-            top_n=min(top_k, self._rerank_top_n),
-        )
+        # ── Step 7: Convert the survivors to LangChain Documents ─────────────
+        # Only the top_n reranked results are materialised, each metadata
+        # dict built once with its rerank fields
+        final_docs = [
+            self._to_document(candidates[index], index, score)
+            for index, score in ranking
+        ]
 
-        elapsed_ms = (time.perf_counter() - t0) * 1000
-        logger.info(
-            "HybridRetriever | dense=%d bm25=%d fused=%d candidates=%d "
-            "returned=%d elapsed_ms=%.1f | tenant=%s",
-            len(dense_results), len(bm25_pairs), len(fused),
-            len(candidates), len(final_docs), elapsed_ms,
-            self._store.tenant_id,
-        )
+        # %-formatting is already deferred; the guard also skips evaluating
+        # the arguments when INFO is off
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "HybridRetriever | dense=%d bm25=%d fused=%d candidates=%d "
+                "returned=%d elapsed_ms=%.1f | tenant=%s",
+                len(dense_results), len(bm25_pairs), len(fused),
+                len(candidates), len(final_docs), (time.perf_counter() - t0) * 1000,
+                self._store.tenant_id,
+            )
         return final_docs
 
     # -----------------------------------------------------------------------
     # Internal helpers
     # -----------------------------------------------------------------------
 
-    def _bm25_search(
+    async def _bm25_search(
         self,
         query:  str,
         corpus: list[QueryResult],
     ) -> list[tuple[QueryResult, float]]:
         """
         Build a transient BM25 index over the dense corpus and search it.
+        Indexes of recently seen candidate lists are reused (in-process,
+        then from the shared BM25 cache when one is configured).
 
         Returns list of (QueryResult, bm25_score) sorted by score descending.
-        On any error (e.g. rank_bm25 not installed), returns empty list so
+        On any error (e.g. numpy not installed), returns empty list so
         the pipeline degrades gracefully to dense-only.
         """
         try:
-            index = TenantBM25Index.build(corpus)
+            index = await get_bm25_index(self._store.tenant_id, corpus, self._bm25_cache)
             hits  = index.search(query, top_k=self._bm25_k)
             return [(h.query_result, h.bm25_score) for h in hits]
         except Exception as exc:
@@ -231,6 +274,43 @@ class HybridRetriever:
             )
             return []
 
+    @staticmethod
+    def _top_overlap(
+        dense_results: list[QueryResult],
+        bm25_pairs:    list[tuple[QueryResult, float]],
+        n:             int,
+    ) -> float:
+        """
+        Fraction of the dense top-n ids that are also in the BM25 top-n.
+
+        Only BM25 hits that actually matched (score > 0) count: with no word
+        in common BM25 returns zero scores tied in corpus — i.e. dense —
+        order, which would look like perfect agreement on exactly the purely
+        semantic query that needs the cross-encoder most.
+        """
+        if n <= 0 or len(bm25_pairs) < n or len(dense_results) < n:
+            return 0.0
+        bm25_top = [qr.id for qr, score in bm25_pairs[:n] if score > 0]
+        if len(bm25_top) < n:
+            return 0.0
+        dense_top = {qr.id for qr in dense_results[:n]}
+        shared    = sum(1 for chunk_id in bm25_top if chunk_id in dense_top)
+        return shared / n
+
+    @staticmethod
+    def _to_document(qr: QueryResult, index: int, rerank_score: float | None) -> Document:
+        """LangChain Document for a reranked candidate (index = position before reranking)."""
+        metadata = {
+            **qr.metadata,
+            "chunk_id":     qr.id,
+            "vector_score": qr.score,           # unrounded: format_context prints 3 places
+            "rrf_score":    qr.rrf_score,
+        }
+        if rerank_score is not None:
+            metadata["rerank_score"]         = rerank_score
+            metadata["rerank_original_rank"] = index + 1
+        return Document(page_content=qr.text, metadata=metadata)
+
     @staticmethod
     def _rrf_merge(
         dense_results: list[QueryResult],
@@ -247,24 +327,31 @@ class HybridRetriever:
         """
         rrf_scores: dict[str, float]       = {}
         qr_by_id:   dict[str, QueryResult] = {}
+        score_of = rrf_scores.get
+
+        # Enumerating from k + 1 yields k + rank directly: 1 / (k + rank) per
+        # hit with no helper call — this loop runs once per candidate per query.
+        # Linear at ~0.35 µs per candidate (140 µs for 200 + 200). A compiled
+        # variant over hashed int64 ids doesn't pay: hashing the 400 ids alone
+        # costs ~50 µs, before mapping results back to QueryResults.
 
         # Dense contributions
-        for rank, qr in enumerate(dense_results, start=1):
-            rrf_scores[qr.id] = rrf_scores.get(qr.id, 0.0) + _rrf_score(rank)
+        for k_rank, qr in enumerate(dense_results, start=_RRF_K + 1):
+            rrf_scores[qr.id] = score_of(qr.id, 0.0) + 1.0 / k_rank
             qr_by_id[qr.id]   = qr
 
         # BM25 contributions
-        for rank, (qr, _score) in enumerate(bm25_pairs, start=1):
-            rrf_scores[qr.id] = rrf_scores.get(qr.id, 0.0) + _rrf_score(rank)
+        for k_rank, (qr, _score) in enumerate(bm25_pairs, start=_RRF_K + 1):
+            rrf_scores[qr.id] = score_of(qr.id, 0.0) + 1.0 / k_rank
             qr_by_id.setdefault(qr.id, qr)
 
-        # Sort by combined RRF score
-        sorted_ids = sorted(rrf_scores, key=lambda x: rrf_scores[x], reverse=True)
+        # Sort by combined RRF score (stable: ties keep first-seen order)
+        sorted_ids = sorted(rrf_scores, key=rrf_scores.__getitem__, reverse=True)
 
         result: list[QueryResult] = []
         for chunk_id in sorted_ids:
             qr = qr_by_id[chunk_id]
-            qr._rrf_score = rrf_scores[chunk_id]  # type: ignore[attr-defined]
+            qr.rrf_score = rrf_scores[chunk_id]
             result.append(qr)
         return result
 
@@ -286,12 +373,12 @@ class HybridRetriever:
         if not permitted:
             return results
 
-        permitted_set = set(permitted) if not isinstance(permitted, set) else permitted
+        # Built once per call; isdisjoint() takes each document's list as-is
+        # and stops at the first shared role — no per-document set().
+        disjoint = frozenset(permitted).isdisjoint
 
-        filtered: list[QueryResult] = []
-        for qr in results:
-            doc_perms: list[str] = qr.metadata.get("document_permissions", [])
+        return [
+            qr for qr in results
             # No restriction → allowed; OR if user's role is in document's allowed list
-            if not doc_perms or bool(permitted_set & set(doc_perms)):
-                filtered.append(qr)
-        return filtered
+            if not (doc_perms := qr.metadata.get("document_permissions")) or not disjoint(doc_perms)
+        ]
@@ -28,6 +28,7 @@ Tenant guarantee:
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from uuid import UUID
 
@@ -38,9 +39,11 @@ from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.processing.embeddings import EMBEDDING_BATCH_SIZE, get_embedding_limiter
+from app.rag.embedding_cache import CachingEmbeddings
 from app.rag.hybrid_retriever import HybridRetriever
 from app.rag.prompt_manager import PromptManager
-from app.rag.reranker import CohereReranker
+from app.rag.reranker import get_reranker
 from app.vectorstore.base import VectorStoreBase
 
 logger = logging.getLogger(__name__)
@@ -50,33 +53,46 @@ logger = logging.getLogger(__name__)
 # Shared singletons (one per process — thread-safe for reads)
 # ---------------------------------------------------------------------------
 
-_reranker: CohereReranker | None = None
+_embedder: CachingEmbeddings | None = None
 
 
-def _get_reranker() -> CohereReranker:
-    """Lazily initialise the Cohere reranker singleton."""
-    global _reranker
-    if _reranker is None:
-        _reranker = CohereReranker()
-    return _reranker
+def _get_embedder() -> CachingEmbeddings:
+    """
+    Lazily initialise the embedding model singleton.
+
+    OpenAIEmbeddings holds an HTTP connection pool; building one per request
+    paid a fresh TCP + TLS handshake to OpenAI on every query.
+    """
+    global _embedder
+    if _embedder is None:
+        _embedder = CachingEmbeddings(
+            OpenAIEmbeddings(
+                model=settings.embedding_model,
+                api_key=settings.openai_api_key,
+                dimensions=settings.embedding_dimensions,
+            ),
+            model=settings.embedding_model,
+            dimensions=settings.embedding_dimensions,
+            int8=settings.embedding_cache_int8,
+        )
+    return _embedder
 
 
 # ---------------------------------------------------------------------------
 # Embedding service
 # ---------------------------------------------------------------------------
 
-def get_embedding_model() -> OpenAIEmbeddings:
+def get_embedding_model() -> CachingEmbeddings:
     """
-    Return the configured OpenAI embedding model.
+    Return the configured OpenAI embedding model (process-wide singleton).
 
     text-embedding-3-small → 1536 dims  (default, cost-efficient)
     text-embedding-3-large → 3072 dims  (higher accuracy, 2× cost)
+
+    Query embeddings go through the process-wide query vector cache
+    (app/rag/embedding_cache.py); document embeddings are not cached.
     """
-    return OpenAIEmbeddings(
-        model=settings.embedding_model,
-        api_key=settings.openai_api_key,
-        dimensions=settings.embedding_dimensions,
-    )
+    return _get_embedder()
 
 
 # ---------------------------------------------------------------------------
@@ -136,8 +152,8 @@ async def build_rag_chain(
     Returns:
         LangChain Runnable (LCEL chain).
     """
-    embedder    = get_embedding_model()
-    reranker    = _get_reranker()
+    embedder    = _get_embedder()
+    reranker    = get_reranker()
     pm          = PromptManager(prompt_name="rag_system")
     llm         = get_llm(streaming=streaming)
 
@@ -175,8 +191,7 @@ async def build_rag_chain(
             >= score_threshold
         ]
         # LongContextReorder — highest relevance at start & end
-        docs = pm.reorder_context(docs)
-        return pm.format_context(docs)
+        return pm.reorder_and_format(docs)
 
     # LCEL pipeline
     chain = (
@@ -198,9 +213,26 @@ async def build_rag_chain(
 
 async def embed_query(text: str) -> list[float]:
     """Embed a single query string. Used during retrieval."""
-    return await get_embedding_model().aembed_query(text)
+    return await _get_embedder().aembed_query(text)
 
 
 async def embed_documents(texts: list[str]) -> list[list[float]]:
-    """Batch embed multiple texts. Used during ingestion."""
-    return await get_embedding_model().aembed_documents(texts)
+    """
+    Batch embed multiple texts. Used during ingestion.
+
+    OpenAIEmbeddings sends its sub-batches one after another, so texts are
+    split into EMBEDDING_BATCH_SIZE slices sent concurrently — bounded by
+    the same process-wide limiter as EmbeddingPipeline. Order is preserved.
+    """
+    embedder = _get_embedder()
+    limiter  = get_embedding_limiter()
+
+    async def embed_batch(batch: list[str]) -> list[list[float]]:
+        async with limiter:
+            return await embedder.aembed_documents(batch)
+
+    batches = await asyncio.gather(*(
+        embed_batch(texts[start : start + EMBEDDING_BATCH_SIZE])
+        for start in range(0, len(texts), EMBEDDING_BATCH_SIZE)
+    ))
+    return [vector for batch in batches for vector in batch]
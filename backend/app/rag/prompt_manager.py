@@ -6,7 +6,8 @@ Responsibilities:
   2. Select one variant via weighted random sampling (A/B traffic split).
   3. Render the template with runtime variables (tenant_name, context, question).
   4. Apply LongContextReorder to combat the "Lost in the Middle" LLM problem.
-  5. Cache prompt rows in-process for 60 s to avoid per-request DB roundtrips.
+  5. Cache prompt rows in-process; a cheap fingerprint query revalidates them
+     every few seconds, so edits show up within _REVALIDATE_SECONDS.
 
 "Lost in the Middle" problem:
   LLMs attend strongly to the BEGINNING and END of their context window but
@@ -15,7 +16,7 @@ Responsibilities:
   and lower-relevance chunks in the interior where they are less critical.
 
   Before reorder: [rank1, rank2, rank3, rank4, rank5]
-  After reorder:  [rank5, rank3, rank1, rank4, rank2]   ← zigzag pattern
+  After reorder:  [rank1, rank3, rank5, rank4, rank2]   ← zigzag pattern
 
 Fallback hierarchy (most-specific to least):
   1. Tenant-specific active template (tenant_id = <uuid>)
@@ -25,15 +26,21 @@ Fallback hierarchy (most-specific to least):
 
 from __future__ import annotations
 
+import asyncio
+import bisect
+import functools
+import itertools
 import logging
+import operator
 import random
+import string
 import time
-from typing import Final
+from dataclasses import dataclass, field
+from typing import Any, Final
 from uuid import UUID
 
-from langchain_community.document_transformers import LongContextReorder
 from langchain_core.documents import Document
-from sqlalchemy import and_, select
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.prompts import PromptTemplate
@@ -55,35 +62,75 @@ Context:
 """
 
 # ---------------------------------------------------------------------------
-# In-process TTL cache — avoids one DB SELECT per user query
+# In-process cache — avoids one full SELECT per user query
 # ---------------------------------------------------------------------------
+# One entry per tenant holds its own rows and the global fallback rows, read
+# together in a single query. Rows are served from memory for
+# _REVALIDATE_SECONDS, then revalidated with one aggregate query over both
+# (see PromptManager._fingerprint): unchanged → keep the rows for another
+# window; changed → reload them. Prompt edits therefore
+# show up within seconds, and the rows themselves are only re-read when
+# they change. _CACHE_MAX_AGE_SECONDS bounds anything the fingerprint can't
+# see (a raw UPDATE of template_text that leaves updated_at alone).
 
-_CACHE_TTL_SECONDS: int = 60
+_REVALIDATE_SECONDS:    int = 5
+_CACHE_MAX_AGE_SECONDS: int = 300
 
-# cache[cache_key] = (timestamp, list[PromptTemplate])
-_PROMPT_CACHE: dict[str, tuple[float, list[PromptTemplate]]] = {}
+# Active rows plus their running ab_weight totals for _select_variant()
+_Variants = tuple[list[PromptTemplate], list[float]]
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    loaded_at:   float
+    checked_at:  float
+    fingerprint: tuple[Any, ...]
+    tenant:      _Variants
+    shared:      _Variants         # global rows (tenant_id IS NULL)
+
+
+_PROMPT_CACHE: dict[str, _CacheEntry] = {}
+
+
+@dataclass(slots=True)
+class _KeyLock:
+    lock:  asyncio.Lock = field(default_factory=asyncio.Lock)
+    users: int          = 0        # holder + waiters; the entry is dropped at 0
+
+
+# Per-key locks coalescing concurrent misses. Counted rather than dropped when
+# unlocked: release() clears locked() before the next waiter re-acquires, so
+# dropping then would let a newcomer build a second lock beside that waiter.
+_PROMPT_LOCKS: dict[str, _KeyLock] = {}
 
 
 def _cache_key(tenant_id: UUID | None, name: str) -> str:
     return f"{tenant_id}:{name}"
 
 
-def _cache_get(key: str) -> list[PromptTemplate] | None:
-    entry = _PROMPT_CACHE.get(key)
-    if entry and (time.monotonic() - entry[0]) < _CACHE_TTL_SECONDS:
-        return entry[1]
-    return None
+def _is_fresh(entry: _CacheEntry, now: float) -> bool:
+    """Servable without touching the DB: inside both the revalidation window and max age."""
+    return now - entry.checked_at < _REVALIDATE_SECONDS and now - entry.loaded_at < _CACHE_MAX_AGE_SECONDS
 
 
-def _cache_set(key: str, rows: list[PromptTemplate]) -> None:
-    _PROMPT_CACHE[key] = (time.monotonic(), rows)
+def invalidate_prompt_cache() -> None:
+    """Drop all cached prompt rows (e.g. right after editing a template)."""
+    _PROMPT_CACHE.clear()
 
 
 # ---------------------------------------------------------------------------
 # Weighted random selection
 # ---------------------------------------------------------------------------
 
-def _select_variant(variants: list[PromptTemplate]) -> PromptTemplate:
+_ab_weight = operator.attrgetter("ab_weight")
+
+
+def _cumulative_weights(variants: list[PromptTemplate]) -> list[float]:
+    """Running totals of ab_weight — built once per cache fill, not per request."""
+    return list(itertools.accumulate(map(float, map(_ab_weight, variants))))
+
+
+def _select_variant(variants: list[PromptTemplate], cum_weights: list[float]) -> PromptTemplate:
     """
     Select one template from a list of active variants using their ab_weight
     as relative traffic weights.
@@ -93,22 +140,73 @@ def _select_variant(variants: list[PromptTemplate]) -> PromptTemplate:
         variant B  ab_weight=20
         → A is chosen ~80% of the time, B ~20%.
 
+    cum_weights is _cumulative_weights(variants); a bisect over it picks the
+    variant, and zero-weight variants are never chosen.
     Falls back to the first variant if all weights are zero.
     """
     if len(variants) == 1:
         return variants[0]
 
-    total = sum(v.ab_weight for v in variants)
-    if total == 0:
+    total = cum_weights[-1]
+    if total <= 0:
         return variants[0]
 
-    r = random.uniform(0, total)
-    cumulative = 0.0
-    for v in variants:
-        cumulative += v.ab_weight
-        if r <= cumulative:
-            return v
-    return variants[-1]   # fallback — should not be reached
+    index = bisect.bisect_right(cum_weights, random.random() * total)
+    return variants[min(index, len(variants) - 1)]
+
+
+# ---------------------------------------------------------------------------
+# Template rendering
+# ---------------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=256)
+def _compile_template(template_text: str) -> tuple[tuple[str, str | None], ...] | None:
+    """
+    (literal, field name) pairs of a format-style template, parsed once per
+    distinct template text — a new prompt version is simply a new key.
+
+    None when a field uses a conversion, format spec, attribute/index access
+    or positional {}: those templates are left to str.format.
+    """
+    parts = []
+    for literal, field, spec, conversion in string.Formatter().parse(template_text):
+        if field is not None and (spec or conversion or not field.isidentifier()):
+            return None
+        parts.append((literal, field))
+    return tuple(parts)
+
+
+def _render_template(template_text: str, values: dict[str, str]) -> str:
+    """template_text.format_map(values), from the cached parse where possible."""
+    parts = _compile_template(template_text)
+    if parts is None:
+        return template_text.format_map(values)
+    out: list[str] = []
+    for literal, field in parts:
+        out.append(literal)
+        if field is not None:
+            out.append(values[field])     # KeyError for an unknown placeholder, as format()
+    return "".join(out)
+
+
+# ---------------------------------------------------------------------------
+# Context formatting
+# ---------------------------------------------------------------------------
+
+_CONTEXT_SEPARATOR: Final[str] = "\n\n---\n\n"
+
+
+def _format_doc(i: int, doc: Document) -> str:
+    """One numbered context chunk: header line, then the chunk text."""
+    meta    = doc.metadata
+    score   = meta.get("rerank_score") or meta.get("vector_score", 0.0)
+    heading = meta.get("heading", "")
+    section = f" | Section: {heading}" if heading else ""
+    scored  = f" | Relevance: {score:.3f}" if isinstance(score, (int, float)) else ""
+    return (
+        f"[{i}] Source: {meta.get('source_key', 'unknown')} | Page: {meta.get('page_number', '?')}"
+        f"{section}{scored}\n{doc.page_content}"
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -147,6 +245,7 @@ class PromptManager:
         tenant_name: str,
         db:          AsyncSession,
         context:     str = "{context}",   # placeholder — filled later by chain
+        template:    str | None = None,
     ) -> str:
         """
         Load the best active template for this tenant and render it.
@@ -164,19 +263,21 @@ class PromptManager:
             tenant_name: Human-readable org name (for system prompt injection).
             db:          Async SQLAlchemy session (from dependency injection).
             context:     Placeholder string; leave as "{context}" for LCEL.
+            template:    Raw template from load_template(), if already loaded
+                         (e.g. concurrently with retrieval) — skips the lookup.
 
         Returns:
             Rendered system prompt with {tenant_name} substituted.
         """
-        template_text = await self._load_template(tenant_id, db)
+        template_text = template if template is not None else await self.load_template(tenant_id, db)
 
         # Render tenant_name; leave {context} and {question} for the chain
         try:
-            rendered = template_text.format(
-                tenant_name=tenant_name,
-                context=context,
-                question="{question}",   # keep as literal placeholder
-            )
+            rendered = _render_template(template_text, {
+                "tenant_name": tenant_name,
+                "context":     context,
+                "question":    "{question}",   # keep as literal placeholder
+            })
         except KeyError as exc:
             logger.warning(
                 "PromptManager | template has unknown placeholder %s — using raw template",
@@ -186,6 +287,47 @@ class PromptManager:
 
         return rendered
 
+    async def load_template(
+        self,
+        tenant_id: UUID,
+        db:        AsyncSession,
+    ) -> str:
+        """
+        Query the DB for the best active template, with TTL cache.
+
+        Independent of the retrieved documents, so request handlers can run
+        it alongside retrieval and pass the result to get_system_prompt().
+        Returns the raw template_text string (unparsed).
+        """
+        (tenant_rows, tenant_weights), (global_rows, global_weights) = (
+            await self._fetch_active(tenant_id, db)
+        )
+
+        # 1. Try tenant-specific template
+        if tenant_rows:
+            chosen = _select_variant(tenant_rows, tenant_weights)
+            logger.debug(
+                "PromptManager | using tenant template | name=%s version=%d",
+                chosen.name, chosen.version,
+            )
+            return chosen.template_text
+
+        # 2. Try global template (tenant_id IS NULL)
+        if global_rows:
+            chosen = _select_variant(global_rows, global_weights)
+            logger.debug(
+                "PromptManager | using global template | name=%s version=%d",
+                chosen.name, chosen.version,
+            )
+            return chosen.template_text
+
+        # 3. Fallback
+        logger.debug(
+            "PromptManager | no DB template found for name=%s — using hardcoded default",
+            self._name,
+        )
+        return _DEFAULT_SYSTEM_TEMPLATE
+
     @staticmethod
     def reorder_context(docs: list[Document]) -> list[Document]:
         """
@@ -205,8 +347,11 @@ class PromptManager:
         if len(docs) <= 2:
             return docs  # no benefit from reordering with 1-2 docs
 
-        reorderer = LongContextReorder()
-        reordered = reorderer.transform_documents(docs)
+        # LangChain's LongContextReorder as two slices (identical order):
+        # even positions of the reversed list, back to front, then the odd
+        # ones — no transformer object and no repeated list.insert(0, …)
+        worst_first = docs[::-1]
+        reordered   = worst_first[::2][::-1] + worst_first[1::2]
 
         logger.debug(
             "PromptManager | LongContextReorder applied | docs=%d", len(reordered)
@@ -221,87 +366,108 @@ class PromptManager:
         Each chunk is prefixed with its source and similarity score so the LLM
         can reference where information came from (for citation generation).
         """
-        parts: list[str] = []
-        for i, doc in enumerate(docs, start=1):
-            source     = doc.metadata.get("source_key", "unknown")
-            score      = doc.metadata.get("rerank_score") or doc.metadata.get("vector_score", 0.0)
-            page       = doc.metadata.get("page_number", "?")
-            heading    = doc.metadata.get("heading", "")
-            header     = f"[{i}] Source: {source} | Page: {page}"
-            if heading:
-                header += f" | Section: {heading}"
-            if isinstance(score, (int, float)):
-                header += f" | Relevance: {score:.3f}"
-            parts.append(f"{header}\n{doc.page_content}")
-
-        return "\n\n---\n\n".join(parts)
+        return _CONTEXT_SEPARATOR.join([_format_doc(i, doc) for i, doc in enumerate(docs, start=1)])
 
-    # -----------------------------------------------------------------------
-    # Internal helpers
-    # -----------------------------------------------------------------------
-
-    async def _load_template(
-        self,
-        tenant_id: UUID,
-        db:        AsyncSession,
-    ) -> str:
+    @classmethod
+    def reorder_and_format(cls, docs: list[Document]) -> str:
         """
-        Query the DB for the best active template, with TTL cache.
+        Context string for retrieved documents: reorder_context() then
+        format_context(), for callers that don't need the reordered list.
 
-        Returns the raw template_text string (unparsed).
+        Args:
+            docs: Retrieved documents, best-to-worst relevance order.
         """
-        # 1. Try tenant-specific template
-        tenant_rows = await self._fetch_active(tenant_id, db)
-        if tenant_rows:
-            chosen = _select_variant(tenant_rows)
-            logger.debug(
-                "PromptManager | using tenant template | name=%s version=%d",
-                chosen.name, chosen.version,
-            )
-            return chosen.template_text
+        return cls.format_context(cls.reorder_context(docs))
 
-        # 2. Try global template (tenant_id IS NULL)
-        global_rows = await self._fetch_active(None, db)
-        if global_rows:
-            chosen = _select_variant(global_rows)
-            logger.debug(
-                "PromptManager | using global template | name=%s version=%d",
-                chosen.name, chosen.version,
-            )
-            return chosen.template_text
-
-        # 3. Fallback
-        logger.debug(
-            "PromptManager | no DB template found for name=%s — using hardcoded default",
-            self._name,
-        )
-        return _DEFAULT_SYSTEM_TEMPLATE
+    # -----------------------------------------------------------------------
+    # Internal helpers
+    # -----------------------------------------------------------------------
 
     async def _fetch_active(
         self,
         tenant_id: UUID | None,
         db:        AsyncSession,
-    ) -> list[PromptTemplate]:
+    ) -> tuple[_Variants, _Variants]:
         """
-        Load active template rows for (tenant_id, name) from DB (or cache).
+        Active (tenant, global) template variants for this name from the DB
+        (or cache). Both sets come from one query over the tenant's rows and
+        the global rows together, partitioned here on tenant_id.
         """
-        key = _cache_key(tenant_id, self._name)
-        cached = _cache_get(key)
-        if cached is not None:
-            return cached
-
+        key   = _cache_key(tenant_id, self._name)
+        entry = _PROMPT_CACHE.get(key)
+        if entry is not None and _is_fresh(entry, time.monotonic()):
+            return entry.tenant, entry.shared
+
+        # One coroutine per key revalidates / reloads; the rest wait for it
+        # and then hit the cache instead of repeating the same queries
+        slot = _PROMPT_LOCKS.get(key)
+        if slot is None:
+            slot = _PROMPT_LOCKS[key] = _KeyLock()
+        slot.users += 1
+        try:
+            async with slot.lock:
+                return await self._refresh(tenant_id, key, db)
+        finally:
+            slot.users -= 1
+            if slot.users == 0:
+                del _PROMPT_LOCKS[key]
+
+    async def _refresh(
+        self,
+        tenant_id: UUID | None,
+        key:       str,
+        db:        AsyncSession,
+    ) -> tuple[_Variants, _Variants]:
+        """Revalidate or reload the cache entry for key (caller holds its lock)."""
+        now   = time.monotonic()
+        entry = _PROMPT_CACHE.get(key)
+        if entry is not None and now - entry.loaded_at < _CACHE_MAX_AGE_SECONDS:
+            if _is_fresh(entry, now):
+                return entry.tenant, entry.shared     # filled while we waited
+            fingerprint = await self._fingerprint(tenant_id, db)
+            if fingerprint == entry.fingerprint:
+                entry.checked_at = now
+                return entry.tenant, entry.shared
+        else:
+            fingerprint = await self._fingerprint(tenant_id, db)
+
+        # Fingerprint first: a change landing between the two queries makes
+        # the next revalidation reload again, never keeps stale rows
         stmt = select(PromptTemplate).where(
-            and_(
-                PromptTemplate.name == self._name,
-                PromptTemplate.is_active.is_(True),
-                (
-                    PromptTemplate.tenant_id == tenant_id
-                    if tenant_id is not None
-                    else PromptTemplate.tenant_id.is_(None)
-                ),
-            )
+            and_(self._scope(tenant_id), PromptTemplate.is_active.is_(True))
+        )
+        result      = await db.execute(stmt)
+        tenant_rows: list[PromptTemplate] = []
+        global_rows: list[PromptTemplate] = []
+        for row in result.scalars().all():
+            (global_rows if row.tenant_id is None else tenant_rows).append(row)
+
+        tenant = (tenant_rows, _cumulative_weights(tenant_rows))
+        shared = (global_rows, _cumulative_weights(global_rows))
+        _PROMPT_CACHE[key] = _CacheEntry(now, now, fingerprint, tenant, shared)
+        return tenant, shared
+
+    def _scope(self, tenant_id: UUID | None):
+        """WHERE clause for this prompt name: the tenant's rows plus the global set."""
+        is_global = PromptTemplate.tenant_id.is_(None)
+        return and_(
+            PromptTemplate.name == self._name,
+            or_(PromptTemplate.tenant_id == tenant_id, is_global) if tenant_id is not None else is_global,
         )
+
+    async def _fingerprint(self, tenant_id: UUID | None, db: AsyncSession) -> tuple[Any, ...]:
+        """
+        One aggregate row that changes whenever the selectable variants do:
+        row count and latest updated_at (inserts, deletes, ORM edits) plus
+        the active count and weight total (is_active / ab_weight flips,
+        even by raw SQL that leaves updated_at alone).
+        """
+        active = PromptTemplate.is_active.is_(True)
+        stmt = select(
+            func.count(),
+            func.max(PromptTemplate.updated_at),
+            func.count().filter(active),
+            func.coalesce(func.sum(PromptTemplate.ab_weight).filter(active), 0),
+        ).where(self._scope(tenant_id))
         result = await db.execute(stmt)
-        rows   = list(result.scalars().all())
-        _cache_set(key, rows)
-        return rows
+        return tuple(result.one())
@@ -29,14 +29,31 @@ Graceful degradation:
   If the Cohere API key is absent or the call fails, the reranker returns
   the input documents in their original (RRF-fused) order without raising.
 
+Request coalescing:
+  Cohere scores one query per call, so different users' queries cannot share
+  a request. Identical concurrent calls (same query, candidates and top_n —
+  a popular question arriving from many users at once) do: the first starts
+  the API call and the rest await its result. Completed rankings are also
+  kept in a small TTL'd LRU, so a repeat shortly after skips the call.
+
+Payload:
+  Candidates are clipped to settings.cohere_rerank_max_chars before sending;
+  the returned Documents keep their full page_content for the prompt.
+
 Dependencies:
   pip install cohere>=5.0.0
 """
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
+import importlib.util
 import logging
 import time
+from collections import OrderedDict
+from typing import Any
 
 from langchain_core.documents import Document
 
@@ -45,6 +62,105 @@ from app.core.config import settings
 logger = logging.getLogger(__name__)
 
 
+# ---------------------------------------------------------------------------
+# Shared client
+# ---------------------------------------------------------------------------
+# One cohere.AsyncClient (and so one HTTPX connection pool) per API key,
+# shared by every CohereReranker — a reranker built per request or per
+# tenant reuses warm keep-alive connections instead of new TLS handshakes.
+# The model is a per-call argument, so it is not part of the key.
+#
+# Concurrent calls are not micro-batched: ReRank takes exactly one query per
+# request, so a batcher could only gather separate requests after a debounce
+# delay. With h2 installed (pip install "httpx[http2]") they are multiplexed
+# over one HTTP/2 connection instead — the shared-connection saving without
+# the wait.
+
+_MAX_CONNECTIONS:           int = 100
+_MAX_KEEPALIVE_CONNECTIONS: int = 20
+
+
+@functools.lru_cache(maxsize=8)
+def _get_client(api_key: str) -> Any:
+    """cohere.AsyncClient for api_key, built once. Raises ImportError without cohere."""
+    import cohere  # lazy import — optional dependency
+    import httpx
+
+    http = httpx.AsyncClient(
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(
+            max_connections=_MAX_CONNECTIONS,
+            max_keepalive_connections=_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+    )
+    return cohere.AsyncClient(api_key=api_key, httpx_client=http)
+
+
+# ---------------------------------------------------------------------------
+# Payload trimming
+# ---------------------------------------------------------------------------
+
+def _truncate(texts: list[str], max_chars: int) -> list[str]:
+    """
+    Clip each text to max_chars before it is sent. The cross-encoder only
+    attends to its first ~512 tokens and Cohere drops the rest server-side,
+    so the tail is bytes on the wire (and billed tokens) for nothing.
+    """
+    if max_chars <= 0 or all(len(t) <= max_chars for t in texts):
+        return texts
+    return [t[:max_chars] for t in texts]
+
+
+# ---------------------------------------------------------------------------
+# Result cache
+# ---------------------------------------------------------------------------
+# Rankings of identical calls (retries, A/B prompt variants, the same FAQ
+# from many users) are kept for RERANK_CACHE_TTL_SECONDS, so a repeat skips
+# the ~200 ms Cohere round-trip. The key covers model, query, top_n and the
+# exact texts sent, in order — the ranking holds indices into them — so a
+# hit can only return scores for the candidates the caller supplied.
+# Fallback rankings (scores None) are never cached.
+
+RERANK_CACHE_SIZE:        int = 1024
+RERANK_CACHE_TTL_SECONDS: int = 300
+
+# key → (stored at, ranking), most recently used last
+_rankings: OrderedDict[bytes, tuple[float, list[tuple[int, float | None]]]] = OrderedDict()
+
+
+def _ranking_key(model: str, query: str, texts: list[str], top_n: int) -> bytes:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{model}\0{top_n}\0{query}".encode())
+    for text in texts:
+        h.update(b"\0")
+        h.update(text.encode())
+    return h.digest()
+
+
+def _cached_ranking(key: bytes) -> list[tuple[int, float | None]] | None:
+    hit = _rankings.get(key)
+    if hit is None:
+        return None
+    stored_at, ranking = hit
+    if time.monotonic() - stored_at >= RERANK_CACHE_TTL_SECONDS:
+        del _rankings[key]
+        return None
+    _rankings.move_to_end(key)
+    return ranking
+
+
+def _store_ranking(key: bytes, ranking: list[tuple[int, float | None]]) -> None:
+    _rankings[key] = (time.monotonic(), ranking)
+    _rankings.move_to_end(key)
+    while len(_rankings) > RERANK_CACHE_SIZE:
+        _rankings.popitem(last=False)
+
+
+def clear_rerank_cache() -> None:
+    """Drop every cached ranking."""
+    _rankings.clear()
+
+
 # ---------------------------------------------------------------------------
 # CohereReranker
 # ---------------------------------------------------------------------------
@@ -55,14 +171,15 @@ class CohereReranker:
 
     Usage::
 
-        reranker  = CohereReranker()
+        reranker  = get_reranker()
         final_docs = await reranker.rerank(
             query="What is the refund policy?",
             candidates=top_20_docs,
             top_n=5,
         )
 
-    Thread/async-safe: each .rerank() call is independent.
+    Thread/async-safe: each .rerank() call is independent. Instances with
+    the same API key share one client and connection pool (_get_client).
     """
 
     def __init__(
@@ -71,13 +188,13 @@ class CohereReranker:
         api_key: str | None = None,
     ) -> None:
         self._model   = model
-        self._api_key = api_key or getattr(settings, "cohere_api_key", "")
+        self._api_key = api_key or settings.cohere_api_key
         self._client  = None
+        self._inflight: dict[bytes, asyncio.Future] = {}   # identical calls share one request
 
         if self._api_key:
             try:
-                import cohere  # lazy import — optional dependency
-                self._client = cohere.AsyncClient(api_key=self._api_key)
+                self._client = _get_client(self._api_key)
                 logger.info("CohereReranker initialised | model=%s", model)
             except ImportError:
                 logger.warning(
@@ -115,56 +232,114 @@ class CohereReranker:
             top_n:      Number of top documents to return after reranking.
 
         Returns:
-            Top-n Documents sorted by cross-encoder relevance score
-            (most relevant first).  Each document gains a "rerank_score"
-            and "rerank_original_rank" field in its metadata.
+            Top-n of the candidate Documents sorted by cross-encoder
+            relevance score (most relevant first).  Each returned document's
+            metadata is replaced by a copy with "rerank_score" and
+            "rerank_original_rank" added.
 
         Never raises — falls back to pass-through on any error.
         """
-        if not candidates:
+        ranking = await self.rank(query, [doc.page_content for doc in candidates], top_n)
+        if not ranking or ranking[0][1] is None:
+            return [candidates[index] for index, _ in ranking]
+
+        # Return the candidates themselves in reranked order: no new Document
+        # per result, only a fresh metadata dict (a dict shared with other
+        # holders is left untouched)
+        reranked = []
+        for index, score in ranking:
+            doc = candidates[index]
+            doc.metadata = {
+                **doc.metadata,
+                "rerank_score":         score,
+                "rerank_original_rank": index + 1,
+            }
+            reranked.append(doc)
+        return reranked
+
+    async def rank(
+        self,
+        query: str,
+        texts: list[str],
+        top_n: int = 5,
+    ) -> list[tuple[int, float | None]]:
+        """
+        Cross-encoder ranking of raw texts, for callers that only want to
+        build result objects for the survivors.
+
+        Returns:
+            Up to top_n (index into texts, relevance score) pairs, most
+            relevant first. Scores are None when falling back to input order
+            (Cohere unavailable or failing).
+
+        Never raises.
+        """
+        if not texts:
             return []
 
-        top_n = min(top_n, len(candidates))
+        top_n = min(top_n, len(texts))
+        texts = _truncate(texts, settings.cohere_rerank_max_chars)
 
         # --- Graceful fallback: no Cohere ---
         if not self.available:
             logger.debug("Reranker unavailable — returning candidates in original RRF order")
-            return candidates[:top_n]
+            return [(index, None) for index in range(top_n)]
+
+        key    = _ranking_key(self._model, query, texts, top_n)
+        cached = _cached_ranking(key)
+        if cached is not None:
+            return list(cached)
+
+        call = self._inflight.get(key)
+        if call is None:
+            call = self._inflight[key] = asyncio.ensure_future(self._rank(query, texts, top_n, key))
+            call.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield: a caller that goes away must not cancel the others' request
+        return await asyncio.shield(call)
 
+    async def _rank(
+        self,
+        query: str,
+        texts: list[str],
+        top_n: int,
+        key:   bytes,
+    ) -> list[tuple[int, float | None]]:
+        """One Cohere ReRank call, cached under key; input order on failure."""
         t0 = time.perf_counter()
         try:
             response = await self._client.rerank(   # type: ignore[union-attr]
                 model=self._model,
                 query=query,
-                documents=[doc.page_content for doc in candidates],
+                documents=texts,
                 top_n=top_n,
-                return_documents=False,   # we own the Document objects already
+                return_documents=False,   # the caller owns the documents already
             )
         except Exception as exc:
             logger.warning(
                 "CohereReranker API error — falling back to RRF order: %s",
                 exc, exc_info=True,
             )
-            return candidates[:top_n]
+            return [(index, None) for index in range(top_n)]
 
         elapsed_ms = (time.perf_counter() - t0) * 1000
-
-        # Re-materialise Documents in reranked order
-        reranked: list[Document] = []
-        for result in response.results:
-            original   = candidates[result.index]
-            reranked_doc = Document(
-                page_content=original.page_content,
-                metadata={
-                    **original.metadata,
-                    "rerank_score":         result.relevance_score,
-                    "rerank_original_rank": result.index + 1,
-                },
-            )
-            reranked.append(reranked_doc)
-
         logger.info(
             "CohereReranker | model=%s candidates=%d top_n=%d elapsed_ms=%.1f",
-            self._model, len(candidates), top_n, elapsed_ms,
+            self._model, len(texts), top_n, elapsed_ms,
         )
-        return reranked
+        ranking = [(result.index, result.relevance_score) for result in response.results]
+        _store_ranking(key, ranking)
+        return ranking
+
+
+# ---------------------------------------------------------------------------
+# Process-wide instance
+# ---------------------------------------------------------------------------
+
+@functools.cache
+def get_reranker(model: str | None = None) -> CohereReranker:
+    """
+    The shared CohereReranker for model (default settings.cohere_rerank_model),
+    built on first use. Sharing one instance also shares its in-flight
+    coalescing across every retriever and endpoint.
+    """
+    return CohereReranker(model=model or settings.cohere_rerank_model)
@@ -11,8 +11,11 @@ ONLY return chunks from the authenticated tenant's namespace/collection.
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any
+import threading
+from collections.abc import Coroutine
+from typing import Any, TypeVar
 from uuid import UUID
 
 from langchain_core.callbacks import CallbackManagerForRetrieverRun
@@ -23,6 +26,41 @@ from app.vectorstore.base import VectorStoreBase
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+
+# ---------------------------------------------------------------------------
+# Sync bridge
+# ---------------------------------------------------------------------------
+# With no loop running, asyncio.run() is all we need. Inside a running loop
+# (LangChain's sync path called from async code) neither asyncio.run() nor
+# run_until_complete() is allowed, so the coroutine goes to one long-lived
+# background loop — started on first use, then shared by every call.
+
+_background_loop: asyncio.AbstractEventLoop | None = None
+_background_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    global _background_loop
+    with _background_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="retriever-sync-bridge", daemon=True,
+            ).start()
+            _background_loop = loop
+    return _background_loop
+
+
+def _run_sync(coro: Coroutine[Any, Any, _T]) -> _T:
+    """Run coro to completion from synchronous code, with or without a running loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    return asyncio.run_coroutine_threadsafe(coro, _get_background_loop()).result()
+
 
 class TenantScopedRetriever(BaseRetriever):
     """
@@ -51,8 +89,7 @@ class TenantScopedRetriever(BaseRetriever):
         metadata_filter: dict | None = None,
     ) -> list[Document]:
         """Sync entrypoint (LangChain calls this in non-async contexts)."""
-        import asyncio
-        return asyncio.get_event_loop().run_until_complete(
+        return _run_sync(
             self._aget_relevant_documents(
                 query_vector,
                 run_manager=run_manager,
@@ -69,29 +106,30 @@ class TenantScopedRetriever(BaseRetriever):
     ) -> list[Document]:
         """
         Async entrypoint — used by FastAPI streaming endpoints.
-        Queries the tenant vector store, filters by score, returns LangChain Documents.
+        Queries the tenant vector store (which applies score_threshold),
+        returns LangChain Documents.
         """
         results = await self.vector_store.query(
             vector=query_vector,
             top_k=self.top_k,
             filter=metadata_filter,
+            score_threshold=self.score_threshold,   # filtered by the store
         )
 
-        docs = []
-        for result in results:
-            if result.score < self.score_threshold:
-                continue
-            docs.append(Document(
+        docs = [
+            Document(
                 page_content=result.text,
                 metadata={
                     **result.metadata,
                     "score":    result.score,
                     "chunk_id": result.id,
                 },
-            ))
+            )
+            for result in results
+        ]
 
         logger.debug(
-            "Retriever | tenant=%s query_results=%d above_threshold=%d",
-            self.vector_store.tenant_id, len(results), len(docs),
+            "Retriever | tenant=%s results=%d score_threshold=%.3f",
+            self.vector_store.tenant_id, len(docs), self.score_threshold,
         )
         return docs
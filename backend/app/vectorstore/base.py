@@ -16,6 +16,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+from typing import Sequence
 from uuid import UUID
 
 
@@ -27,7 +28,7 @@ from uuid import UUID
 class VectorRecord:
     """A single embedding record to upsert into the vector store."""
     id:        str              # deterministic: sha256(tenant_id + chunk_id)
-    vector:    list[float]      # embedding from OpenAI / Llama / Mistral
+    vector:    Sequence[float]  # embedding from OpenAI / Llama / Mistral (list or float32 ndarray)
     metadata:  dict             # filterable payload stored alongside the vector
     # Required fields inside metadata (enforced at upsert time):
     # - tenant_id: str
@@ -37,13 +38,14 @@ class VectorRecord:
     # - source_key: str         (S3 key of the originating document)
 
 
-@dataclass
+@dataclass(slots=True)
 class QueryResult:
     """One result returned from a similarity search."""
     id:         str
     score:      float           # cosine similarity (0–1 for normalized vectors)
     metadata:   dict
     text:       str = field(default="")   # convenience alias for metadata["text"]
+    rrf_score:  float = 0.0     # set by HybridRetriever's Reciprocal Rank Fusion
 
     def __post_init__(self) -> None:
         if not self.text and "text" in self.metadata:
@@ -60,8 +62,15 @@ class VectorStoreBase(ABC):
 
     Each instance is bound to a single tenant_id at construction time.
     There is no method to query across tenants — that operation does not exist.
+
+    filter_is_enforced: set True only on a backend whose query() provably
+    applies the caller's document_permissions filter with the retriever's
+    semantics (a shared role, or no restriction, passes). The retriever
+    then skips its own defence-in-depth permission pass.
     """
 
+    filter_is_enforced: bool = False
+
     def __init__(self, tenant_id: UUID) -> None:
         self._tenant_id = tenant_id
 
@@ -89,13 +98,17 @@ class VectorStoreBase(ABC):
     @abstractmethod
     async def query(
         self,
-        vector: list[float],
+        vector: Sequence[float],
         top_k: int = 5,
         filter: dict | None = None,
+        score_threshold: float = 0.0,
     ) -> list[QueryResult]:
         """
         Nearest-neighbour search within the tenant's namespace ONLY.
+        `vector` may be a list or a float32 ndarray (what retrieval passes).
         `filter` applies additional metadata filters on top of the namespace scope.
+        Only results with score >= `score_threshold` are returned — pushed down
+        to the backend where it supports a similarity cut-off.
         """
 
     @abstractmethod
@@ -22,8 +22,10 @@ from __future__ import annotations
 
 import hashlib
 import logging
+from typing import Sequence
 from uuid import UUID
 
+import numpy as np
 from pinecone import Pinecone, ServerlessSpec
 from pinecone.core.client.exceptions import PineconeException
 
@@ -42,6 +44,10 @@ class PineconeVectorStore(VectorStoreBase):
     be changed after instantiation.
     """
 
+    # Not enforced: a bare role list is not a Pinecone filter expression, and
+    # $in would also drop chunks that have no document_permissions at all.
+    filter_is_enforced = False
+
     def __init__(self, tenant_id: UUID) -> None:
         super().__init__(tenant_id)
         self._pc    = Pinecone(api_key=settings.pinecone_api_key)
@@ -119,15 +125,20 @@ class PineconeVectorStore(VectorStoreBase):
 
     async def query(
         self,
-        vector: list[float],
+        vector: Sequence[float],
         top_k: int = 5,
         filter: dict | None = None,
+        score_threshold: float = 0.0,
     ) -> list[QueryResult]:
         """
         Similarity search scoped to tenant namespace + metadata filter.
         top_k is capped at 100 (Pinecone limit for metadata-filtered queries).
+        Pinecone has no similarity cut-off, so score_threshold is applied to
+        the matches here, before any QueryResult is built.
         """
         top_k = min(top_k, 100)
+        if isinstance(vector, np.ndarray):
+            vector = vector.tolist()    # query request model validates a list of floats
 
         resp = self._index.query(
             vector=vector,
@@ -140,6 +151,8 @@ class PineconeVectorStore(VectorStoreBase):
 
         results = []
         for match in resp.get("matches", []):
+            if match["score"] < score_threshold:
+                continue
             meta = match.get("metadata", {})
             results.append(QueryResult(
                 id=match["id"],
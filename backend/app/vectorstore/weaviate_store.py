@@ -19,6 +19,7 @@ Isolation model:
 from __future__ import annotations
 
 import logging
+from typing import Sequence
 from uuid import UUID
 
 import weaviate
@@ -43,6 +44,10 @@ class WeaviateVectorStore(VectorStoreBase):
     from the tenant_id at construction and cannot be changed.
     """
 
+    # Not enforced: document_permissions is not a collection property, and
+    # _build_filter() only emits equality clauses.
+    filter_is_enforced = False
+
     def __init__(self, tenant_id: UUID, client: weaviate.WeaviateClient) -> None:
         super().__init__(tenant_id)
         self._client = client
@@ -156,14 +161,16 @@ class WeaviateVectorStore(VectorStoreBase):
 
     async def query(
         self,
-        vector: list[float],
+        vector: Sequence[float],
         top_k: int = 5,
         filter: dict | None = None,
+        score_threshold: float = 0.0,
     ) -> list[QueryResult]:
         """
         Near-vector search within the tenant's collection.
         The collection itself is the isolation boundary.
-        Additional metadata filters are applied on top.
+        Additional metadata filters are applied on top, and score_threshold
+        becomes a server-side max distance (score = 1 - distance).
         """
         collection = self._collection()
 
@@ -176,6 +183,7 @@ class WeaviateVectorStore(VectorStoreBase):
             return_metadata=MetadataQuery(distance=True, score=True),
             return_properties=["tenant_id", "document_id", "chunk_index", "text", "source_key"],
             filters=wv_filter,
+            distance=1.0 - score_threshold if score_threshold > 0 else None,
         )
 
         results = []
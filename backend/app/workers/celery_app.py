@@ -19,9 +19,24 @@ from __future__ import annotations
 import logging
 import os
 
-from celery import Celery
-from celery.signals import after_setup_logger, task_failure, task_postrun, task_prerun
-from kombu import Exchange, Queue
+# One BLAS/OpenMP thread per worker process: Celery already runs a process
+# per core, so native thread pools (numpy, spaCy) would only oversubscribe.
+# Set here — the worker's entrypoint module — because the pools size
+# themselves when numpy is first imported. setdefault keeps any explicit
+# deployment override.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("MKL_NUM_THREADS", "1")
+
+from celery import Celery  # noqa: E402 — after the thread limits above
+from celery.signals import (  # noqa: E402
+    after_setup_logger,
+    task_failure,
+    task_postrun,
+    task_prerun,
+    worker_init,
+    worker_process_init,
+)
+from kombu import Exchange, Queue  # noqa: E402
 
 logger = logging.getLogger(__name__)
 
@@ -169,3 +184,24 @@ def on_task_failure(task_id, exception, args, kwargs, traceback, einfo, **_):
         task_id, kwargs.get("document_id", "?"), exception,
         exc_info=True,
     )
+
+
+# ---------------------------------------------------------------------------
+# Celery signals — extraction warm-up and telemetry
+# ---------------------------------------------------------------------------
+
+@worker_init.connect
+def on_worker_init(**_):
+    # Parent process, before the prefork pool starts: imports only
+    from app.processing.extractor import preload_extractors
+    preload_extractors()
+
+
+@worker_process_init.connect
+def on_worker_process_init(**_):
+    # Each child process: clients, connections and exporter threads that
+    # can't cross a fork (OTEL metrics are pushed from a background thread)
+    from app.observability.tracing import TracingConfig
+    from app.processing.extractor import warm_up_extractors
+    TracingConfig.init()
+    warm_up_extractors()
@@ -50,6 +50,8 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
+import tempfile
 import time
 import uuid
 from typing import Any
@@ -172,6 +174,30 @@ async def _run_pipeline(
     tenant_uuid: UUID,
     s3_key:      str,
     content_type: str,
+) -> dict:
+    """
+    Async pipeline — owns the embedding pipeline (and its HTTP connection
+    pool) for the whole task, so the connection can be warmed up while the
+    document is still being downloaded and extracted.
+    """
+    from app.processing.embeddings import create_embedding_pipeline
+
+    embedder = create_embedding_pipeline(tenant_uuid)
+    try:
+        return await _run_pipeline_steps(
+            task_id, doc_uuid, tenant_uuid, s3_key, content_type, embedder,
+        )
+    finally:
+        await embedder.aclose()
+
+
+async def _run_pipeline_steps(
+    task_id:     str,
+    doc_uuid:    UUID,
+    tenant_uuid: UUID,
+    s3_key:      str,
+    content_type: str,
+    embedder,    # EmbeddingPipeline — closed by _run_pipeline
 ) -> dict:
     """
     Async pipeline — all I/O-bound steps use await.
@@ -180,10 +206,9 @@ async def _run_pipeline(
     from app.db.session import AsyncSessionLocal, _set_tenant_context
     from app.models.documents import AuditLog, Chunk, Document
     from app.processing.extractor import TextExtractorOrchestrator
+    from app.processing.extraction_cache import get_extraction_cache
     from app.processing.chunking import SemanticChunker
-    from app.processing.embeddings import run_embedding_pipeline
     from app.vectorstore.factory import get_vector_store
-    from app.vectorstore.base import VectorRecord
     from app.core.config import settings
 
     # Timing buckets (all in milliseconds)
@@ -213,9 +238,13 @@ async def _run_pipeline(
             await db.flush()
             logger.info("Status → processing | doc=%s", doc_uuid)
 
-            # ── Step 3: Download from S3 ──────────────────────────────────
+            # ── Step 3: Download from S3 (spooled to a temp file) ─────────
+            # The extractors open the file by path, so the document is never
+            # held in the worker's heap; it is deleted once text is extracted.
+            # The OpenAI TLS handshake runs meanwhile, off the embedding path.
+            embedder.warm_up()
             t = time.monotonic()
-            pdf_bytes = await _download_from_s3(
+            pdf_path, size_bytes = await _download_from_s3(
                 s3_key=s3_key,
                 bucket=settings.s3_bucket,
                 tenant_id=tenant_uuid,
@@ -223,7 +252,7 @@ async def _run_pipeline(
             timings["s3_ms"] = (time.monotonic() - t) * 1000
             logger.info(
                 "S3 download | doc=%s size_bytes=%d ms=%.0f",
-                doc_uuid, len(pdf_bytes), timings["s3_ms"],
+                doc_uuid, size_bytes, timings["s3_ms"],
             )
 
             # ── Step 4: Text extraction (OCR cascade) ─────────────────────
@@ -231,8 +260,13 @@ async def _run_pipeline(
             extractor = TextExtractorOrchestrator(
                 s3_bucket=settings.s3_bucket,
                 s3_key=s3_key,
+                cache=get_extraction_cache(tenant_uuid),
             )
-            extraction = await extractor.extract(pdf_bytes)
+            try:
+                extraction = await extractor.extract(pdf_path)
+            finally:
+                os.unlink(pdf_path)
+                await extractor.aclose()
             timings["ocr_ms"] = (time.monotonic() - t) * 1000
 
             logger.info(
@@ -243,7 +277,7 @@ async def _run_pipeline(
                 extraction.avg_confidence, timings["ocr_ms"],
             )
 
-            if not extraction.full_text.strip():
+            if not extraction.full_text or extraction.full_text.isspace():
                 await _mark_failed(db, doc_uuid, tenant_uuid, "No text extracted")
                 return {"error": "empty_extraction"}
 
@@ -275,40 +309,49 @@ async def _run_pipeline(
                 await _mark_failed(db, doc_uuid, tenant_uuid, "No chunks produced")
                 return {"error": "empty_chunks"}
 
-            # ── Step 6: Batch embedding with retry ────────────────────────
+            # ── Steps 6–7: Batch embedding → vector upsert, streamed ──────
+            # Each embedding batch is upserted as soon as it finishes and then
+            # dropped, so peak memory holds the batches in flight rather than
+            # every vector in the document. Embedding continues concurrently
+            # while a batch is being upserted.
             t = time.monotonic()
-            emb = await run_embedding_pipeline(chunks=chunks, tenant_id=tenant_uuid)
-            timings["embed_ms"] = (time.monotonic() - t) * 1000
+            vector_store = get_vector_store(tenant_id=tenant_uuid)
 
-            logger.info(
-                "Embedding | doc=%s vectors=%d failed_chunks=%d tokens=%d ms=%.0f",
-                doc_uuid, len(emb.vector_records),
-                len(emb.failed_chunks), emb.total_tokens, timings["embed_ms"],
-            )
+            upserted      = 0
+            total_tokens  = 0
+            failed_chunks: list[int] = []
+            timings["vec_ms"] = 0.0
 
-            if not emb.vector_records:
-                await _mark_failed(db, doc_uuid, tenant_uuid, "All embedding batches failed")
-                return {"error": "embedding_failed"}
+            async for batch in embedder.iter_embed_chunks(chunks):
+                failed_chunks.extend(batch.failed_chunks)
+                total_tokens += batch.tokens
+                if not batch.vector_records:
+                    continue
 
-            # ── Step 7: Vector upsert (tenant-isolated namespace) ─────────
-            t = time.monotonic()
-            vector_store = get_vector_store(tenant_id=tenant_uuid)
+                t_vec = time.monotonic()
+                upserted += await vector_store.upsert(
+                    records=batch.vector_records.to_records(), batch_size=100
+                )
+                timings["vec_ms"] += (time.monotonic() - t_vec) * 1000
 
-            vrecords = [
-                VectorRecord(id=r["id"], vector=r["vector"], metadata=r["metadata"])
-                for r in emb.vector_records
-            ]
-            upserted = await vector_store.upsert(records=vrecords, batch_size=100)
-            timings["vec_ms"] = (time.monotonic() - t) * 1000
+            timings["embed_ms"] = (time.monotonic() - t) * 1000 - timings["vec_ms"]
 
+            logger.info(
+                "Embedding | doc=%s vectors=%d failed_chunks=%d tokens=%d ms=%.0f",
+                doc_uuid, upserted, len(failed_chunks), total_tokens, timings["embed_ms"],
+            )
             logger.info(
                 "Vector upsert | doc=%s namespace=%s count=%d ms=%.0f",
                 doc_uuid, vector_store._namespace(), upserted, timings["vec_ms"],
             )
 
+            if not upserted:
+                await _mark_failed(db, doc_uuid, tenant_uuid, "All embedding batches failed")
+                return {"error": "embedding_failed"}
+
             # ── Step 8: Persist chunk rows ────────────────────────────────
             t = time.monotonic()
-            failed_set = set(emb.failed_chunks)
+            failed_set = set(failed_chunks)
             chunk_rows = [
                 Chunk(
                     id=_chunk_uuid(c.chunk_id),
@@ -351,7 +394,7 @@ async def _run_pipeline(
                     "task_id":       task_id,
                     "chunk_count":   len(chunk_rows),
                     "vector_count":  upserted,
-                    "total_tokens":  emb.total_tokens,
+                    "total_tokens":  total_tokens,
                     "strategy_used": extraction.strategy_used,
                     "used_ocr":      extraction.used_ocr,
                     "page_count":    extraction.page_count,
@@ -366,7 +409,7 @@ async def _run_pipeline(
         "tenant_id":     str(tenant_uuid),
         "chunk_count":   len(chunk_rows),
         "vector_count":  upserted,
-        "total_tokens":  emb.total_tokens,
+        "total_tokens":  total_tokens,
         "strategy_used": extraction.strategy_used,
         "used_ocr":      extraction.used_ocr,
         "page_count":    extraction.page_count,
@@ -378,9 +421,14 @@ async def _run_pipeline(
 # S3 download
 # ---------------------------------------------------------------------------
 
-async def _download_from_s3(s3_key: str, bucket: str, tenant_id: UUID) -> bytes:
+_DOWNLOAD_CHUNK_BYTES = 1024 * 1024   # S3 body read size when spooling to disk
+
+
+async def _download_from_s3(s3_key: str, bucket: str, tenant_id: UUID) -> tuple[str, int]:
     """
-    Download document bytes from S3 with tenant prefix validation.
+    Stream a document from S3 into a temporary file, with tenant prefix
+    validation. Returns (path, size_bytes); the caller deletes the file.
+
     The prefix check is defence-in-depth: the key was server-constructed
     at upload time, but we verify again here to prevent injection.
     """
@@ -394,9 +442,21 @@ async def _download_from_s3(s3_key: str, bucket: str, tenant_id: UUID) -> bytes:
     import aioboto3
     from app.core.config import settings
 
-    async with aioboto3.Session().client("s3", region_name=settings.aws_region) as s3:
-        resp = await s3.get_object(Bucket=bucket, Key=s3_key)
-        return await resp["Body"].read()
+    suffix = os.path.splitext(s3_key)[1]
+    fd, path = tempfile.mkstemp(prefix="rag-doc-", suffix=suffix)
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            async with aioboto3.Session().client("s3", region_name=settings.aws_region) as s3:
+                resp = await s3.get_object(Bucket=bucket, Key=s3_key)
+                body = resp["Body"]
+                while chunk := await body.read(_DOWNLOAD_CHUNK_BYTES):
+                    out.write(chunk)
+                    size += len(chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path, size
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,303 @@
+"""
+Unit Tests — TenantBM25Index
+═════════════════════════════
+Tests for the numpy BM25Okapi index in app/rag/bm25.py.
+
+All tests:
+  • Build small in-memory corpora — no vector store, no network
+  • Compare against rank_bm25 only when it is installed (reference scorer)
+
+Coverage targets:
+  ✅ Tokeniser      → lowercase, punctuation (except "-") dropped, stopwords, non-ASCII kept
+  ✅ Parity         → scores and ranking identical to rank_bm25.BM25Okapi
+  ✅ Ties           → equal scores keep corpus order
+  ✅ Unknown terms  → contribute nothing; all-unknown query scores zero
+  ✅ top_k          → capped at corpus size; ranks start at 1
+  ✅ Partial select → argpartition top-k equals a full stable sort, ties included
+  ✅ Empty corpus   → ValueError
+  ✅ Token cache    → repeated chunks tokenised once; changed text re-tokenised
+  ✅ Term table     → reset past TERM_TABLE_MAX; live indexes keep their own table
+  ✅ Serialisation  → to_bytes/from_bytes round trip scores identically; size mismatch rejected
+  ✅ Index cache    → second build served from Redis; keys tenant- and text-scoped; errors → build
+  ✅ Local LRU      → repeats skip the build; rebound to the caller's results; evicts; invalidates
+"""
+
+from __future__ import annotations
+
+import random
+import uuid
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from app.rag import bm25 as bm25_mod
+from app.rag.bm25 import TenantBM25Index, _tokenize, _top_k, clear_token_cache
+from app.rag import bm25_cache
+from app.rag.bm25_cache import BM25IndexCache, get_bm25_index, invalidate_tenant
+from app.vectorstore.base import QueryResult
+
+
+def _corpus(texts: list[str]) -> list[QueryResult]:
+    return [QueryResult(id=f"d{i}", score=0.0, metadata={}, text=t) for i, t in enumerate(texts)]
+
+
+@pytest.mark.unit
+class TestTokenize:
+
+    @pytest.mark.parametrize("text,expected", [
+        ("Refund the SN-48291 order!",        ["refund", "sn-48291", "order"]),
+        ("Customer's (annual) plan: #882.",    ["customers", "annual", "plan", "882"]),
+        ("Straße café — naïve résumé, 日本語。", ["straße", "café", "—", "naïve", "résumé", "日本語。"]),
+        ("the and of",                         ["<empty>"]),
+        ("",                                   ["<empty>"]),
+    ])
+    def test_tokens(self, text, expected):
+        assert _tokenize(text) == expected
+
+
+@pytest.mark.unit
+class TestTenantBM25Index:
+
+    def test_matches_rank_bm25_reference(self):
+        rank_bm25 = pytest.importorskip("rank_bm25")
+        rng   = random.Random(7)
+        words = [f"term{k}" for k in range(40)]
+
+        for _ in range(50):
+            texts = [" ".join(rng.choices(words, k=rng.randint(1, 30))) for _ in range(rng.randint(1, 20))]
+            query = " ".join(rng.choices(words + ["missing"], k=rng.randint(1, 4)))
+
+            hits = TenantBM25Index.build(_corpus(texts)).search(query, top_k=len(texts))
+            ref  = rank_bm25.BM25Okapi([_tokenize(t) for t in texts]).get_scores(_tokenize(query))
+            expected = sorted(range(len(texts)), key=lambda j: -ref[j])
+
+            assert [h.query_result.id for h in hits] == [f"d{j}" for j in expected]
+            assert [h.bm25_score for h in hits] == [ref[j] for j in expected]
+
+    def test_ranks_documents_containing_query_terms_first(self):
+        index = TenantBM25Index.build(_corpus([
+            "quarterly revenue report",
+            "refund policy for annual plans",
+            "employee onboarding checklist",
+        ]))
+        hits = index.search("refund policy")
+        assert hits[0].query_result.id == "d1"
+        assert hits[0].bm25_score > 0
+
+    def test_ties_keep_corpus_order(self):
+        index = TenantBM25Index.build(_corpus(["alpha beta", "gamma delta", "epsilon zeta"]))
+        hits  = index.search("unrelated")
+        assert [h.query_result.id for h in hits] == ["d0", "d1", "d2"]
+        assert all(h.bm25_score == 0.0 for h in hits)
+
+    def test_top_k_is_capped_at_corpus_size(self):
+        index = TenantBM25Index.build(_corpus(["one doc", "two doc", "three doc"]))
+        assert [h.rank for h in index.search("doc", top_k=10)] == [1, 2, 3]
+        assert len(index.search("doc", top_k=2)) == 2
+
+    def test_empty_corpus_raises(self):
+        with pytest.raises(ValueError):
+            TenantBM25Index.build([])
+
+
+@pytest.mark.unit
+class TestTokenCache:
+
+    @pytest.fixture(autouse=True)
+    def _empty_cache(self):
+        clear_token_cache()
+        yield
+        clear_token_cache()
+
+    def test_repeated_candidates_are_tokenised_once(self):
+        with patch("app.rag.bm25._tokenize", wraps=_tokenize) as tokenize:
+            TenantBM25Index.build(_corpus(["alpha beta", "gamma delta"]))
+            TenantBM25Index.build(_corpus(["alpha beta", "gamma delta"]))
+        assert tokenize.call_count == 2
+
+    def test_changed_text_is_retokenised(self):
+        """Same chunk id, new text (re-ingested document) must not reuse old tokens."""
+        TenantBM25Index.build(_corpus(["alpha beta"]))
+        with patch("app.rag.bm25._tokenize", wraps=_tokenize) as tokenize:
+            TenantBM25Index.build(_corpus(["gamma delta"]))
+        tokenize.assert_called_once_with("gamma delta")
+
+    def test_term_table_is_reset_past_its_cap(self, monkeypatch):
+        monkeypatch.setattr("app.rag.bm25.TERM_TABLE_MAX", 3)
+        old = TenantBM25Index.build(_corpus(["alpha beta", "alpha epsilon", "gamma"]))
+
+        new = TenantBM25Index.build(_corpus(["zeta", "theta alpha", "eta"]))
+
+        assert bm25_mod._term_table is not old._term_table
+        assert len(bm25_mod._term_table) == 4
+        assert [h.query_result.id for h in old.search("epsilon")][0] == "d1"
+        assert [h.query_result.id for h in new.search("theta")][0] == "d1"
+
+
+@pytest.mark.unit
+class TestSerialisation:
+
+    def test_round_trip_scores_identically(self):
+        rng    = random.Random(11)
+        words  = [f"term{k}" for k in range(60)] + ["café", "sn-48291"]
+        corpus = _corpus([" ".join(rng.choices(words, k=rng.randint(1, 40))) for _ in range(25)])
+        built  = TenantBM25Index.build(corpus)
+
+        loaded = TenantBM25Index.from_bytes(corpus, built.to_bytes())
+
+        for query in ["term1 term2", "café sn-48291 term7", "missing", "term3 term3"]:
+            expected = [(h.query_result.id, h.bm25_score) for h in built.search(query, top_k=25)]
+            assert [(h.query_result.id, h.bm25_score) for h in loaded.search(query, top_k=25)] == expected
+        assert loaded.to_bytes() == built.to_bytes()
+
+    def test_other_corpus_size_is_rejected(self):
+        raw = TenantBM25Index.build(_corpus(["alpha", "beta"])).to_bytes()
+        with pytest.raises(ValueError):
+            TenantBM25Index.from_bytes(_corpus(["alpha"]), raw)
+        with pytest.raises(ValueError):
+            TenantBM25Index.from_bytes(_corpus(["alpha", "beta"]), raw[:-8])
+
+
+class _FakeRedis:
+    def __init__(self, fail: bool = False):
+        self.store: dict[str, bytes] = {}
+        self._fail = fail
+
+    async def get(self, key):
+        if self._fail:
+            raise ConnectionError("redis down")
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        if self._fail:
+            raise ConnectionError("redis down")
+        self.store[key] = value
+
+
+TENANT_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+
+
+@pytest.mark.unit
+class TestBM25IndexCache:
+
+    @pytest.fixture
+    def redis(self):
+        redis = _FakeRedis()
+        with patch("app.rag.bm25_cache._get_client", return_value=redis):
+            yield redis
+
+    @staticmethod
+    def _cache(tenant: uuid.UUID = TENANT_ID) -> BM25IndexCache:
+        return BM25IndexCache("redis://unused", tenant_id=tenant, ttl_seconds=60)
+
+    async def test_second_build_is_served_from_cache(self, redis):
+        corpus = _corpus(["refund policy", "quarterly revenue", "onboarding"])
+        first  = await self._cache().build(corpus)
+
+        with patch.object(TenantBM25Index, "build") as build:
+            second = await self._cache().build(corpus)
+
+        build.assert_not_called()
+        assert [h.query_result.id for h in second.search("refund")] == [h.query_result.id for h in first.search("refund")]
+
+    async def test_keys_are_tenant_and_text_scoped(self, redis):
+        await self._cache().build(_corpus(["alpha", "beta"]))
+        await self._cache(uuid.uuid4()).build(_corpus(["alpha", "beta"]))
+        await self._cache().build(_corpus(["alpha", "gamma"]))      # re-ingested d1
+
+        assert len(redis.store) == 3
+        assert sum(key.startswith(f"bm25:{TENANT_ID}:") for key in redis.store) == 2
+
+    async def test_redis_errors_fall_back_to_build(self):
+        with patch("app.rag.bm25_cache._get_client", return_value=_FakeRedis(fail=True)):
+            index = await self._cache().build(_corpus(["refund policy", "revenue", "onboarding"]))
+        assert index.search("refund")[0].query_result.id == "d0"
+
+    async def test_corrupt_entry_is_rebuilt(self, redis):
+        corpus = _corpus(["refund policy", "revenue", "onboarding"])
+        await self._cache().build(corpus)
+        (key,) = redis.store
+        redis.store[key] = b"garbage"
+
+        index = await self._cache().build(corpus)
+
+        assert index.search("refund")[0].query_result.id == "d0"
+        assert redis.store[key] != b"garbage"
+
+
+@pytest.mark.unit
+class TestLocalIndexCache:
+
+    @pytest.fixture(autouse=True)
+    def _empty_lru(self):
+        bm25_cache._local.clear()
+        yield
+        bm25_cache._local.clear()
+
+    async def test_repeated_candidates_skip_the_build(self):
+        await get_bm25_index(TENANT_ID, _corpus(["refund policy", "revenue", "onboarding"]))
+
+        with patch.object(TenantBM25Index, "build") as build:
+            index = await get_bm25_index(TENANT_ID, _corpus(["refund policy", "revenue", "onboarding"]))
+
+        build.assert_not_called()
+        assert index.search("refund")[0].query_result.id == "d0"
+
+    async def test_hits_return_the_callers_query_results(self):
+        await get_bm25_index(TENANT_ID, _corpus(["refund policy", "revenue"]))
+        corpus = _corpus(["refund policy", "revenue"])
+        corpus[0].metadata["document_permissions"] = ["admin"]
+
+        index = await get_bm25_index(TENANT_ID, corpus)
+
+        assert index.search("refund")[0].query_result is corpus[0]
+
+    async def test_keys_are_tenant_and_text_scoped(self):
+        await get_bm25_index(TENANT_ID, _corpus(["alpha", "beta"]))
+        await get_bm25_index(uuid.uuid4(), _corpus(["alpha", "beta"]))
+        await get_bm25_index(TENANT_ID, _corpus(["alpha", "gamma"]))
+        assert len(bm25_cache._local) == 3
+
+    async def test_least_recently_used_is_evicted(self, monkeypatch):
+        monkeypatch.setattr(bm25_cache, "LOCAL_CACHE_SIZE", 2)
+        first = _corpus(["alpha"])
+        await get_bm25_index(TENANT_ID, first)
+        await get_bm25_index(TENANT_ID, _corpus(["beta"]))
+        await get_bm25_index(TENANT_ID, first)              # refresh
+        await get_bm25_index(TENANT_ID, _corpus(["gamma"]))
+
+        with patch.object(TenantBM25Index, "build", wraps=TenantBM25Index.build) as build:
+            await get_bm25_index(TENANT_ID, first)
+            await get_bm25_index(TENANT_ID, _corpus(["beta"]))
+        assert build.call_count == 1
+
+    async def test_miss_goes_through_the_shared_cache(self):
+        shared = _FakeRedis()
+        with patch("app.rag.bm25_cache._get_client", return_value=shared):
+            await get_bm25_index(TENANT_ID, _corpus(["alpha", "beta"]), BM25IndexCache("redis://unused", TENANT_ID, 60))
+        assert len(shared.store) == 1
+
+    async def test_invalidate_drops_only_that_tenant(self):
+        other = uuid.uuid4()
+        await get_bm25_index(TENANT_ID, _corpus(["alpha"]))
+        await get_bm25_index(other, _corpus(["alpha"]))
+
+        invalidate_tenant(TENANT_ID)
+
+        assert [k[0] for k in bm25_cache._local] == [str(other)]
+
+
+@pytest.mark.unit
+class TestTopK:
+
+    def test_matches_full_stable_sort(self):
+        rng = np.random.default_rng(3)
+        for _ in range(200):
+            scores = rng.integers(0, 4, size=rng.integers(1, 50)).astype(float)   # many ties
+            for k in range(len(scores) + 1):
+                assert _top_k(scores, k).tolist() == np.argsort(-scores, kind="stable")[:k].tolist()
+
+    def test_boundary_ties_keep_earliest_documents(self):
+        scores = np.array([0.0, 2.0, 1.0, 1.0, 3.0, 1.0])
+        assert _top_k(scores, 3).tolist() == [4, 1, 2]
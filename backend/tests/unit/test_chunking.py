@@ -0,0 +1,299 @@
+"""
+Unit Tests — SemanticChunker
+═════════════════════════════
+Tests for the NLP-based chunker in app/processing/chunking.py.
+
+All tests:
+  • Run without spaCy models installed (regex sentence fallback)
+  • Never touch the network, the DB, or the vector store
+
+Coverage targets:
+  ✅ Empty text      → no chunks
+  ✅ Chunk ordering  → chunk_index 0, 1, 2, … in document order
+  ✅ Page tracking   → chunks map to the page they start on
+  ✅ Repeated text   → boilerplate repeated across pages maps to the right page
+  ✅ Short pieces    → merged with neighbours up to MIN_CHUNK_CHARS
+  ✅ Hard splits     → overlap only when cut mid-sentence
+  ✅ spaCy bypass    → oversized paragraphs go straight to the regex splitter
+  ✅ Chunk offsets   → hard-split windows map back to source offsets
+  ✅ Chunk IDs       → unchanged sha256(tenant:doc:index)[:32] scheme
+  ✅ Batch API       → one result list per document, in input order
+  ✅ Metadata        → extra_meta stored once; flat dict built on demand
+  ✅ Headings        → markdown / ALL CAPS / numbered / keyword lines only
+  ✅ Page lookup     → offsets on / between / before page boundaries
+  ✅ Normalisation   → NBSP/zero-width chars, CRLF, trailing spaces, blank runs
+  ✅ spaCy singleton → concurrent cold calls load the model once; a missing model is cached
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.processing import chunking
+from app.processing.chunking import _get_nlp as _real_get_nlp   # before the autouse patch
+from app.processing.chunking import (
+    MAX_CHUNK_CHARS,
+    MIN_CHUNK_CHARS,
+    OVERLAP_CHARS,
+    SPACY_MAX_CHARS,
+    SemanticChunker,
+    _is_heading,
+    _lookup_page,
+    _normalize_text,
+    build_page_map,
+)
+
+
+TENANT_ID = uuid.UUID("3fa85f64-5717-4562-b3fc-2c963f66afa6")
+
+
+@pytest.fixture(autouse=True)
+def _regex_sentence_splitter():
+    """Pin the regex fallback so results don't depend on the installed spaCy model."""
+    with patch("app.processing.chunking._get_nlp", return_value=None):
+        yield
+
+
+def _chunk(text: str, page_map: dict[int, int] | None = None, extra_meta: dict | None = None):
+    return SemanticChunker().chunk(
+        text=text,
+        tenant_id=TENANT_ID,
+        document_id="doc-1",
+        source_key="tenants/t/documents/doc-1.pdf",
+        page_map=page_map,
+        extra_meta=extra_meta,
+    )
+
+
+def _paragraph(seed: str, sentences: int = 6) -> str:
+    return " ".join(
+        f"{seed} sentence number {i} carries enough words to matter."
+        for i in range(sentences)
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.ingestion
+class TestSemanticChunker:
+
+    def test_empty_text_returns_no_chunks(self):
+        assert _chunk("   \n\n  ") == []
+
+    def test_chunk_indices_are_sequential(self):
+        text = "\n\n".join(_paragraph(f"Para{i}") for i in range(5))
+        chunks = _chunk(text)
+        assert [c.chunk_index for c in chunks] == list(range(len(chunks)))
+        assert all(c.char_count == len(c.text) for c in chunks)
+
+    def test_page_numbers_follow_page_map(self):
+        pages = [(1, _paragraph("Alpha")), (2, _paragraph("Bravo")), (3, _paragraph("Charlie"))]
+        text  = "\n\n".join(t for _, t in pages)
+
+        chunks = _chunk(text, build_page_map(pages))
+
+        assert [c.page_number for c in chunks] == [1, 2, 3]
+
+    def test_repeated_paragraph_maps_to_later_page(self):
+        """Identical boilerplate on two pages must not both resolve to page 1."""
+        boilerplate = _paragraph("Confidential")
+        pages = [(1, boilerplate), (2, _paragraph("Body")), (3, boilerplate)]
+        text  = "\n\n".join(t for _, t in pages)
+
+        chunks = _chunk(text, build_page_map(pages))
+
+        assert chunks[0].page_number == 1
+        assert chunks[-1].page_number == 3
+
+    def test_short_paragraphs_are_merged_up_to_min_size(self):
+        text   = "\n\n".join(f"Short line {i}." for i in range(100))
+        pieces = [(m.start(), m.end(), "") for m in re.finditer(r"[^\n]+", text)]
+        merged = list(SemanticChunker()._iter_sized(text, pieces))
+
+        assert all(len(t) >= MIN_CHUNK_CHARS for t, _, _ in merged[:-1])
+        assert "\n\n".join(t for t, _, _ in merged) == text
+
+    def test_chunk_offsets_point_into_normalized_text(self):
+        """Span-based pipeline: every chunk (incl. hard-split windows) starts at its source offset."""
+        text = "\n\n".join(_paragraph(f"Para{i}", sentences=40) for i in range(3))
+        for chunk_text, _, offset in SemanticChunker()._iter_sized(
+            text, [(0, len(text), "")]
+        ):
+            assert text.startswith(chunk_text[:40], offset)
+
+    def test_hard_split_at_sentence_boundary_does_not_overlap(self):
+        text  = _paragraph("Long", sentences=80)
+        parts = SemanticChunker()._hard_split(text)
+
+        assert len(parts) > 1
+        assert " ".join(t for t, _ in parts) == text
+
+    def test_hard_split_without_boundary_overlaps(self):
+        text  = "x" * (MAX_CHUNK_CHARS + 500)
+        parts = SemanticChunker()._hard_split(text)
+
+        assert [o for _, o in parts] == [0, MAX_CHUNK_CHARS - OVERLAP_CHARS]
+        assert parts[-1][0] == text[MAX_CHUNK_CHARS - OVERLAP_CHARS:]
+
+    def test_oversized_paragraph_bypasses_spacy(self):
+        text = _paragraph("Huge", sentences=SPACY_MAX_CHARS // 50)
+        nlp  = MagicMock()
+
+        spans = SemanticChunker()._split_sentences(text, 0, len(text), nlp)
+
+        nlp.assert_not_called()
+        assert len(spans) == SPACY_MAX_CHARS // 50
+
+    def test_chunk_ids_are_deterministic_sha256_prefixes(self):
+        """IDs must stay stable across releases so re-processing upserts in place."""
+        chunks = _chunk("\n\n".join(_paragraph(f"Para{i}") for i in range(3)))
+        for c in chunks:
+            raw = f"{TENANT_ID}:doc-1:{c.chunk_index}"
+            assert c.chunk_id == hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+    def test_metadata_holds_only_extra_meta(self):
+        chunks = _chunk(_paragraph("Meta"), extra_meta={"content_type": "application/pdf"})
+        assert chunks[0].metadata == {"content_type": "application/pdf"}
+
+    def test_to_vector_metadata_flattens_chunk_fields(self):
+        chunk = _chunk(_paragraph("Meta"), extra_meta={"used_ocr": False})[0]
+        meta  = chunk.to_vector_metadata()
+
+        assert meta["tenant_id"] == str(TENANT_ID)
+        assert meta["document_id"] == "doc-1"
+        assert meta["chunk_index"] == 0
+        assert meta["page_number"] == 1
+        assert meta["char_count"] == chunk.char_count
+        assert meta["used_ocr"] is False
+
+    def test_chunk_batch_preserves_document_order(self):
+        docs = [
+            {
+                "text":        _paragraph(f"Doc{i}"),
+                "tenant_id":   TENANT_ID,
+                "document_id": f"doc-{i}",
+                "source_key":  f"tenants/t/documents/doc-{i}.pdf",
+            }
+            for i in range(3)
+        ]
+        batches = SemanticChunker().chunk_batch(docs, max_workers=1)
+
+        assert [b[0].document_id for b in batches] == ["doc-0", "doc-1", "doc-2"]
+        assert batches[1][0].text == SemanticChunker().chunk(**docs[1])[0].text
+
+
+@pytest.mark.unit
+@pytest.mark.ingestion
+class TestIsHeading:
+
+    @pytest.mark.parametrize("line", [
+        "## Refund Policy",
+        "TERMS AND CONDITIONS",
+        "1.2.3 Overview of scope",
+        "Section 4:",
+        "Appendix B-1",
+    ])
+    def test_heading_lines(self, line):
+        assert _is_heading(line)
+
+    @pytest.mark.parametrize("line", [
+        "the quick brown fox jumps over the lazy dog",
+        "The quarterly revenue grew by 12 percent.",
+        "NOTE:",
+        "- bullet point text",
+        "",
+    ])
+    def test_body_lines(self, line):
+        assert not _is_heading(line)
+
+    def test_repeated_headings_share_one_string(self):
+        text = "\n\n".join(f"CONFIDENTIAL NOTICE\n\n{_paragraph(f'Page{i}')}" for i in range(3))
+        sections = list(SemanticChunker()._iter_sections(text))
+
+        assert len(sections) == 3
+        assert all(h is sections[0][2] for _, _, h in sections)
+
+    def test_sections_carry_nearest_heading(self):
+        text = "## Refund Policy\n\n" + _paragraph("Refunds")
+        chunks = _chunk(text)
+        assert chunks[0].heading == "## Refund Policy"
+        assert "## Refund Policy" not in chunks[0].text
+
+
+@pytest.mark.unit
+@pytest.mark.ingestion
+class TestLookupPage:
+
+    def test_no_page_map_defaults_to_page_one(self):
+        assert _lookup_page(500, [], []) == 1
+
+    @pytest.mark.parametrize("offset,expected", [
+        (0, 1), (9, 1), (10, 2), (11, 2), (25, 3), (10_000, 3),
+    ])
+    def test_offsets_resolve_to_containing_page(self, offset, expected):
+        assert _lookup_page(offset, [0, 10, 25], [1, 2, 3]) == expected
+
+    def test_offset_before_first_page_defaults_to_page_one(self):
+        assert _lookup_page(3, [5, 20], [4, 5]) == 1
+
+
+@pytest.mark.unit
+@pytest.mark.ingestion
+class TestNormalizeText:
+
+    def test_replaces_nbsp_and_zero_width_chars(self):
+        assert _normalize_text("a\u00a0b\u200bc\ufeffd") == "a b c d"
+
+    def test_strips_trailing_whitespace_per_line(self):
+        assert _normalize_text("line one   \nline two\t\n") == "line one\nline two"
+
+    def test_crlf_and_form_feed_become_newlines(self):
+        assert _normalize_text("one\r\ntwo\x0cthree") == "one\ntwo\nthree"
+
+    def test_collapses_blank_line_runs_to_paragraph_break(self):
+        assert _normalize_text("para one\n\n\n\n\npara two") == "para one\n\npara two"
+
+    def test_applies_nfc_composition(self):
+        assert _normalize_text("e\u0301") == "\u00e9"
+
+
+@pytest.mark.unit
+class TestGetNlp:
+
+    def test_concurrent_cold_calls_load_once(self, monkeypatch):
+        loads = []
+        model = object()
+
+        def slow_load():
+            loads.append(threading.get_ident())
+            time.sleep(0.05)
+            return model
+
+        monkeypatch.setattr(chunking, "_nlp", chunking._UNLOADED)
+        monkeypatch.setattr(chunking, "_load_nlp", slow_load)
+        start = threading.Barrier(4)
+
+        def call():
+            start.wait()
+            return _real_get_nlp()
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda _: call(), range(4)))
+
+        assert len(loads) == 1
+        assert all(r is model for r in results)
+
+    def test_missing_model_is_cached(self, monkeypatch):
+        load = MagicMock(return_value=None)
+        monkeypatch.setattr(chunking, "_nlp", chunking._UNLOADED)
+        monkeypatch.setattr(chunking, "_load_nlp", load)
+
+        assert _real_get_nlp() is None and _real_get_nlp() is None
+        load.assert_called_once()
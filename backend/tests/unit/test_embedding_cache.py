@@ -0,0 +1,191 @@
+"""
+Unit Tests — CachingEmbeddings
+═══════════════════════════════
+Tests for the query vector cache in app/rag/embedding_cache.py.
+
+All tests:
+  • Wrap a fake Embeddings that counts calls — no OpenAI
+
+Coverage targets:
+  ✅ Hits           → repeated question (whitespace aside) embedded once, sync and async;
+                      a miss embeds the whitespace-collapsed text
+  ✅ Keys           → case, model and dimensions all separate entries
+  ✅ Consistency    → hit and miss return the same float32-rounded vector
+  ✅ Failures       → not cached; the next call retries
+  ✅ Eviction       → least recently used vector dropped past QUERY_CACHE_SIZE
+  ✅ Documents      → passed through uncached
+  ✅ Arrays         → retrieval gets the cached read-only float32 array itself;
+                      plain Embeddings are converted
+  ✅ int8           → stored as codes + scale; miss and hit agree; cosine error < 1e-3;
+                      zero vector survives
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from app.rag import embedding_cache
+from app.rag.embedding_cache import CachingEmbeddings, aembed_query_array, clear_query_cache
+
+
+class _CountingEmbeddings(Embeddings):
+    def __init__(self):
+        self.queries: list[str] = []
+        self.fail = False
+
+    def embed_query(self, text: str) -> list[float]:
+        self.queries.append(text)
+        if self.fail:
+            raise RuntimeError("OpenAI unavailable")
+        return [len(text) / 3, 0.1]
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return self.embed_query(text)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed_query(t) for t in texts]
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    clear_query_cache()
+    yield
+    clear_query_cache()
+
+
+def _embedder(inner: Embeddings, model: str = "text-embedding-3-small", dims: int = 1536) -> CachingEmbeddings:
+    return CachingEmbeddings(inner, model=model, dimensions=dims)
+
+
+@pytest.mark.unit
+class TestCachingEmbeddings:
+
+    async def test_repeated_question_is_embedded_once(self):
+        inner = _CountingEmbeddings()
+
+        first  = await _embedder(inner).aembed_query("What is the refund policy?")
+        second = await _embedder(inner).aembed_query("  What is the   refund policy? ")
+        third  = _embedder(inner).embed_query("What is the refund policy?")
+
+        assert inner.queries == ["What is the refund policy?"]
+        assert first == second == third
+
+    async def test_miss_embeds_the_normalised_text(self):
+        inner = _CountingEmbeddings()
+
+        await _embedder(inner).aembed_query("  refund \n policy ")
+        _embedder(inner).embed_query("refund\tpolicy  now")
+
+        assert inner.queries == ["refund policy", "refund policy now"]
+
+    async def test_case_model_and_dimensions_are_separate_keys(self):
+        inner = _CountingEmbeddings()
+
+        await _embedder(inner).aembed_query("Apple")
+        await _embedder(inner).aembed_query("apple")
+        await _embedder(inner, model="text-embedding-3-large").aembed_query("Apple")
+        await _embedder(inner, dims=256).aembed_query("Apple")
+
+        assert len(inner.queries) == 4
+
+    async def test_miss_and_hit_return_the_same_rounded_vector(self):
+        inner = _CountingEmbeddings()
+
+        miss = await _embedder(inner).aembed_query("abcd")
+        hit  = await _embedder(inner).aembed_query("abcd")
+
+        assert miss == hit
+        assert miss[0] == pytest.approx(4 / 3, rel=1e-6) and miss[0] != 4 / 3
+
+    async def test_failures_are_not_cached(self):
+        inner = _CountingEmbeddings()
+        inner.fail = True
+        with pytest.raises(RuntimeError):
+            await _embedder(inner).aembed_query("refund")
+
+        inner.fail = False
+        assert await _embedder(inner).aembed_query("refund")
+        assert len(inner.queries) == 2
+
+    def test_least_recently_used_is_evicted(self, monkeypatch):
+        monkeypatch.setattr(embedding_cache, "QUERY_CACHE_SIZE", 2)
+        inner    = _CountingEmbeddings()
+        embedder = _embedder(inner)
+
+        embedder.embed_query("a")
+        embedder.embed_query("b")
+        embedder.embed_query("a")       # refresh
+        embedder.embed_query("c")       # evicts "b"
+        embedder.embed_query("a")
+        embedder.embed_query("b")
+
+        assert inner.queries == ["a", "b", "c", "b"]
+
+    def test_documents_are_not_cached(self):
+        inner    = _CountingEmbeddings()
+        embedder = _embedder(inner)
+
+        embedder.embed_documents(["chunk"])
+        embedder.embed_documents(["chunk"])
+
+        assert inner.queries == ["chunk", "chunk"]
+
+
+@pytest.mark.unit
+class TestQueryArrays:
+
+    async def test_retrieval_gets_the_cached_array(self):
+        embedder = _embedder(_CountingEmbeddings())
+
+        first  = await aembed_query_array(embedder, "refund")
+        second = await aembed_query_array(embedder, "refund")
+
+        assert first is second
+        assert first.dtype == np.float32 and not first.flags.writeable
+        assert (await embedder.aembed_query("refund")) == first.tolist()
+
+    async def test_plain_embeddings_are_converted(self):
+        inner = _CountingEmbeddings()
+
+        vector = await aembed_query_array(inner, "abc")
+
+        assert vector.dtype == np.float32
+        assert vector.tolist() == pytest.approx([1.0, 0.1])
+
+
+@pytest.mark.unit
+class TestInt8Cache:
+
+    async def test_vectors_are_stored_quantised(self):
+        embedder = CachingEmbeddings(_CountingEmbeddings(), model="m", int8=True)
+
+        miss = await embedder.aembed_query_array("abcdef")
+        hit  = await embedder.aembed_query_array("abcdef")
+
+        ((scale, codes),) = embedding_cache._vectors.values()
+        assert codes.dtype == np.int8 and codes.tolist() == [127, 6]
+        assert scale == np.float32(2.0 / 127)
+        assert miss.dtype == np.float32 and not miss.flags.writeable
+        assert miss.tolist() == hit.tolist()
+
+    async def test_cosine_error_is_negligible(self):
+        rng    = np.random.default_rng(0)
+        vector = rng.normal(size=1536)
+        inner  = SimpleNamespace(aembed_query=AsyncMock(return_value=vector.tolist()))
+
+        decoded = await CachingEmbeddings(inner, model="m", int8=True).aembed_query_array("q")
+
+        cosine = decoded @ vector / (np.linalg.norm(decoded) * np.linalg.norm(vector))
+        assert 1 - cosine < 1e-3
+
+    async def test_zero_vector_round_trips(self):
+        inner = SimpleNamespace(aembed_query=AsyncMock(return_value=[0.0, 0.0]))
+
+        decoded = await CachingEmbeddings(inner, model="m", int8=True).aembed_query_array("q")
+
+        assert decoded.tolist() == [0.0, 0.0]
@@ -0,0 +1,445 @@
+"""
+Unit Tests — EmbeddingPipeline
+═══════════════════════════════
+Tests for the batched OpenAI embedding pipeline in app/processing/embeddings.py.
+
+All tests:
+  • Replace the AsyncOpenAI client with an AsyncMock — never touch the network
+  • Build ChunkResult objects directly (no chunker involved)
+
+Coverage targets:
+  ✅ Client reuse    → one AsyncOpenAI client shared by all batches and queries
+  ✅ aclose()        → closes the shared client; safe when none was created
+  ✅ Warm-up         → one background request, failures ignored, cancelled on aclose
+  ✅ Vector records  → VectorBatch ids / flat metadata per chunk, in chunk order
+  ✅ Vector format   → base64 decoded into one contiguous float32 matrix; size checked
+  ✅ Streaming       → one EmbeddedBatch per batch; failures carry chunk positions
+  ✅ Shared limiter  → concurrent pipelines on one loop share one request ceiling
+  ✅ Bounded tasks   → at most max_in_flight_batches() scheduled, scaling with
+                       embedding_global_concurrency; auth error stops the rest
+  ✅ Truncation      → oversize inputs cut to MAX_EMBED_TOKENS (tiktoken or byte fallback), queries too
+  ✅ Retry back-off  → Retry-After honoured, jittered, capped; slot released while sleeping
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+from app.processing import embeddings as emb_mod
+from app.processing.chunking import ChunkResult
+from app.processing.embeddings import EmbeddingPipeline, _retry_delay, _truncate_texts
+
+
+TENANT_ID = uuid.UUID("3fa85f64-5717-4562-b3fc-2c963f66afa6")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Helpers
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _chunks(n: int) -> list[ChunkResult]:
+    return [
+        ChunkResult(
+            chunk_id=f"id-{i}",
+            tenant_id=TENANT_ID,
+            document_id="doc-1",
+            chunk_index=i,
+            text=f"chunk text {i}",
+            page_number=1,
+            source_key="tenants/t/documents/doc-1.pdf",
+            heading="",
+            char_count=len(f"chunk text {i}"),
+            token_est=3,
+        )
+        for i in range(n)
+    ]
+
+
+def _fake_client() -> MagicMock:
+    """AsyncOpenAI stand-in whose embeddings.create echoes one vector per input."""
+    async def create(model, input, **kwargs):
+        assert kwargs["encoding_format"] == "base64"
+        return SimpleNamespace(
+            data=[
+                SimpleNamespace(embedding=base64.b64encode(
+                    np.array([float(i), 0.5], dtype="<f4").tobytes()
+                ).decode())
+                for i in range(len(input))
+            ],
+            usage=SimpleNamespace(total_tokens=len(input)),
+        )
+
+    client = MagicMock()
+    client.embeddings.create = AsyncMock(side_effect=create)
+    client.close = AsyncMock()
+    return client
+
+
+def _pipeline() -> tuple[EmbeddingPipeline, MagicMock]:
+    pipeline = EmbeddingPipeline(tenant_id=TENANT_ID, api_key="sk-test", dimensions=2)
+    client   = _fake_client()
+    pipeline._client = client
+    return pipeline, client
+
+
+@pytest.mark.unit
+@pytest.mark.ingestion
+class TestEmbeddingPipeline:
+
+    def test_client_is_created_once(self):
+        pipeline = EmbeddingPipeline(tenant_id=TENANT_ID, api_key="sk-test")
+        with patch("openai.AsyncOpenAI") as ctor:
+            first  = pipeline._get_client()
+            second = pipeline._get_client()
+
+        assert first is second
+        ctor.assert_called_once()
+        assert ctor.call_args.kwargs["max_retries"] == 0
+
+    async def test_batches_and_query_share_client(self):
+        pipeline, client = _pipeline()
+        n = emb_mod.EMBEDDING_BATCH_SIZE * 2 + 1
+
+        result = await pipeline.embed_chunks(_chunks(n))
+        await pipeline.embed_query("hello")
+
+        assert len(result.vector_records) == n
+        assert client.embeddings.create.await_count == 4
+
+    async def test_aclose_closes_shared_client(self):
+        pipeline, client = _pipeline()
+        await pipeline.aclose()
+        await pipeline.aclose()
+
+        client.close.assert_awaited_once()
+        assert pipeline._client is None
+
+    async def test_warm_up_issues_one_background_request(self):
+        pipeline, client = _pipeline()
+        client.models.list = AsyncMock(side_effect=ConnectionError("dns"))
+
+        pipeline.warm_up()
+        pipeline.warm_up()
+        await pipeline._warm_task    # failure is swallowed
+
+        client.models.list.assert_awaited_once()
+
+    async def test_aclose_cancels_pending_warm_up(self):
+        pipeline, client = _pipeline()
+        started = asyncio.Event()
+
+        async def hang():
+            started.set()
+            await asyncio.sleep(60)
+
+        client.models.list = AsyncMock(side_effect=hang)
+        pipeline.warm_up()
+        task = pipeline._warm_task
+        await started.wait()
+
+        await pipeline.aclose()
+        await asyncio.sleep(0)
+
+        assert task.cancelled()
+        client.close.assert_awaited_once()
+
+    async def test_vector_records_follow_chunk_order(self):
+        pipeline, _ = _pipeline()
+        result = await pipeline.embed_chunks(_chunks(3))
+
+        assert result.vector_records.ids == ["id-0", "id-1", "id-2"]
+        meta = result.vector_records.metadata[1]
+        assert meta["tenant_id"] == str(TENANT_ID)
+        assert meta["chunk_index"] == 1
+        assert meta["text"] == "chunk text 1"
+        assert result.failed_chunks == []
+
+    async def test_chunk_extra_metadata_is_merged(self):
+        pipeline, _ = _pipeline()
+        chunks = _chunks(2)
+        chunks[0].metadata = {"content_type": "application/pdf", "used_ocr": True}
+
+        result = await pipeline.embed_chunks(chunks)
+
+        first, second = result.vector_records.metadata
+        assert first["content_type"] == "application/pdf"
+        assert first["used_ocr"] is True
+        assert "content_type" not in second
+
+    async def test_vectors_are_one_float32_matrix(self):
+        pipeline, _ = _pipeline()
+        n = emb_mod.EMBEDDING_BATCH_SIZE + 2
+        result = await pipeline.embed_chunks(_chunks(n))
+
+        vectors = result.vector_records.vectors
+        assert vectors.dtype == np.float32
+        assert vectors.shape == (n, 2)
+        assert vectors.flags.c_contiguous
+        assert vectors[1].tolist() == [1.0, 0.5]
+
+    async def test_to_records_views_matrix_rows(self):
+        pipeline, _ = _pipeline()
+        batch = (await pipeline.embed_chunks(_chunks(2))).vector_records
+
+        records = batch.to_records()
+
+        assert [r.id for r in records] == batch.ids
+        assert records[1].metadata is batch.metadata[1]
+        assert np.shares_memory(records[1].vector, batch.vectors)
+
+    async def test_dimension_mismatch_fails_without_retry(self):
+        pipeline = EmbeddingPipeline(tenant_id=TENANT_ID, api_key="sk-test", dimensions=1536)
+        pipeline._client = _fake_client()
+
+        with patch.object(emb_mod.asyncio, "sleep") as sleep:
+            result = await pipeline.embed_chunks(_chunks(2))
+
+        assert result.failed_chunks == [0, 1]
+        sleep.assert_not_called()
+
+
+@pytest.mark.unit
+@pytest.mark.ingestion
+class TestIterEmbedChunks:
+
+    async def test_yields_one_entry_per_batch(self):
+        pipeline, _ = _pipeline()
+        n = emb_mod.EMBEDDING_BATCH_SIZE * 2 + 5
+
+        batches = [b async for b in pipeline.iter_embed_chunks(_chunks(n))]
+
+        assert sorted(b.batch_idx for b in batches) == [0, 1, 2]
+        assert sum(len(b.vector_records) for b in batches) == n
+        assert all(not b.failed_chunks for b in batches)
+
+    async def test_failed_batch_reports_chunk_positions(self):
+        pipeline, _ = _pipeline()
+        size = emb_mod.EMBEDDING_BATCH_SIZE
+        original = pipeline._embed_batch_with_retry
+
+        async def fail_second(batch, batch_idx, semaphore):
+            if batch_idx == 1:
+                raise RuntimeError("boom")
+            return await original(batch, batch_idx, semaphore)
+
+        with patch.object(pipeline, "_embed_batch_with_retry", side_effect=fail_second):
+            result = await pipeline.embed_chunks(_chunks(size + 3))
+
+        assert result.failed_chunks == [size, size + 1, size + 2]
+        assert result.vector_records.ids == [f"id-{i}" for i in range(size)]
+        assert result.vector_records.vectors.shape == (size, 2)
+
+    @pytest.mark.parametrize("concurrency", [4, 10])
+    async def test_in_flight_batches_are_bounded(self, concurrency, monkeypatch):
+        monkeypatch.setattr("app.core.config.settings.embedding_global_concurrency", concurrency)
+        monkeypatch.setattr(emb_mod, "_LIMITERS", emb_mod.weakref.WeakKeyDictionary())
+        pipeline, _ = _pipeline()
+        original = pipeline._embed_batch_with_retry
+        live = {"now": 0, "peak": 0}
+
+        async def tracked(batch, batch_idx, semaphore):
+            live["now"] += 1
+            live["peak"] = max(live["peak"], live["now"])
+            try:
+                await emb_mod.asyncio.sleep(0)
+                return await original(batch, batch_idx, semaphore)
+            finally:
+                live["now"] -= 1
+
+        n = emb_mod.EMBEDDING_BATCH_SIZE * (emb_mod.max_in_flight_batches() * 3)
+        with patch.object(pipeline, "_embed_batch_with_retry", side_effect=tracked):
+            result = await pipeline.embed_chunks(_chunks(n))
+
+        assert len(result.vector_records) == n
+        assert live["peak"] == emb_mod.max_in_flight_batches() == concurrency * 2
+
+    async def test_authentication_error_fails_remaining_batches(self):
+        class AuthenticationError(Exception):
+            pass
+
+        pipeline, client = _pipeline()
+        client.embeddings.create.side_effect = AuthenticationError("bad key")
+        n = emb_mod.EMBEDDING_BATCH_SIZE * (emb_mod.max_in_flight_batches() + 5)
+
+        result = await pipeline.embed_chunks(_chunks(n))
+
+        assert result.failed_chunks == list(range(n))
+        assert len(result.vector_records) == 0
+        assert result.vector_records.vectors.shape == (0, 2)
+        assert client.embeddings.create.await_count <= emb_mod.max_in_flight_batches()
+
+    async def test_authentication_error_cancels_batches_in_backoff(self):
+        """A sibling sleeping in retry back-off must not delay the abort."""
+        class AuthenticationError(Exception):
+            pass
+
+        pipeline, client = _pipeline()
+        calls = {"n": 0}
+
+        async def create(**kwargs):
+            calls["n"] += 1
+            if calls["n"] == 1:
+                raise _RateLimitError({"retry-after": "3600"})   # batch 0 → long back-off
+            raise AuthenticationError("bad key")
+
+        client.embeddings.create.side_effect = create
+        n = emb_mod.EMBEDDING_BATCH_SIZE * 2
+
+        result = await emb_mod.asyncio.wait_for(pipeline.embed_chunks(_chunks(n)), timeout=5)
+
+        assert result.failed_chunks == list(range(n))
+
+    async def test_pipelines_share_process_wide_limiter(self):
+        live = {"now": 0, "peak": 0}
+
+        def tracking_pipeline():
+            pipeline, client = _pipeline()
+            create = client.embeddings.create.side_effect
+
+            async def tracked(**kwargs):
+                live["now"] += 1
+                live["peak"] = max(live["peak"], live["now"])
+                try:
+                    await emb_mod.asyncio.sleep(0.001)
+                    return await create(**kwargs)
+                finally:
+                    live["now"] -= 1
+
+            client.embeddings.create.side_effect = tracked
+            return pipeline
+
+        with patch.object(emb_mod, "_LIMITERS", emb_mod.weakref.WeakKeyDictionary()), \
+             patch("app.core.config.settings.embedding_global_concurrency", 3):
+            n = emb_mod.EMBEDDING_BATCH_SIZE * 6
+            results = await emb_mod.asyncio.gather(
+                *(tracking_pipeline().embed_chunks(_chunks(n)) for _ in range(3))
+            )
+
+        assert all(len(r.vector_records) == n for r in results)
+        assert live["peak"] == 3
+
+    async def test_empty_input_yields_nothing(self):
+        pipeline, client = _pipeline()
+        assert [b async for b in pipeline.iter_embed_chunks([])] == []
+        client.embeddings.create.assert_not_awaited()
+
+
+class _CharEncoder:
+    """tiktoken stand-in: one token per character."""
+    def encode(self, text, **kwargs):
+        return list(text)
+
+    def decode(self, ids):
+        return "".join(ids)
+
+
+@pytest.mark.unit
+@pytest.mark.ingestion
+class TestTruncation:
+
+    def test_short_texts_skip_the_encoder(self):
+        with patch.object(emb_mod, "_get_encoder", return_value=None) as get:
+            assert _truncate_texts(["short"], "m", limit=100) == ["short"]
+        get.assert_called_once()
+
+    def test_long_text_truncated_by_tokens(self):
+        with patch.object(emb_mod, "_get_encoder", return_value=_CharEncoder()):
+            out = _truncate_texts(["a" * 500, "b" * 10], "m", limit=100)
+        assert out == ["a" * 100, "b" * 10]
+
+    def test_byte_fallback_without_encoder(self):
+        with patch.object(emb_mod, "_get_encoder", return_value=None):
+            (out,) = _truncate_texts(["é" * 100], "m", limit=101)
+        assert out == "é" * 50    # 2 bytes per char; partial char dropped
+
+    async def test_oversize_chunk_is_truncated_before_api_call(self):
+        pipeline, client = _pipeline()
+        chunks = _chunks(2)
+        chunks[0].text = "x" * (emb_mod.MAX_EMBED_TOKENS * 2)
+
+        with patch.object(emb_mod, "_get_encoder", return_value=_CharEncoder()):
+            result = await pipeline.embed_chunks(chunks)
+
+        sent = client.embeddings.create.await_args.kwargs["input"]
+        assert len(sent[0]) == emb_mod.MAX_EMBED_TOKENS
+        assert sent[1] == "chunk text 1"
+        assert len(result.vector_records) == 2
+
+    async def test_oversize_query_is_truncated(self):
+        pipeline, client = _pipeline()
+
+        with patch.object(emb_mod, "_get_encoder", return_value=_CharEncoder()):
+            await pipeline.embed_query("q" * (emb_mod.MAX_EMBED_TOKENS + 10))
+
+        (sent,) = client.embeddings.create.await_args.kwargs["input"]
+        assert sent == "q" * emb_mod.MAX_EMBED_TOKENS
+
+    def test_encoder_loaded_once_per_model(self):
+        emb_mod._get_encoder.cache_clear()
+        try:
+            with patch("tiktoken.encoding_for_model", return_value=_CharEncoder()) as load:
+                assert emb_mod._get_encoder("m") is emb_mod._get_encoder("m")
+            load.assert_called_once_with("m")
+        finally:
+            emb_mod._get_encoder.cache_clear()
+
+
+class _RateLimitError(Exception):
+    def __init__(self, headers: dict | None = None):
+        super().__init__("429")
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+@pytest.mark.unit
+@pytest.mark.ingestion
+class TestRetryBackoff:
+
+    @pytest.mark.parametrize("headers,base", [
+        ({"retry-after-ms": "1500"}, 1.5),
+        ({"retry-after": "3"}, 3.0),
+        ({}, emb_mod.RETRY_BASE_DELAY * 4),
+        ({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}, emb_mod.RETRY_BASE_DELAY * 4),
+    ])
+    def test_delay_uses_retry_after_then_exponential(self, headers, base):
+        with patch.object(emb_mod.random, "random", return_value=0.5):
+            assert _retry_delay(_RateLimitError(headers), attempt=2) == pytest.approx(base)
+
+    def test_delay_is_jittered_and_capped(self):
+        exc = _RateLimitError({"retry-after": "3600"})
+        with patch.object(emb_mod.random, "random", return_value=0.0):
+            low = _retry_delay(exc, attempt=0)
+        with patch.object(emb_mod.random, "random", return_value=0.999):
+            high = _retry_delay(exc, attempt=0)
+
+        assert low == pytest.approx(emb_mod.RETRY_MAX_DELAY * 0.5)
+        assert high < emb_mod.RETRY_MAX_DELAY * 1.5
+
+    async def test_semaphore_released_during_backoff(self):
+        pipeline, client = _pipeline()
+        calls = {"n": 0}
+        create = client.embeddings.create.side_effect
+
+        async def flaky(**kwargs):
+            calls["n"] += 1
+            if calls["n"] == 1:
+                raise _RateLimitError({"retry-after": "0"})
+            return await create(**kwargs)
+
+        client.embeddings.create.side_effect = flaky
+        semaphore = emb_mod.asyncio.Semaphore(1)
+
+        async def fake_sleep(delay):
+            assert not semaphore.locked()
+
+        with patch.object(emb_mod.asyncio, "sleep", side_effect=fake_sleep) as sleep:
+            records, _ = await pipeline._embed_batch_with_retry(_chunks(2), 0, semaphore)
+
+        assert len(records) == 2
+        sleep.assert_awaited_once()
@@ -0,0 +1,710 @@
+"""
+Unit Tests — TextExtractorOrchestrator
+═══════════════════════════════════════
+Tests for result assembly in app/processing/extractor.py.
+
+All tests:
+  • Build ExtractionStrategyResult objects directly — no OCR
+  • PDF parsing tests generate a one-page PDF in memory (skipped without PyMuPDF)
+
+Coverage targets:
+  ✅ full_text       → non-blank pages joined with "\n\n"
+  ✅ page_map        → offsets line up with full_text, blank pages skipped
+  ✅ pages           → every page kept, including blank ones
+  ✅ avg_confidence  → pages without a confidence score are ignored
+  ✅ PDF source      → PyMuPDF reads a file path the same as raw bytes
+  ✅ Ligatures       → "ﬁ"/"ﬂ" glyphs extracted as plain "fi"/"fl"
+  ✅ Encrypted PDF   → flagged without reading pages; orchestrator skips OCR
+  ✅ Process pool    → long PDFs split across workers, same pages; in-process fallback;
+                       never started in daemonic workers; a per-file error keeps the pool
+  ✅ Speculative OCR → starts on a scanned-looking sample, cancelled if unused
+  ✅ Textract sync   → LINE text grouped by page; LINE/WORD confidences averaged
+  ✅ Textract async  → non-blocking poll with back-off; NextToken pages; failure/timeout raise
+  ✅ Textract retry  → throttling codes retried with back-off; other errors raised
+  ✅ Textract client → one pooled client per region, shared across extractors
+  ✅ Unstructured    → fallback OCR uses strategy="ocr_only"; elements grouped by page
+  ✅ Executors       → OCR on the CPU pool, Textract on the AWS pool; admission bounded
+  ✅ Metrics         → pages counted per method + scanned flag; elapsed time recorded
+  ✅ Warm-up         → backend libraries preloaded; Textract client created per process
+  ✅ Extraction cache→ tenant-scoped digest keys; hits skip PyMuPDF and OCR; errors = miss
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from app.processing import ocr as ocr_mod
+from app.processing.extraction_cache import ExtractionCache, pdf_digest
+from app.processing.extractor import (
+    TextExtractorOrchestrator,
+    preload_extractors,
+    warm_up_extractors,
+)
+from app.processing.ocr import (
+    ExtractionStrategyResult,
+    PageText,
+    PyMuPDFExtractor,
+    TextractExtractor,
+    UnstructuredExtractor,
+)
+
+
+TENANT_ID = uuid.UUID("3fa85f64-5717-4562-b3fc-2c963f66afa6")
+
+
+def _build(pages: list[PageText]):
+    strategy_result = ExtractionStrategyResult(
+        pages=pages,
+        total_chars=sum(len(p.text) for p in pages),
+        strategy_name="pymupdf",
+        elapsed_ms=1.0,
+    )
+    return TextExtractorOrchestrator()._build_result(strategy_result, elapsed_sec=0.001)
+
+
+@pytest.mark.unit
+@pytest.mark.ingestion
+class TestBuildResult:
+
+    def test_full_text_joins_non_blank_pages(self):
+        result = _build([PageText(1, "alpha"), PageText(2, "  \n"), PageText(3, "gamma")])
+
+        assert result.full_text == "alpha\n\ngamma"
+        assert result.pages == [(1, "alpha"), (2, "  \n"), (3, "gamma")]
+        assert result.page_count == 3
+
+    def test_page_map_offsets_skip_blank_pages(self):
+        result = _build([PageText(1, "alpha"), PageText(2, ""), PageText(3, "gamma")])
+
+        assert result.page_map == {0: 1, 7: 3}
+        assert result.full_text[7:] == "gamma"
+
+    def test_avg_confidence_ignores_unscored_pages(self):
+        result = _build([
+            PageText(1, "a", confidence=0.8),
+            PageText(2, "b"),
+            PageText(3, "c", confidence=0.6),
+        ])
+
+        assert result.avg_confidence == pytest.approx(0.7)
+
+
+@pytest.mark.unit
+@pytest.mark.ingestion
+class TestPdfSource:
+
+    async def test_pymupdf_reads_path_and_bytes_alike(self, tmp_path):
+        fitz = pytest.importorskip("fitz")
+        doc = fitz.open()
+        doc.new_page().insert_text((72, 72), "Hello from page one")
+        data = doc.tobytes()
+        path = tmp_path / "doc.pdf"
+        path.write_bytes(data)
+
+        from_path  = await PyMuPDFExtractor().extract(path)
+        from_bytes = await PyMuPDFExtractor().extract(data)
+
+        assert from_path.pages == from_bytes.pages
+        assert from_path.pages[0].text == "Hello from page one"
+
+    async def test_pymupdf_expands_ligatures(self):
+        fitz = pytest.importorskip("fitz")
+        doc  = fitz.open()
+        page = doc.new_page()
+        writer = fitz.TextWriter(page.rect)
+        writer.append((72, 72), "ﬁnance workﬂow", font=fitz.Font("cjk"))
+        writer.write_text(page)
+
+        result = await PyMuPDFExtractor().extract(doc.tobytes())
+
+        assert result.pages[0].text == "finance workflow"
+
+    async def test_password_protected_pdf_is_flagged_not_read(self):
+        fitz = pytest.importorskip("fitz")
+        doc  = fitz.open()
+        doc.new_page().insert_text((72, 72), "secret")
+        data = doc.tobytes(encryption=fitz.PDF_ENCRYPT_AES_256, owner_pw="o", user_pw="u")
+        on_sample = MagicMock()
+
+        with patch.object(ocr_mod, "_page_texts") as page_texts:
+            result = await PyMuPDFExtractor().extract(data, on_sample=on_sample)
+
+        assert result.encrypted
+        assert result.pages == []
+        page_texts.assert_not_called()
+        on_sample.assert_not_called()
+
+
+def _long_pdf(tmp_path):
+    fitz = pytest.importorskip("fitz")
+    doc = fitz.open()
+    for i in range(ocr_mod.PARALLEL_MIN_PAGES + 3):
+        doc.new_page().insert_text((72, 72), f"Text of page {i + 1}")
+    path = tmp_path / "long.pdf"
+    doc.save(path)
+    return path
+
+
+@pytest.fixture
+def _fresh_pdf_pool(monkeypatch):
+    monkeypatch.setattr(ocr_mod, "_pdf_pool", None)
+    monkeypatch.setattr(ocr_mod, "_pdf_pool_disabled", False)
+    yield
+    if ocr_mod._pdf_pool is not None:
+        ocr_mod._pdf_pool.shutdown()
+
+
+@pytest.mark.unit
+@pytest.mark.ingestion
+@pytest.mark.usefixtures("_fresh_pdf_pool")
+class TestParallelExtraction:
+
+    async def test_process_pool_matches_sequential(self, tmp_path):
+        path = _long_pdf(tmp_path)
+
+        parallel   = await PyMuPDFExtractor(num_workers=2).extract(path)
+        sequential = await PyMuPDFExtractor(num_workers=1).extract(path)
+
+        assert ocr_mod._pdf_pool is not None
+        assert parallel.pages == sequential.pages
+        assert parallel.pages[-1].text == f"Text of page {ocr_mod.PARALLEL_MIN_PAGES + 3}"
+
+    async def test_unavailable_pool_falls_back_in_process(self, tmp_path):
+        path = _long_pdf(tmp_path)
+        pool = MagicMock()
+        pool.submit.side_effect = AssertionError("daemonic processes are not allowed to have children")
+        ocr_mod._pdf_pool = pool
+
+        result = await PyMuPDFExtractor(num_workers=2).extract(path)
+
+        assert len(result.pages) == ocr_mod.PARALLEL_MIN_PAGES + 3
+        assert ocr_mod._pdf_pool_disabled
+        assert ocr_mod._get_pdf_pool() is None
+
+    async def test_daemonic_worker_skips_the_pool(self, tmp_path, monkeypatch, caplog):
+        monkeypatch.setattr(
+            ocr_mod.multiprocessing, "current_process", lambda: SimpleNamespace(daemon=True),
+        )
+
+        result = await PyMuPDFExtractor(num_workers=2).extract(_long_pdf(tmp_path))
+
+        assert len(result.pages) == ocr_mod.PARALLEL_MIN_PAGES + 3
+        assert ocr_mod._pdf_pool is None
+        assert not [r for r in caplog.records if r.levelno >= logging.WARNING]
+
+    async def test_file_error_in_child_keeps_the_pool(self, tmp_path):
+        failed = Future()
+        failed.set_exception(FileNotFoundError("spooled file gone"))
+        pool = MagicMock()
+        pool.submit.return_value = failed
+        ocr_mod._pdf_pool = pool
+
+        result = await PyMuPDFExtractor(num_workers=2).extract(_long_pdf(tmp_path))
+
+        assert len(result.pages) == ocr_mod.PARALLEL_MIN_PAGES + 3
+        assert not ocr_mod._pdf_pool_disabled
+        assert ocr_mod._get_pdf_pool() is pool
+        ocr_mod._pdf_pool = None            # a mock — nothing for the fixture to shut down
+
+
+class _FakePyMuPDF:
+    """Reports a sample from an executor thread, then returns the given pages."""
+
+    strategy_name = "pymupdf"
+
+    def __init__(self, sample_chars: int, pages: list[PageText]):
+        self._sample_chars = sample_chars
+        self._pages        = pages
+
+    async def extract(self, pdf_source, on_sample=None):
+        def _run():
+            on_sample(len(self._pages), 1, self._sample_chars)
+            return ExtractionStrategyResult(
+                pages=self._pages,
+                total_chars=sum(len(p.text) for p in self._pages),
+                strategy_name="pymupdf",
+                elapsed_ms=1.0,
+            )
+        return await asyncio.get_running_loop().run_in_executor(None, _run)
+
+
+def _orchestrator(sample_chars: int, pages: list[PageText], cache=None):
+    orch = TextExtractorOrchestrator(cache=cache)
+    orch._pymupdf = _FakePyMuPDF(sample_chars, pages)
+    return orch
+
+
+@pytest.mark.unit
+@pytest.mark.ingestion
+class TestSpeculativeOcr:
+
+    async def test_scanned_sample_starts_ocr_before_pymupdf_finishes(self, monkeypatch):
+        calls: list[int] = []
+        ocr = ExtractionStrategyResult(
+            pages=[PageText(1, "ocr text")], total_chars=8,
+            strategy_name="unstructured", elapsed_ms=1.0, used_ocr=True,
+        )
+
+        async def fake_run_ocr(pdf_source, page_count):
+            calls.append(page_count)
+            return ocr
+
+        orch = _orchestrator(0, [PageText(1, ""), PageText(2, "")])
+        monkeypatch.setattr(orch, "_run_ocr", fake_run_ocr)
+
+        result = await orch.extract(b"%PDF")
+
+        assert calls == [2]
+        assert result.full_text == "ocr text"
+        assert result.used_ocr
+
+    async def test_speculative_ocr_cancelled_when_text_layer_found(self, monkeypatch):
+        started   = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def slow_run_ocr(pdf_source, page_count):
+            started.set()
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        text = "native text layer " * 20
+        orch = _orchestrator(0, [PageText(1, ""), PageText(2, text)])
+        monkeypatch.setattr(orch, "_run_ocr", slow_run_ocr)
+
+        result = await orch.extract(b"%PDF")
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+        assert started.is_set()
+        assert result.full_text == text
+        assert not result.used_ocr
+
+    async def test_encrypted_pdf_skips_ocr(self, monkeypatch):
+        async def fail_run_ocr(pdf_source, page_count):
+            raise AssertionError("OCR must not run")
+
+        orch = TextExtractorOrchestrator()
+        orch._pymupdf = MagicMock(strategy_name="pymupdf")
+        orch._pymupdf.extract = AsyncMock(return_value=ExtractionStrategyResult(
+            pages=[], total_chars=0, strategy_name="pymupdf", elapsed_ms=1.0, encrypted=True,
+        ))
+        monkeypatch.setattr(orch, "_run_ocr", fail_run_ocr)
+
+        result = await orch.extract(b"%PDF")
+
+        assert result.full_text == ""
+        assert not result.used_ocr
+
+    async def test_text_sample_does_not_start_ocr(self, monkeypatch):
+        async def fail_run_ocr(pdf_source, page_count):
+            raise AssertionError("OCR must not run")
+
+        text = "native text layer " * 20
+        orch = _orchestrator(len(text), [PageText(1, text)])
+        monkeypatch.setattr(orch, "_run_ocr", fail_run_ocr)
+
+        result = await orch.extract(b"%PDF")
+
+        assert result.full_text == text
+
+
+class _FakeRedis:
+    def __init__(self, fail: bool = False):
+        self.store: dict[str, bytes] = {}
+        self._fail = fail
+
+    async def get(self, key):
+        if self._fail:
+            raise ConnectionError("redis down")
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        if self._fail:
+            raise ConnectionError("redis down")
+        self.store[key] = value
+
+    async def aclose(self):
+        pass
+
+
+def _cache(redis: _FakeRedis, tenant: uuid.UUID = TENANT_ID) -> ExtractionCache:
+    cache = ExtractionCache("redis://unused", tenant_id=tenant, ttl_seconds=60)
+    cache._redis = redis
+    return cache
+
+
+_SCANNED = [PageText(1, ""), PageText(2, "")]
+_OCR = ExtractionStrategyResult(
+    pages=[PageText(1, "ocr text", confidence=0.9, extraction_method="unstructured")],
+    total_chars=8, strategy_name="unstructured", elapsed_ms=1.0, used_ocr=True,
+)
+
+
+@pytest.mark.unit
+@pytest.mark.ingestion
+class TestExtractionCache:
+
+    def test_digest_is_the_same_for_path_and_bytes(self, tmp_path):
+        path = tmp_path / "doc.pdf"
+        path.write_bytes(b"%PDF-1.7 body")
+
+        assert pdf_digest(path) == pdf_digest(b"%PDF-1.7 body")
+        assert pdf_digest(b"%PDF-1.7 other") != pdf_digest(path)
+
+    async def test_second_extraction_is_served_from_cache(self, monkeypatch):
+        redis = _FakeRedis()
+        run_ocr = AsyncMock(return_value=_OCR)
+
+        first = _orchestrator(0, _SCANNED, _cache(redis))
+        monkeypatch.setattr(first, "_run_ocr", run_ocr)
+        await first.extract(b"%PDF same")
+
+        second = _orchestrator(0, _SCANNED, _cache(redis))
+        second._pymupdf = MagicMock(strategy_name="pymupdf")    # extract() not awaitable
+        monkeypatch.setattr(second, "_run_ocr", run_ocr)
+        result = await second.extract(b"%PDF same")
+
+        run_ocr.assert_awaited_once()
+        assert result.full_text == "ocr text"
+        assert result.used_ocr
+        assert result.avg_confidence == pytest.approx(0.9)
+
+    async def test_keys_are_tenant_scoped_and_failed_ocr_not_cached(self, monkeypatch):
+        redis = _FakeRedis()
+        orch  = _orchestrator(0, _SCANNED, _cache(redis))
+        monkeypatch.setattr(orch, "_run_ocr", AsyncMock(return_value=None))
+
+        await orch.extract(b"%PDF")
+
+        (key,) = redis.store
+        assert key.startswith(f"extract:{TENANT_ID}:pymupdf:")
+        other = _cache(redis, uuid.uuid4())
+        assert await other.get("pymupdf", key.rsplit(":", 1)[1]) is None
+
+    async def test_redis_errors_fall_back_to_extraction(self):
+        text = "native text layer " * 20
+        orch = _orchestrator(len(text), [PageText(1, text)], _cache(_FakeRedis(fail=True)))
+
+        result = await orch.extract(b"%PDF")
+
+        assert result.full_text == text
+
+
+class _FakeTextract:
+    """boto3 Textract stand-in: jobs finish after `rounds` polls; "bad" keys fail."""
+
+    def __init__(self, rounds: int = 1):
+        self._rounds = rounds
+        self.polls: dict[str, int] = {}
+
+    def start_document_text_detection(self, DocumentLocation):
+        key = DocumentLocation["S3Object"]["Name"]
+        self.polls[key] = 0
+        return {"JobId": key}
+
+    def get_document_text_detection(self, JobId, NextToken=None):
+        if JobId == "bad":
+            return {"JobStatus": "FAILED", "StatusMessage": "unsupported"}
+        if NextToken is None:
+            self.polls[JobId] += 1
+            if self.polls[JobId] <= self._rounds:
+                return {"JobStatus": "IN_PROGRESS"}
+        line = {"BlockType": "LINE", "Page": 2 if NextToken else 1, "Text": f"{JobId} p{2 if NextToken else 1}"}
+        return {"JobStatus": "SUCCEEDED", "Blocks": [line], "NextToken": None if NextToken else "t"}
+
+
+@pytest.fixture
+def _unthrottled_textract(monkeypatch):
+    monkeypatch.setattr(ocr_mod, "TEXTRACT_MAX_RPS", 10_000)
+    monkeypatch.setattr(TextractExtractor, "_limiters", {})
+    monkeypatch.setattr(TextractExtractor, "_clients", {})
+
+
+@pytest.mark.unit
+@pytest.mark.ingestion
+@pytest.mark.usefixtures("_unthrottled_textract")
+class TestTextractJobs:
+
+    async def test_async_job_polls_with_backoff_until_done(self):
+        fake = _FakeTextract(rounds=2)
+        with patch("boto3.client", return_value=fake), \
+             patch.object(ocr_mod.asyncio, "sleep", AsyncMock()) as sleep:
+            result = await TextractExtractor().extract_async_job("b", "doc-a")
+
+        assert [(p.page_number, p.text) for p in result.pages] == [(1, "doc-a p1"), (2, "doc-a p2")]
+        assert result.used_ocr
+        assert [c.args[0] for c in sleep.await_args_list] == [2, 4]
+
+    async def test_async_job_times_out(self, monkeypatch):
+        monkeypatch.setattr(ocr_mod, "OCR_TIMEOUT_SECONDS", 0)
+        with patch("boto3.client", return_value=_FakeTextract(rounds=99)):
+            with pytest.raises(TimeoutError):
+                await TextractExtractor().extract_async_job("b", "doc-a")
+
+    def test_sync_groups_lines_and_averages_confidence(self):
+        blocks = [
+            {"BlockType": "PAGE", "Page": 1},
+            {"BlockType": "LINE", "Page": 2, "Text": "second page", "Confidence": 80.0},
+            {"BlockType": "WORD", "Page": 2, "Text": "second",      "Confidence": 70.0},
+            {"BlockType": "LINE", "Page": 1, "Text": "first line",  "Confidence": 99.0},
+            {"BlockType": "WORD", "Page": 1, "Text": "first",       "Confidence": 97.0},
+            {"BlockType": "LINE", "Page": 1, "Text": "next line",   "Confidence": 95.0},
+        ]
+        client = MagicMock()
+        client.detect_document_text.return_value = {"Blocks": blocks}
+        with patch("boto3.client", return_value=client):
+            result = TextractExtractor()._extract_sync(b"%PDF")
+
+        assert [(p.page_number, p.text, p.confidence) for p in result.pages] == [
+            (1, "first line\nnext line", 0.97),
+            (2, "second page", 0.75),
+        ]
+        assert result.total_chars == len("first line\nnext line") + len("second page")
+
+    async def test_async_job_still_raises_on_failure(self):
+        with patch("boto3.client", return_value=_FakeTextract()):
+            with pytest.raises(RuntimeError, match="unsupported"):
+                await TextractExtractor().extract_async_job("b", "bad")
+
+
+def _client_error(code: str) -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": code}}, "DetectDocumentText")
+
+
+@pytest.mark.unit
+@pytest.mark.ingestion
+@pytest.mark.usefixtures("_unthrottled_textract")
+class TestTextractRetry:
+
+    def test_throttled_call_is_retried_with_backoff(self):
+        fn = MagicMock(side_effect=[
+            _client_error("ThrottlingException"),
+            _client_error("ProvisionedThroughputExceededException"),
+            {"Blocks": []},
+        ])
+        with patch.object(ocr_mod.time, "sleep") as sleep, \
+             patch.object(ocr_mod.random, "uniform", return_value=0.0):
+            assert TextractExtractor()._call(fn, JobId="j") == {"Blocks": []}
+
+        assert fn.call_count == 3
+        assert [c.args[0] for c in sleep.call_args_list] == [2, 4]
+
+    def test_gives_up_after_max_retries(self):
+        fn = MagicMock(side_effect=_client_error("LimitExceededException"))
+        with patch.object(ocr_mod.time, "sleep"), pytest.raises(ClientError):
+            TextractExtractor()._call(fn)
+
+        assert fn.call_count == ocr_mod.TEXTRACT_MAX_RETRIES + 1
+
+    def test_non_throttle_errors_are_not_retried(self):
+        fn = MagicMock(side_effect=_client_error("InvalidParameterException"))
+        with patch.object(ocr_mod.time, "sleep") as sleep, pytest.raises(ClientError):
+            TextractExtractor()._call(fn)
+
+        fn.assert_called_once()
+        sleep.assert_not_called()
+
+    def test_client_is_shared_per_region(self):
+        with patch("boto3.client", side_effect=lambda *a, **kw: MagicMock()) as make_client:
+            first  = TextractExtractor("eu-west-1")._get_client()
+            second = TextractExtractor("eu-west-1")._get_client()
+            other  = TextractExtractor("us-east-1")._get_client()
+
+        assert first is second and other is not first
+        assert make_client.call_count == 2
+        config = make_client.call_args.kwargs["config"]
+        assert config.max_pool_connections >= ocr_mod.TEXTRACT_MAX_CONCURRENT_CALLS
+        assert config.retries["max_attempts"] == 1     # throttling retries are _call()'s
+
+    def test_rate_limiter_spaces_calls(self):
+        limiter = ocr_mod._RateLimiter(rate=10)
+        with patch.object(ocr_mod.time, "monotonic", return_value=100.0), \
+             patch.object(ocr_mod.time, "sleep") as sleep:
+            limiter.wait()
+            limiter.wait()
+            limiter.wait()
+
+        assert [c.args[0] for c in sleep.call_args_list] == pytest.approx([0.1, 0.2])
+
+
+class _Element:
+
+    def __init__(self, text: str, page_number: int = 1, category: str = "NarrativeText"):
+        self._text    = text
+        self.metadata = SimpleNamespace(page_number=page_number, text_as_html=None)
+        self.category = category
+
+    def __str__(self) -> str:
+        return self._text
+
+
+@pytest.mark.unit
+@pytest.mark.ingestion
+class TestUnstructuredFallback:
+
+    async def test_orchestrator_runs_unstructured_ocr_only(self, monkeypatch):
+        partition_pdf = MagicMock(return_value=[_Element("scanned text")])
+        monkeypatch.setitem(
+            sys.modules, "unstructured.partition.pdf", SimpleNamespace(partition_pdf=partition_pdf),
+        )
+        monkeypatch.setattr("app.processing.extractor._OCR_BACKEND", "unstructured")
+
+        result = await TextExtractorOrchestrator()._run_ocr(b"%PDF", page_count=1)
+
+        assert partition_pdf.call_args.kwargs["strategy"] == "ocr_only"
+        assert result.full_text == "scanned text"
+
+    def test_elements_grouped_by_page(self, monkeypatch):
+        table = _Element("a b", page_number=3, category="Table")
+        table.metadata.text_as_html = "<table><tr><td>a</td><td>b</td></tr></table>"
+        elements = [
+            _Element("Title", page_number=1), _Element("Body", page_number=1),
+            _Element("   ", page_number=2), table, _Element("Tail", page_number=None),
+        ]
+        monkeypatch.setitem(
+            sys.modules, "unstructured.partition.pdf",
+            SimpleNamespace(partition_pdf=MagicMock(return_value=elements)),
+        )
+
+        result = UnstructuredExtractor()._extract_sync(b"%PDF")
+
+        assert [(p.page_number, p.text) for p in result.pages] == [
+            (1, "Title\nBody\nTail"), (2, ""), (3, table.metadata.text_as_html),
+        ]
+        assert result.total_chars == sum(len(p.text) for p in result.pages)
+
+    def test_in_memory_pdf_is_wrapped_and_closed(self, monkeypatch, caplog):
+        seen = {}
+
+        def partition_pdf(file, **kwargs):
+            seen["file"] = file
+            assert file.read() == b"%PDF-big"
+            return []
+
+        monkeypatch.setitem(
+            sys.modules, "unstructured.partition.pdf", SimpleNamespace(partition_pdf=partition_pdf),
+        )
+        monkeypatch.setattr(ocr_mod, "LARGE_IN_MEMORY_PDF_BYTES", 4)
+
+        UnstructuredExtractor()._extract_sync(b"%PDF-big")
+
+        assert seen["file"].closed
+        assert "pass a file path" in caplog.text
+
+    def test_default_strategy_is_hi_res(self):
+        assert UnstructuredExtractor()._strategy == "hi_res"
+
+
+@pytest.mark.unit
+@pytest.mark.ingestion
+class TestExecutors:
+
+    @pytest.mark.parametrize("extractor,pool_prefix", [
+        (UnstructuredExtractor(), "ocr-cpu"),
+        (TextractExtractor(),     "aws-io"),
+    ])
+    async def test_blocking_work_runs_on_dedicated_pool(self, extractor, pool_prefix):
+        seen = []
+
+        def fake_sync(pdf_source):
+            seen.append(threading.current_thread().name)
+            return ExtractionStrategyResult(pages=[], total_chars=0, strategy_name="x", elapsed_ms=0.0)
+
+        with patch.object(type(extractor), "_extract_sync", side_effect=fake_sync):
+            await extractor.extract(b"%PDF")
+
+        assert seen[0].startswith(pool_prefix)
+
+    async def test_concurrent_extractions_are_bounded(self, monkeypatch):
+        monkeypatch.setattr(ocr_mod, "OCR_MAX_CONCURRENT", 2)
+        monkeypatch.setattr(ocr_mod, "_OCR_SLOTS", ocr_mod.weakref.WeakKeyDictionary())
+        monkeypatch.setattr(ocr_mod, "_OCR_CPU_POOL", ThreadPoolExecutor(max_workers=6))
+        lock, running, peak = threading.Lock(), [0], [0]
+
+        def fake_sync(pdf_source):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+            return ExtractionStrategyResult(pages=[], total_chars=0, strategy_name="x", elapsed_ms=0.0)
+
+        with patch.object(UnstructuredExtractor, "_extract_sync", side_effect=fake_sync):
+            await asyncio.gather(*(UnstructuredExtractor().extract(b"%PDF") for _ in range(6)))
+
+        assert peak[0] == 2
+
+
+@pytest.mark.unit
+@pytest.mark.ingestion
+class TestWarmUp:
+
+    @pytest.mark.parametrize("backend,expected", [
+        ("textract",     ["fitz", "boto3", "botocore.config"]),
+        ("unstructured", ["fitz", "unstructured.partition.pdf"]),
+    ])
+    def test_preload_imports_configured_backend(self, monkeypatch, backend, expected):
+        monkeypatch.setattr("app.processing.extractor._OCR_BACKEND", backend)
+        with patch("app.processing.extractor.importlib.import_module") as import_module:
+            preload_extractors()
+        assert [c.args[0] for c in import_module.call_args_list] == expected
+
+    def test_preload_tolerates_missing_libraries(self, monkeypatch):
+        monkeypatch.setattr("app.processing.extractor._OCR_BACKEND", "unstructured")
+        with patch("app.processing.extractor.importlib.import_module", side_effect=ImportError):
+            preload_extractors()
+
+    def test_warm_up_creates_shared_textract_client(self, monkeypatch):
+        monkeypatch.setattr("app.processing.extractor._OCR_BACKEND", "textract")
+        monkeypatch.setattr(TextractExtractor, "_clients", {})
+        with patch("boto3.client") as make_client:
+            warm_up_extractors()
+            TextractExtractor()._get_client()
+        make_client.assert_called_once()
+
+    def test_warm_up_is_noop_for_unstructured(self, monkeypatch):
+        monkeypatch.setattr("app.processing.extractor._OCR_BACKEND", "unstructured")
+        with patch("boto3.client") as make_client:
+            warm_up_extractors()
+        make_client.assert_not_called()
+
+
+@pytest.mark.unit
+@pytest.mark.ingestion
+class TestExtractionMetrics:
+
+    async def test_strategy_runs_are_recorded(self, monkeypatch):
+        pages, elapsed = MagicMock(), MagicMock()
+        monkeypatch.setattr(ocr_mod, "_pages_counter", pages)
+        monkeypatch.setattr(ocr_mod, "_elapsed_histogram", elapsed)
+        scanned = ExtractionStrategyResult(
+            pages=[PageText(1, ""), PageText(2, "")], total_chars=0,
+            strategy_name="unstructured", elapsed_ms=0.0, used_ocr=True,
+        )
+
+        with patch.object(UnstructuredExtractor, "_extract_sync", return_value=scanned):
+            await UnstructuredExtractor().extract(b"%PDF")
+
+        pages.add.assert_called_once_with(2, {"method": "unstructured", "scanned": True})
+        assert elapsed.record.call_args.args[1] == {"method": "unstructured"}
+
+    def test_meter_is_a_no_op_without_opentelemetry(self, monkeypatch):
+        from app.observability.metrics import get_meter
+
+        monkeypatch.setitem(sys.modules, "opentelemetry", None)   # import fails
+        counter = get_meter("test").create_counter("c")
+        counter.add(1, {"method": "x"})
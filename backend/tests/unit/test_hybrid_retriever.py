@@ -0,0 +1,273 @@
+"""
+Unit Tests — HybridRetriever fusion
+════════════════════════════════════
+Tests for Reciprocal Rank Fusion and result assembly in app/rag/hybrid_retriever.py.
+
+All tests:
+  • Build QueryResult lists directly, or fake the embedder, store and reranker — no network
+
+Coverage targets:
+  ✅ RRF scores      → 1/(60 + rank) summed across the dense and BM25 lists
+  ✅ Ordering        → descending fused score; ties keep first-seen order
+  ✅ Representative  → dense result object preferred over the BM25 one
+  ✅ Permissions     → shared role or no restriction kept; order preserved; no filter → untouched;
+                       in-process pass skipped only when the store enforces the filter
+  ✅ Reranking       → only the reranked survivors become Documents, with rerank metadata
+  ✅ Rerank fallback → no Cohere client: input order, no rerank fields
+  ✅ Rerank skip     → dense/BM25 top-k agreement returns the fused order without calling
+                       Cohere; disagreement, no BM25 word match, permission-filtered
+                       results or 0 still rerank
+  ✅ Coalescing      → identical concurrent rerank calls share one request; a cancelled
+                       caller doesn't cancel it; different queries don't share
+"""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.rag.hybrid_retriever import HybridRetriever
+from app.rag.reranker import CohereReranker, clear_rerank_cache
+from app.vectorstore.base import QueryResult, VectorStoreBase
+
+
+def _qr(doc_id: str) -> QueryResult:
+    return QueryResult(id=doc_id, score=0.0, metadata={}, text=doc_id)
+
+
+@pytest.mark.unit
+class TestRrfMerge:
+
+    def test_scores_sum_both_lists(self):
+        a, b, c = _qr("a"), _qr("b"), _qr("c")
+
+        fused = HybridRetriever._rrf_merge([a, b], [(c, 2.0), (a, 1.0)])
+
+        assert [qr.id for qr in fused] == ["a", "c", "b"]
+        assert fused[0].rrf_score == pytest.approx(1 / 61 + 1 / 62)
+        assert fused[1].rrf_score == pytest.approx(1 / 61)
+        assert fused[2].rrf_score == pytest.approx(1 / 62)
+
+    def test_ties_keep_first_seen_order(self):
+        fused = HybridRetriever._rrf_merge([_qr("a"), _qr("b")], [(_qr("b"), 1.0), (_qr("a"), 0.5)])
+        assert [qr.id for qr in fused] == ["a", "b"]
+
+    def test_dense_result_object_is_kept(self):
+        dense = _qr("a")
+        fused = HybridRetriever._rrf_merge([dense], [(_qr("a"), 1.0)])
+        assert fused == [dense] and fused[0] is dense
+
+
+def _perm_qr(doc_id: str, perms: list[str] | None) -> QueryResult:
+    metadata = {} if perms is None else {"document_permissions": perms}
+    return QueryResult(id=doc_id, score=0.0, metadata=metadata, text=doc_id)
+
+
+@pytest.mark.unit
+class TestPermissionFilter:
+
+    def test_keeps_shared_role_and_unrestricted_chunks(self):
+        results = [
+            _perm_qr("hr",    ["hr"]),
+            _perm_qr("open",  None),
+            _perm_qr("admin", ["finance", "admin"]),
+            _perm_qr("empty", []),
+            _perm_qr("legal", ["legal"]),
+        ]
+
+        kept = HybridRetriever._apply_permission_filter(
+            results, {"document_permissions": ["user", "admin"]},
+        )
+
+        assert [qr.id for qr in kept] == ["open", "admin", "empty"]
+
+    def test_no_permission_filter_returns_input(self):
+        results = [_perm_qr("hr", ["hr"])]
+        assert HybridRetriever._apply_permission_filter(results, {"source": "x"}) is results
+
+
+def _retriever(
+    results:            list[QueryResult],
+    reranker,
+    filter_is_enforced: bool  = False,
+    skip_overlap:       float = 0.0,
+) -> HybridRetriever:
+    store = SimpleNamespace(
+        tenant_id=uuid.uuid4(),
+        query=AsyncMock(return_value=results),
+        filter_is_enforced=filter_is_enforced,
+    )
+    embedder = SimpleNamespace(aembed_query=AsyncMock(return_value=[0.0]))
+    return HybridRetriever(
+        vector_store=store, embedder=embedder, reranker=reranker,
+        bm25_cache=None, rerank_skip_overlap=skip_overlap,
+    )
+
+
+@pytest.mark.unit
+class TestReranking:
+
+    async def test_only_survivors_become_documents(self):
+        results  = [_qr(f"c{i}") for i in range(6)]
+        reranker = SimpleNamespace(rank=AsyncMock(return_value=[(4, 0.9), (1, 0.4)]))
+
+        docs = await _retriever(results, reranker).retrieve("c1 c4", top_k=2)
+
+        texts = reranker.rank.await_args.kwargs["texts"]
+        assert len(texts) == 6
+        assert [d.page_content for d in docs] == [texts[4], texts[1]]
+        assert docs[0].metadata["rerank_score"] == 0.9
+        assert docs[0].metadata["rerank_original_rank"] == 5
+        assert docs[0].metadata["chunk_id"] == texts[4]
+        assert docs[0].metadata["rrf_score"] == next(qr for qr in results if qr.text == texts[4]).rrf_score
+        assert "rerank_score" not in results[0].metadata
+
+    async def test_unavailable_reranker_keeps_input_order(self):
+        reranker = CohereReranker(api_key="")
+        reranker._client = None     # even if COHERE_API_KEY is set in the environment
+
+        assert await reranker.rank("q", ["a", "b", "c"], top_n=2) == [(0, None), (1, None)]
+
+        docs = await _retriever([_qr("a"), _qr("b")], reranker).retrieve("zzz", top_k=1)
+        assert [d.page_content for d in docs] == ["a"]
+        assert "rerank_score" not in docs[0].metadata
+
+
+def _agreeing_results() -> list[QueryResult]:
+    # Dense order a, b, c, …; the query matches a and b only, so BM25 ranks them first too
+    texts = ["alpha bravo", "bravo", "charlie", "delta", "echo"]
+    return [QueryResult(id=t, score=1 - i / 10, metadata={}, text=t) for i, t in enumerate(texts)]
+
+
+@pytest.mark.unit
+class TestRerankSkip:
+
+    async def test_agreement_skips_cohere(self):
+        reranker = SimpleNamespace(rank=AsyncMock(return_value=[(1, 0.9), (0, 0.8)]))
+
+        docs = await _retriever(_agreeing_results(), reranker, skip_overlap=0.8).retrieve("alpha bravo", top_k=2)
+
+        reranker.rank.assert_not_awaited()
+        assert [d.page_content for d in docs] == ["alpha bravo", "bravo"]
+        assert "rerank_score" not in docs[0].metadata
+
+    async def test_disabled_or_disagreeing_still_reranks(self):
+        reranker = SimpleNamespace(rank=AsyncMock(return_value=[(1, 0.9)]))
+
+        await _retriever(_agreeing_results(), reranker, skip_overlap=0.0).retrieve("alpha bravo", top_k=2)
+        await _retriever(_agreeing_results(), reranker, skip_overlap=0.8).retrieve("delta echo", top_k=2)
+
+        assert reranker.rank.await_count == 2
+
+    async def test_query_without_word_matches_still_reranks(self):
+        # BM25 scores every candidate 0.0, tied in dense order — not agreement
+        results  = [_qr(f"chunk {i}") for i in range(20)]
+        reranker = SimpleNamespace(rank=AsyncMock(return_value=[(3, 0.9)]))
+
+        await _retriever(results, reranker, skip_overlap=0.8).retrieve("what is the refund policy", top_k=5)
+
+        reranker.rank.assert_awaited_once()
+
+    async def test_permission_filtered_results_still_rerank(self):
+        results = _agreeing_results()
+        results[4].metadata["document_permissions"] = ["hr"]
+        reranker = SimpleNamespace(rank=AsyncMock(return_value=[(0, 0.9)]))
+
+        await _retriever(results, reranker, skip_overlap=0.8).retrieve(
+            "alpha bravo", top_k=2, metadata_filter={"document_permissions": ["user"]},
+        )
+
+        reranker.rank.assert_awaited_once()
+
+    def test_overlap(self):
+        dense = [_qr("a"), _qr("b"), _qr("c")]
+        bm25  = [(_qr("b"), 2.0), (_qr("c"), 1.0), (_qr("a"), 0.5)]
+
+        assert HybridRetriever._top_overlap(dense, bm25, 2) == 0.5
+        assert HybridRetriever._top_overlap(dense, bm25, 3) == 1.0
+        assert HybridRetriever._top_overlap(dense, bm25[:1], 2) == 0.0
+        assert HybridRetriever._top_overlap(dense, [(qr, 0.0) for qr in dense], 3) == 0.0
+        assert HybridRetriever._top_overlap(dense, [(_qr("a"), 1.0), (_qr("b"), 0.0)], 2) == 0.0
+
+
+@pytest.mark.unit
+class TestPermissionMode:
+
+    async def test_filter_applied_unless_store_enforces_it(self):
+        results  = [_perm_qr("hr", ["hr"]), _perm_qr("open", None)]
+        reranker = CohereReranker(api_key="")
+        reranker._client = None
+        perms    = {"document_permissions": ["user"]}
+
+        checked  = await _retriever(results, reranker).retrieve("q", top_k=2, metadata_filter=perms)
+        trusted  = await _retriever(results, reranker, filter_is_enforced=True).retrieve(
+            "q", top_k=2, metadata_filter=perms,
+        )
+
+        assert [d.page_content for d in checked] == ["open"]
+        assert [d.page_content for d in trusted] == ["hr", "open"]
+
+    def test_stores_are_untrusted_by_default(self):
+        assert VectorStoreBase.filter_is_enforced is False
+
+
+class _FakeCohere:
+    def __init__(self):
+        self.calls   = 0
+        self.release = asyncio.Event()
+
+    async def rerank(self, model, query, documents, top_n, return_documents):
+        self.calls += 1
+        await self.release.wait()
+        results = [SimpleNamespace(index=i, relevance_score=1.0 / (i + 1)) for i in reversed(range(top_n))]
+        return SimpleNamespace(results=results)
+
+
+def _cohere_reranker() -> tuple[CohereReranker, _FakeCohere]:
+    clear_rerank_cache()            # a cached ranking would skip the fake client
+    reranker = CohereReranker(api_key="")
+    reranker._client = client = _FakeCohere()
+    return reranker, client
+
+
+@pytest.mark.unit
+class TestRerankCoalescing:
+
+    async def test_identical_concurrent_calls_share_one_request(self):
+        reranker, client = _cohere_reranker()
+
+        calls = [asyncio.ensure_future(reranker.rank("refund", ["a", "b", "c"], top_n=2)) for _ in range(3)]
+        await asyncio.sleep(0)
+        client.release.set()
+        results = await asyncio.gather(*calls)
+
+        assert client.calls == 1
+        assert results == [[(1, 0.5), (0, 1.0)]] * 3
+        assert reranker._inflight == {}
+
+    async def test_cancelled_caller_does_not_cancel_the_others(self):
+        reranker, client = _cohere_reranker()
+
+        first  = asyncio.ensure_future(reranker.rank("refund", ["a", "b"], top_n=1))
+        second = asyncio.ensure_future(reranker.rank("refund", ["a", "b"], top_n=1))
+        await asyncio.sleep(0)
+        first.cancel()
+        client.release.set()
+
+        assert await second == [(0, 1.0)]
+        assert client.calls == 1
+
+    async def test_different_queries_are_separate_requests(self):
+        reranker, client = _cohere_reranker()
+        client.release.set()
+
+        await asyncio.gather(
+            reranker.rank("refund", ["a", "b"], top_n=1),
+            reranker.rank("invoice", ["a", "b"], top_n=1),
+        )
+
+        assert client.calls == 2
@@ -0,0 +1,58 @@
+"""
+Unit Tests — RAG Pipeline Helpers
+══════════════════════════════════
+Tests for the embedding helpers in app/rag/pipeline.py.
+
+All tests:
+  • Replace the embedder singleton with a fake — never touch OpenAI
+
+Coverage targets:
+  ✅ Batching        → texts split into EMBEDDING_BATCH_SIZE slices; vectors in input order
+  ✅ Concurrency     → slices sent concurrently, capped by the shared embedding limiter
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.processing import embeddings as emb_mod
+from app.rag import pipeline
+
+
+class _SlowEmbeddings:
+    def __init__(self):
+        self.batches:   list[list[str]] = []
+        self.in_flight = 0
+        self.peak      = 0
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.batches.append(texts)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return [[float(t)] for t in texts]
+
+
+@pytest.mark.unit
+class TestEmbedDocuments:
+
+    async def test_batches_run_concurrently_and_keep_order(self):
+        fake  = _SlowEmbeddings()
+        texts = [str(i) for i in range(emb_mod.EMBEDDING_BATCH_SIZE * 5 + 7)]
+
+        with patch.object(pipeline, "_embedder", fake), \
+             patch.object(emb_mod, "_LIMITERS", emb_mod.weakref.WeakKeyDictionary()), \
+             patch("app.core.config.settings.embedding_global_concurrency", 3):
+            vectors = await pipeline.embed_documents(texts)
+
+        assert vectors == [[float(t)] for t in texts]
+        assert [len(b) for b in fake.batches] == [emb_mod.EMBEDDING_BATCH_SIZE] * 5 + [7]
+        assert fake.peak == 3
+
+    async def test_empty_input(self):
+        with patch.object(pipeline, "_embedder", _SlowEmbeddings()):
+            assert await pipeline.embed_documents([]) == []
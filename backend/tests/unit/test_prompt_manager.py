@@ -0,0 +1,264 @@
+"""
+Unit Tests — PromptManager
+═══════════════════════════
+Tests for variant selection, context reordering and formatting in
+app/rag/prompt_manager.py.
+
+All tests:
+  • Build LangChain Documents and template stand-ins directly — no DB
+  • Compare against LongContextReorder only when langchain_community is installed
+
+Coverage targets:
+  ✅ Reorder parity  → same order as LangChain's LongContextReorder for 0–20 documents
+  ✅ Fused helper    → reorder_and_format() == format_context(reorder_context())
+  ✅ A/B selection   → traffic follows ab_weight; zero weights never chosen; all-zero → first
+  ✅ Prompt cache    → served from memory inside the revalidation window; unchanged
+                       fingerprint → one aggregate query, same rows and weights;
+                       changed fingerprint or max age → rows reloaded;
+                       tenant and global rows read in one query, split on tenant_id;
+                       concurrent misses on one key → a single load; a late caller
+                       queues behind waiters instead of refreshing alongside them
+  ✅ Rendering       → cached parse renders exactly as str.format; specs/conversions fall back;
+                       unknown placeholder → raw template
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.documents import Document
+
+from app.rag import prompt_manager
+from app.rag.prompt_manager import (
+    _DEFAULT_SYSTEM_TEMPLATE,
+    PromptManager,
+    _compile_template,
+    _cumulative_weights,
+    _render_template,
+    _select_variant,
+)
+
+
+def _docs(n: int) -> list[Document]:
+    return [
+        Document(
+            page_content=f"chunk {i}",
+            metadata={"source_key": f"doc-{i}.pdf", "page_number": i, "rerank_score": 1 - i / 20},
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.mark.unit
+class TestContextHelpers:
+
+    def test_reorder_matches_long_context_reorder(self):
+        transformers = pytest.importorskip("langchain_community.document_transformers")
+
+        for n in range(21):
+            docs     = _docs(n)
+            expected = transformers.LongContextReorder().transform_documents(list(docs)) if n > 2 else docs
+            assert PromptManager.reorder_context(docs) == expected
+
+    def test_best_documents_at_both_ends(self):
+        order = [d.page_content for d in PromptManager.reorder_context(_docs(5))]
+        assert order == ["chunk 0", "chunk 2", "chunk 4", "chunk 3", "chunk 1"]
+
+    def test_reorder_and_format(self):
+        docs = _docs(6)
+        assert PromptManager.reorder_and_format(docs) == PromptManager.format_context(
+            PromptManager.reorder_context(docs)
+        )
+        assert PromptManager.reorder_and_format([]) == ""
+
+
+def _variants(*weights: int, tenant_id=None) -> list[SimpleNamespace]:
+    return [
+        SimpleNamespace(version=i, ab_weight=w, tenant_id=tenant_id, name="rag_system", template_text=f"v{i}")
+        for i, w in enumerate(weights)
+    ]
+
+
+@pytest.mark.unit
+class TestSelectVariant:
+
+    def test_traffic_follows_weights(self):
+        random.seed(7)
+        variants = _variants(80, 0, 20)
+        weights  = _cumulative_weights(variants)
+
+        picks = [_select_variant(variants, weights).version for _ in range(10_000)]
+
+        assert weights == [80.0, 80.0, 100.0]
+        assert picks.count(1) == 0
+        assert 0.77 < picks.count(0) / len(picks) < 0.83
+
+    def test_all_zero_weights_pick_first(self):
+        variants = _variants(0, 0)
+        assert _select_variant(variants, _cumulative_weights(variants)) is variants[0]
+
+
+_VALUES = {"tenant_name": "Acme", "context": "ctx", "question": "{question}"}
+
+
+@pytest.mark.unit
+class TestRenderTemplate:
+
+    @pytest.mark.parametrize("template", [
+        _DEFAULT_SYSTEM_TEMPLATE,
+        "{{literal}} for {tenant_name}: {context} / {question}",
+        "{tenant_name!r} {context:>6}",
+        "",
+    ])
+    def test_matches_str_format(self, template):
+        assert _render_template(template, _VALUES) == template.format_map(_VALUES)
+
+    def test_simple_templates_are_compiled_once(self):
+        assert _compile_template(_DEFAULT_SYSTEM_TEMPLATE) is _compile_template(_DEFAULT_SYSTEM_TEMPLATE)
+        assert _compile_template("{context:>6}") is None
+
+    async def test_unknown_placeholder_returns_raw_template(self):
+        rendered = await PromptManager().get_system_prompt(
+            tenant_id=None, tenant_name="Acme", db=None, template="Hi {tenant_name}, {nope}",
+        )
+        assert rendered == "Hi {tenant_name}, {nope}"
+
+
+class _FakeResult:
+    def __init__(self, value):
+        self._value = value
+
+    def one(self):
+        return self._value
+
+    def scalars(self):
+        return SimpleNamespace(all=lambda: self._value)
+
+
+class _FakeSession:
+    """Answers fingerprint (aggregate) and row queries from mutable state."""
+
+    def __init__(self, rows):
+        self.rows        = rows
+        self.fingerprint = (len(rows), "t0", len(rows), 100)
+        self.queries: list[str] = []
+
+    async def execute(self, stmt):
+        await asyncio.sleep(0)          # yield, as a real round-trip would
+        kind = "fingerprint" if "count" in str(stmt).lower() else "rows"
+        self.queries.append(kind)
+        return _FakeResult(self.fingerprint if kind == "fingerprint" else list(self.rows))
+
+
+@pytest.mark.unit
+class TestPromptCache:
+
+    @pytest.fixture(autouse=True)
+    def _clock(self, monkeypatch):
+        monkeypatch.setattr(prompt_manager, "_PROMPT_CACHE", {})
+        monkeypatch.setattr(prompt_manager, "_PROMPT_LOCKS", {})
+        self.now = 1000.0
+        monkeypatch.setattr(prompt_manager.time, "monotonic", lambda: self.now)
+
+    async def test_fresh_entry_needs_no_query(self):
+        db = _FakeSession(_variants(100))
+        pm = PromptManager()
+
+        first  = await pm._fetch_active(None, db)
+        self.now += prompt_manager._REVALIDATE_SECONDS - 1
+        second = await pm._fetch_active(None, db)
+
+        assert db.queries == ["fingerprint", "rows"]
+        assert second == first and second[1][1] is first[1][1]
+
+    async def test_unchanged_fingerprint_keeps_rows(self):
+        db = _FakeSession(_variants(100))
+        pm = PromptManager()
+        _, (rows, weights) = await pm._fetch_active(None, db)
+
+        self.now += prompt_manager._REVALIDATE_SECONDS + 1
+        _, again = await pm._fetch_active(None, db)
+
+        assert db.queries == ["fingerprint", "rows", "fingerprint"]
+        assert again[0] is rows and again[1] is weights
+
+    async def test_changed_fingerprint_reloads(self):
+        db = _FakeSession(_variants(100))
+        pm = PromptManager()
+        await pm._fetch_active(None, db)
+
+        db.rows        = _variants(80, 20)
+        db.fingerprint = (2, "t1", 2, 100)
+        self.now += prompt_manager._REVALIDATE_SECONDS + 1
+        _, (rows, weights) = await pm._fetch_active(None, db)
+
+        assert db.queries[-2:] == ["fingerprint", "rows"]
+        assert weights == [80.0, 100.0]
+
+    async def test_max_age_forces_reload(self):
+        db = _FakeSession(_variants(100))
+        pm = PromptManager()
+        await pm._fetch_active(None, db)
+
+        self.now += prompt_manager._CACHE_MAX_AGE_SECONDS
+        await pm._fetch_active(None, db)
+
+        assert db.queries == ["fingerprint", "rows", "fingerprint", "rows"]
+
+    async def test_tenant_and_global_rows_share_one_query(self):
+        tenant_id = uuid.uuid4()
+        db = _FakeSession(_variants(100, tenant_id=tenant_id) + _variants(50, 50))
+        pm = PromptManager()
+
+        (tenant_rows, _), (global_rows, global_weights) = await pm._fetch_active(tenant_id, db)
+
+        assert db.queries == ["fingerprint", "rows"]
+        assert [r.tenant_id for r in tenant_rows] == [tenant_id]
+        assert [r.tenant_id for r in global_rows] == [None, None]
+        assert global_weights == [50.0, 100.0]
+
+    async def test_load_template_falls_back_to_global_rows(self):
+        db = _FakeSession(_variants(100))
+
+        template = await PromptManager().load_template(uuid.uuid4(), db)
+
+        assert template == "v0"
+        assert db.queries == ["fingerprint", "rows"]
+
+    async def test_concurrent_misses_share_one_load(self):
+        db = _FakeSession(_variants(100))
+        pm = PromptManager()
+
+        results = await asyncio.gather(*(pm._fetch_active(None, db) for _ in range(10)))
+
+        assert db.queries == ["fingerprint", "rows"]
+        assert all(r == results[0] for r in results)
+        assert not prompt_manager._PROMPT_LOCKS
+
+    async def test_late_caller_waits_behind_queued_waiters(self, monkeypatch):
+        active = peak = 0
+
+        async def slow_refresh(_self, tenant_id, key, db):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            for _ in range(5):                        # the clock is frozen: yield, don't sleep
+                await asyncio.sleep(0)
+            active -= 1
+            return ([], []), ([], [])
+
+        monkeypatch.setattr(PromptManager, "_refresh", slow_refresh)
+        pm = PromptManager()
+
+        first  = asyncio.ensure_future(pm._fetch_active(None, None))
+        second = asyncio.ensure_future(pm._fetch_active(None, None))
+        await first                                   # second now holds the lock
+        late = asyncio.ensure_future(pm._fetch_active(None, None))
+        await asyncio.gather(second, late)
+
+        assert peak == 1
+        assert not prompt_manager._PROMPT_LOCKS
@@ -0,0 +1,74 @@
+"""
+Unit Tests — Query Endpoint Helpers
+════════════════════════════════════
+Tests for app/api/v1/query.py helpers that don't need a running app.
+
+All tests:
+  • Stand in for the retriever and PromptManager with async fakes — no DB, no network
+
+Coverage targets:
+  ✅ Concurrency     → template lookup runs while retrieval is in flight
+  ✅ Failure         → retrieval error cancels the lookup before propagating
+"""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.api.v1.query import _retrieve_with_template
+
+
+TENANT_ID = uuid.UUID("3fa85f64-5717-4562-b3fc-2c963f66afa6")
+
+
+@pytest.mark.unit
+class TestRetrieveWithTemplate:
+
+    async def test_template_is_loaded_during_retrieval(self):
+        template_loaded = asyncio.Event()
+
+        async def load_template(tenant_id, db):
+            template_loaded.set()
+            return "You are {tenant_name}'s assistant.\n{context}"
+
+        async def retrieve(**kwargs):
+            await asyncio.wait_for(template_loaded.wait(), timeout=1)
+            return ["doc"]
+
+        docs, template = await _retrieve_with_template(
+            SimpleNamespace(retrieve=retrieve),
+            SimpleNamespace(load_template=load_template),
+            TENANT_ID, db=None, query="q",
+        )
+
+        assert docs == ["doc"]
+        assert template.startswith("You are")
+
+    async def test_retrieval_failure_cancels_the_lookup(self):
+        started   = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def load_template(tenant_id, db):
+            started.set()
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def retrieve(**kwargs):
+            await started.wait()
+            raise RuntimeError("vector store down")
+
+        with pytest.raises(RuntimeError, match="vector store down"):
+            await _retrieve_with_template(
+                SimpleNamespace(retrieve=retrieve),
+                SimpleNamespace(load_template=load_template),
+                TENANT_ID, db=None, query="q",
+            )
+
+        assert cancelled.is_set()
@@ -0,0 +1,183 @@
+"""
+Unit Tests — CohereReranker
+════════════════════════════
+Tests for client construction and result assembly in app/rag/reranker.py.
+
+All tests:
+  • Build clients with dummy API keys — no request ever leaves the process
+  • Skip when the optional cohere package is not installed
+
+Coverage targets:
+  ✅ Shared client  → rerankers with one API key share a client and connection pool
+                      (whatever the model); a different key gets its own
+  ✅ No key         → reranker unavailable, no client built
+  ✅ get_reranker   → one instance per model, default from settings.cohere_rerank_model
+  ✅ Assembly       → candidates returned themselves, reranked, with fresh metadata dicts
+  ✅ Truncation     → only the first cohere_rerank_max_chars of each text sent;
+                      Documents keep their full page_content; 0 disables
+  ✅ Result cache   → repeat call served without Cohere; query/texts/top_n/model all key;
+                      expires after the TTL; LRU-bounded; failures never cached
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from langchain_core.documents import Document
+
+from app.rag import reranker as reranker_mod
+from app.rag.reranker import CohereReranker, get_reranker
+
+
+@pytest.fixture(autouse=True)
+def _fresh_clients():
+    pytest.importorskip("cohere")
+    reranker_mod._get_client.cache_clear()
+    reranker_mod.clear_rerank_cache()
+    yield
+    reranker_mod._get_client.cache_clear()
+    reranker_mod.clear_rerank_cache()
+
+
+@pytest.mark.unit
+class TestSharedClient:
+
+    def test_same_key_shares_one_client(self):
+        a = CohereReranker(api_key="key-1")
+        b = CohereReranker(model="rerank-multilingual-v3.0", api_key="key-1")
+        c = CohereReranker(api_key="key-2")
+
+        assert a.available and a._client is b._client
+        assert c._client is not a._client
+
+    def test_no_key_builds_no_client(self, monkeypatch):
+        monkeypatch.setattr("app.core.config.settings.cohere_api_key", "", raising=False)
+
+        assert not CohereReranker().available
+        assert reranker_mod._get_client.cache_info().currsize == 0
+
+    def test_get_reranker_is_shared(self, monkeypatch):
+        monkeypatch.setattr("app.core.config.settings.cohere_rerank_model", "rerank-multilingual-v3.0")
+        get_reranker.cache_clear()
+        try:
+            assert get_reranker() is get_reranker()
+            assert get_reranker()._model == "rerank-multilingual-v3.0"
+            assert get_reranker("rerank-english-v3.0") is not get_reranker()
+        finally:
+            get_reranker.cache_clear()
+
+
+@pytest.mark.unit
+class TestRerankAssembly:
+
+    async def test_candidates_reused_with_fresh_metadata(self):
+        shared     = {"source_key": "a.pdf"}
+        candidates = [Document(page_content=f"chunk {i}", metadata=shared) for i in range(3)]
+        reranker   = CohereReranker(api_key="key-1")
+        reranker._client = SimpleNamespace(rerank=AsyncMock(return_value=SimpleNamespace(results=[
+            SimpleNamespace(index=2, relevance_score=0.9),
+            SimpleNamespace(index=0, relevance_score=0.4),
+        ])))
+
+        docs = await reranker.rerank("q", candidates, top_n=2)
+
+        assert docs[0] is candidates[2] and docs[1] is candidates[0]
+        assert docs[0].metadata == {"source_key": "a.pdf", "rerank_score": 0.9, "rerank_original_rank": 3}
+        assert shared == {"source_key": "a.pdf"}
+
+
+@pytest.mark.unit
+class TestTruncation:
+
+    @staticmethod
+    def _reranker() -> CohereReranker:
+        reranker = CohereReranker(api_key="key-1")
+        reranker._client = SimpleNamespace(rerank=AsyncMock(return_value=SimpleNamespace(results=[
+            SimpleNamespace(index=0, relevance_score=0.9),
+        ])))
+        return reranker
+
+    async def test_long_texts_are_clipped_before_sending(self, monkeypatch):
+        monkeypatch.setattr("app.core.config.settings.cohere_rerank_max_chars", 10)
+        reranker   = self._reranker()
+        candidates = [Document(page_content="x" * 50), Document(page_content="short")]
+
+        docs = await reranker.rerank("q", candidates, top_n=1)
+
+        sent = reranker._client.rerank.call_args.kwargs["documents"]
+        assert sent == ["x" * 10, "short"]
+        assert docs[0].page_content == "x" * 50
+
+    async def test_zero_disables_truncation(self, monkeypatch):
+        monkeypatch.setattr("app.core.config.settings.cohere_rerank_max_chars", 0)
+        reranker = self._reranker()
+
+        await reranker.rank("q", ["x" * 5000], top_n=1)
+
+        assert reranker._client.rerank.call_args.kwargs["documents"] == ["x" * 5000]
+
+
+def _counting_reranker(model: str = "rerank-english-v3.0") -> CohereReranker:
+    reranker = CohereReranker(model=model, api_key="key-1")
+    reranker._client = SimpleNamespace(rerank=AsyncMock(return_value=SimpleNamespace(results=[
+        SimpleNamespace(index=1, relevance_score=0.8),
+    ])))
+    return reranker
+
+
+@pytest.mark.unit
+class TestResultCache:
+
+    async def test_repeat_call_skips_cohere(self):
+        reranker = _counting_reranker()
+
+        first  = await reranker.rank("refunds?", ["a", "b"], top_n=1)
+        second = await _counting_reranker().rank("refunds?", ["a", "b"], top_n=1)
+
+        assert first == second == [(1, 0.8)]
+        assert reranker._client.rerank.await_count == 1
+
+    @pytest.mark.parametrize("query, texts, top_n, model", [
+        ("other?",   ["a", "b"], 1, "rerank-english-v3.0"),
+        ("refunds?", ["b", "a"], 1, "rerank-english-v3.0"),
+        ("refunds?", ["a", "b"], 2, "rerank-english-v3.0"),
+        ("refunds?", ["a", "b"], 1, "rerank-multilingual-v3.0"),
+    ])
+    async def test_every_input_is_part_of_the_key(self, query, texts, top_n, model):
+        await _counting_reranker().rank("refunds?", ["a", "b"], top_n=1)
+        reranker = _counting_reranker(model)
+
+        await reranker.rank(query, texts, top_n=top_n)
+
+        assert reranker._client.rerank.await_count == 1
+
+    async def test_entries_expire(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(reranker_mod.time, "monotonic", lambda: now[0])
+        reranker = _counting_reranker()
+
+        await reranker.rank("q", ["a", "b"], top_n=1)
+        now[0] += reranker_mod.RERANK_CACHE_TTL_SECONDS
+        await reranker.rank("q", ["a", "b"], top_n=1)
+
+        assert reranker._client.rerank.await_count == 2
+
+    async def test_least_recently_used_is_evicted(self, monkeypatch):
+        monkeypatch.setattr(reranker_mod, "RERANK_CACHE_SIZE", 2)
+        reranker = _counting_reranker()
+
+        for query in ("a", "b", "a", "c", "a", "b"):
+            await reranker.rank(query, ["x", "y"], top_n=1)
+
+        # a, b, c miss; "a" stays warm; "b" was evicted by "c"
+        assert reranker._client.rerank.await_count == 4
+
+    async def test_failures_are_not_cached(self):
+        reranker = _counting_reranker()
+        reranker._client.rerank.side_effect = RuntimeError("Cohere down")
+
+        assert await reranker.rank("q", ["a", "b"], top_n=1) == [(0, None)]
+        reranker._client.rerank.side_effect = None
+        assert await reranker.rank("q", ["a", "b"], top_n=1) == [(1, 0.8)]
@@ -0,0 +1,67 @@
+"""
+Unit Tests — TenantScopedRetriever
+═══════════════════════════════════
+Tests for the sync entrypoint in app/rag/retriever.py.
+
+All tests:
+  • Use an AsyncMock vector store — no Pinecone / Weaviate
+
+Coverage targets:
+  ✅ No running loop  → sync call returns the store's results as Documents
+  ✅ Push-down        → score_threshold handed to the store, not re-checked in Python
+  ✅ Running loop     → sync call from async code runs on the shared background loop
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.rag import retriever as retriever_mod
+from app.rag.retriever import TenantScopedRetriever
+from app.vectorstore.base import QueryResult, VectorStoreBase
+
+
+def _retriever() -> TenantScopedRetriever:
+    store = MagicMock(spec=VectorStoreBase)
+    store.tenant_id = "tenant-a"
+    store.query = AsyncMock(return_value=[
+        QueryResult(id="c1", score=0.9, text="refunds within 30 days", metadata={}),
+    ])
+    return TenantScopedRetriever(vector_store=store, score_threshold=0.5)
+
+
+def _run_manager() -> SimpleNamespace:
+    return SimpleNamespace()
+
+
+@pytest.mark.unit
+class TestSyncEntrypoint:
+
+    def test_without_running_loop(self):
+        docs = _retriever()._get_relevant_documents([0.1, 0.2], run_manager=_run_manager())
+
+        assert [d.metadata["chunk_id"] for d in docs] == ["c1"]
+
+    async def test_inside_running_loop(self):
+        first  = _retriever()._get_relevant_documents([0.1, 0.2], run_manager=_run_manager())
+        loop   = retriever_mod._background_loop
+        second = _retriever()._get_relevant_documents([0.1, 0.2], run_manager=_run_manager())
+
+        assert [d.page_content for d in first] == ["refunds within 30 days"]
+        assert second == first
+        assert loop is not None and retriever_mod._background_loop is loop
+
+
+@pytest.mark.unit
+class TestScoreThreshold:
+
+    async def test_threshold_is_pushed_to_the_store(self):
+        retriever = _retriever()
+
+        docs = await retriever._aget_relevant_documents([0.1, 0.2], run_manager=_run_manager())
+
+        assert retriever.vector_store.query.await_args.kwargs["score_threshold"] == 0.5
+        assert docs[0].metadata == {"score": 0.9, "chunk_id": "c1"}